@@ -2,24 +2,25 @@
 Amazon-specific scraper implementation.
 """
 import re
-import time
 import random
 
 from typing import Optional, List
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 
 from .base_scraper import BaseScraper
 from .models import ProductData
+from .scraper_registry import register_scraper, host_matches
+from .page_snapshot import PageSnapshot
 
 
+@register_scraper
 class AmazonScraper(BaseScraper):
     """Amazon-specific scraper implementation."""
     
     SUPPORTED_DOMAINS = ['amazon.com', 'amazon.ca', 'amazon.co.uk']
     
+    # Readiness wait cap (replaces the old fixed 5s sleep)
+    WAIT_BUDGET = 10.0
+    
     # Selector configurations
     TITLE_SELECTORS = [
         {"type": "id", "value": "productTitle"},
@@ -38,47 +39,54 @@ class AmazonScraper(BaseScraper):
     
     def is_supported_url(self, url: str) -> bool:
         """Check if URL is from a supported Amazon domain."""
-        return any(domain in url.lower() for domain in self.SUPPORTED_DOMAINS)
+        return host_matches(url, self.SUPPORTED_DOMAINS)
     
-    def _find_element_by_selectors(self, selectors: List[dict], timeout: int = 10) -> Optional[str]:
-        """Try multiple selectors to find an element."""
-        for selector_config in selectors:
-            try:
-                if selector_config["type"] == "id":
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.ID, selector_config["value"]))
-                    )
-                elif selector_config["type"] == "class":
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, selector_config["value"]))
-                    )
-                elif selector_config["type"] == "css":
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector_config["value"]))
-                    )
-                
-                if element and element.text.strip():
-                    return element.text.strip()
-                    
-            except Exception as e:
-                print(f"⚠️ Selector {selector_config} failed: {e}")
-                continue
-                
-        return None
+    def extract_from_html(self, snapshot: PageSnapshot) -> Optional[ProductData]:
+        """Extract product data from Amazon's static HTML (fast path, no browser)."""
+        title = snapshot.select_one_text("#productTitle", separator="") or snapshot.select_one_text("#title", separator="")
+        if not title:
+            return None
+        
+        product = ProductData()
+        product.title = self._sanitize_filename(title)
+        
+        price = (snapshot.select_one_text(".a-price .a-offscreen", separator="")
+                 or snapshot.select_one_text(".a-price-whole", separator=""))
+        if price:
+            product.price = price
+        
+        for selector in self.DESCRIPTION_SELECTORS:
+            description = snapshot.select_one_text(f'[id="{selector["value"]}"]', separator="\n")
+            if description:
+                product.description = description
+                break
+        
+        product.link = self.url
+        return product
     
     def extract_product_data(self) -> Optional[ProductData]:
         """Extract product data from Amazon product page."""
         try:
             self.driver.maximize_window()
             
-            # Wait for page to load - give Amazon more time
-            time.sleep(5)
+            # Wait until the title is rendered and the page settles (capped by WAIT_BUDGET)
+            self._wait_for_page(self.TITLE_SELECTORS)
+            
+            # The DOM has moved on since navigation; images/LLM re-capture it once
+            self._invalidate_snapshot()
             
             product = ProductData()
             
+            # Resolve every field's selectors together instead of one wait per selector
+            found = self._resolve_selectors({
+                "title": self.TITLE_SELECTORS,
+                "price": self.PRICE_SELECTORS,
+                "description": self.DESCRIPTION_SELECTORS,
+            }, timeout=15)
+            
             # Extract title
             print("ℹ️ Extracting title...")
-            title = self._find_element_by_selectors(self.TITLE_SELECTORS, timeout=15)
+            title = found["title"]
             if title:
                 product.title = self._sanitize_filename(title)
                 print(f"✅ Found title: {product.title}")
@@ -88,7 +96,7 @@ class AmazonScraper(BaseScraper):
             
             # Extract price
             print("ℹ️ Extracting price...")
-            price = self._find_element_by_selectors(self.PRICE_SELECTORS, timeout=15)
+            price = found["price"]
             if price:
                 product.price = price
                 print(f"✅ Found price: {product.price}")
@@ -97,7 +105,7 @@ class AmazonScraper(BaseScraper):
             
             # Extract description
             print("ℹ️ Extracting description...")
-            description = self._find_element_by_selectors(self.DESCRIPTION_SELECTORS, timeout=15)
+            description = found["description"]
             if description:
                 product.description = description
                 print(f"✅ Found description: {product.description[:100]}...")
@@ -118,8 +126,7 @@ class AmazonScraper(BaseScraper):
         print("🌐 [START] extract_images")
         
         try:
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            images = soup.find_all("img")
+            images = self._current_snapshot().img_attributes()
             image_urls = []
             
             for img in images:
@@ -144,6 +151,7 @@ class AmazonScraper(BaseScraper):
                 if len(image_urls) >= self.config.max_images:
                     break
             
+            image_urls = self._with_structured_images(image_urls)
             print(f"✅ Found {len(image_urls)} images")
             print("🌐 [END] extract_images")
             return image_urls
@@ -1,28 +1,37 @@
 """
 Base scraper interface and abstract base class for web scraping.
+
+Browser tooling (undetected_chromedriver / selenium) and ollama are imported
+lazily, inside the functions that use them, so importing the scraping package
+(e.g. from the API process) stays cheap until a scrape actually runs.
 """
 from abc import ABC, abstractmethod
 import os
 import re
-import time
-import json
-from bs4 import BeautifulSoup
-from PIL import Image
-import io
-import requests
-import undetected_chromedriver as uc
 import sys
-import ollama
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Optional, List, Dict, Any
-from fake_useragent import UserAgent
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Optional, List, Dict, Any, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import undetected_chromedriver as uc
 
 # Import ProductData from local models.py in Scraping folder
-from .models import ProductData
+from .models import ProductData, SOURCED_FIELDS
+from .http_client import fetch_html
+from .image_downloader import ImageDownloader
+from .page_snapshot import PageSnapshot
+from .structured_data import StructuredProduct, extract_structured_product
+from .selector_engine import SelectorEngine
+from .page_waits import PageWaiter
+from .load_profile import get_load_profile, format_bytes
+from .browser_discovery import get_chrome_install, chrome_major_version
+from .memory_watchdog import driver_root_pids, kill_tree, mark_driver_owner
+from .scrape_progress import ScrapeProgress
+from .llm_enrichment import (LLM_MODEL, LLM_TEXT_LIMIT, PRIORITY_INTERACTIVE, build_llm_messages,
+                             get_llm_queue, output_format)
+from .content_reducer import reduce_content
 
 # Load proxy list for rotation
 def _load_proxies():
@@ -45,6 +54,103 @@ PROXY_INDEX = 0
 USE_PROXIES = False  # Set to False to test without proxies, True to enable
 
 
+def _next_proxy() -> Optional[Dict[str, str]]:
+    """Get next proxy from the rotation list."""
+    global PROXY_INDEX
+    
+    if not USE_PROXIES or not PROXY_LIST:
+        return None
+    
+    proxy = PROXY_LIST[PROXY_INDEX % len(PROXY_LIST)]
+    PROXY_INDEX += 1
+    
+    # Format proxy with http:// if not already included
+    if not proxy.startswith('http'):
+        proxy = f'http://{proxy}'
+    
+    return {"http": proxy, "https": proxy}
+
+
+def _chrome_options(proxy: Optional[str] = None) -> "uc.ChromeOptions":
+    """Create Chrome options with anti-detection measures and optional proxy."""
+    import undetected_chromedriver as uc
+    
+    opts = uc.ChromeOptions()
+    opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--disable-blink-features=AutomationControlled")
+    opts.add_argument("--disable-infobars")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-web-security")
+    
+    # CDP Network events feed the network-idle wait (see page_waits.py)
+    opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    
+    # User agent
+    opts.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
+    
+    # Add proxy if provided
+    if proxy:
+        opts.add_argument(f"--proxy-server={proxy}")
+        print(f"🌐 Using proxy: {proxy}")
+    
+    return opts
+
+
+def _chrome_major_version() -> Optional[int]:
+    """Installed Chrome major version (detected once per process, see browser_discovery)."""
+    return chrome_major_version()
+
+
+def create_chrome_driver() -> "uc.Chrome":
+    """
+    Create and configure a Chrome driver with anti-detection and proxy rotation.
+    Module-level so the driver pool can build drivers without a scraper instance.
+    """
+    import undetected_chromedriver as uc
+    
+    install = get_chrome_install()
+    chrome_version = install.major
+    if not chrome_version:
+        print("⚠️ Could not detect Chrome version, letting uc auto-detect")
+
+    proxy = _next_proxy()
+    proxy_str = proxy["http"] if proxy else None
+    opts = _chrome_options(proxy=proxy_str)
+
+    kwargs = {"options": opts, "use_subprocess": True}
+    if chrome_version:
+        kwargs["version_main"] = chrome_version
+    if install.path:
+        kwargs["browser_executable_path"] = install.path
+
+    try:
+        print("🔧 Initializing Chrome driver...")
+        mark_driver_owner()  # Lets each process's orphan reaper tell its drivers from a sibling's
+        driver = uc.Chrome(**kwargs)
+        try:
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36'
+            })
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        except Exception:
+            # Chrome is already running - don't leave its process tree behind
+            driver.quit()
+            raise
+        print("✅ Chrome driver initialized successfully")
+        return driver
+    except Exception as e:
+        print(f"⚠️ Driver initialization failed: {e}")
+        print("\n💡 TROUBLESHOOTING TIPS:")
+        print("   1. Update Chrome browser to the latest version")
+        print("   2. Clear Chrome driver cache:")
+        print("      - Delete folder: C:\\Users\\{username}\\.cache\\undetected_chromedriver\\")
+        print("   3. Try running: pip install --upgrade undetected-chromedriver")
+        raise e
+
+
 class ScraperConfig:
     """Configuration class for scraper settings."""
     
@@ -52,121 +158,158 @@ class ScraperConfig:
                  output_path: str = "G:\\My Drive\\selling\\not posted\\",
                  max_images: int = 20,
                  request_delay: tuple = (2, 7),
-                 timeout: int = 10):
+                 timeout: int = 10,
+                 http_fast_path: bool = True,
+                 image_workers: int = 6,
+                 html_parser: Optional[str] = None,
+                 load_profile: Optional[str] = None,
+                 llm_priority: int = PRIORITY_INTERACTIVE,
+                 llm_timeout: Optional[float] = None):
         self.output_path = output_path
         self.max_images = max_images
         self.request_delay = request_delay
         self.timeout = timeout
+        self.http_fast_path = http_fast_path  # Try plain HTTP before launching Chrome
+        self.image_workers = image_workers  # Concurrent image downloads per product
+        self.html_parser = html_parser  # lxml / html.parser / selectolax (None: SCRAPER_HTML_PARSER or lxml)
+        self.load_profile = load_profile  # full / extraction / minimal (None: the scraper's LOAD_PROFILE)
+        self.llm_priority = llm_priority  # LLM queue priority (lower runs first)
+        self.llm_timeout = llm_timeout  # LLM job deadline in seconds (None: LLM_TIMEOUT)
 
 
 class ScrapingResult:
     """Container for scraping results."""
     
     def __init__(self, success: bool = False, product: Optional[ProductData] = None, 
-                 images: List[str] = None, error: Optional[str] = None):
+                 images: List[str] = None, error: Optional[str] = None, blocked: bool = False,
+                 image_urls: List[str] = None, product_path: Optional[str] = None,
+                 pending_llm: Optional[List[str]] = None):
         self.success = success
         self.product = product
         self.images = images or []
+        self.image_urls = image_urls or []  # Source URLs the images were downloaded from
+        self.product_path = product_path  # Folder holding info.txt and Photos/
+        self.pending_llm = pending_llm  # Fields whose LLM answer the caller still has to apply (defer_llm)
         self.error = error
+        self.blocked = blocked  # True when the site served a CAPTCHA / bot wall
 
 
 class BaseScraper(ABC):
     """Abstract base class for web scrapers."""
     
-    def __init__(self, url: str, config: Optional[ScraperConfig] = None):
+    # Fields the browserless fast path must fill before Chrome can be skipped
+    FAST_PATH_REQUIRED_FIELDS = ['title', 'price']
+    
+    # Longest a readiness wait may take on this site (seconds)
+    WAIT_BUDGET = 10.0
+    
+    # Resources the browser skips on this site (see load_profile.py) plus site-specific URL patterns
+    LOAD_PROFILE = "extraction"
+    BLOCKED_URL_PATTERNS: List[str] = []
+    
+    def __init__(self, url: str, config: Optional[ScraperConfig] = None, driver_pool=None,
+                 progress: Optional[ScrapeProgress] = None, llm_queue=None):
         self.url = url
         self.config = config or ScraperConfig()
+        self.driver_pool = driver_pool
+        self.progress = progress  # Gets each stage (fields, images, LLM) as it lands
+        self.llm_queue = llm_queue  # Where LLM jobs go (None: this process's get_llm_queue())
+        self.defer_llm = False  # Return without waiting for the LLM; the caller applies it (apply_pending_llm)
         self.driver = None
         self.images = []
         self.HTML = None
+        self.snapshot: Optional[PageSnapshot] = None
+        self._structured = None  # (snapshot, StructuredProduct or None)
+        self.selector_timings: Dict[str, float] = {}  # field -> seconds to resolve in the live DOM
+        self.wait_timings: Dict[str, float] = {}  # readiness stage -> seconds waited (last wait)
+        self.network_usage: Dict[str, int] = {}  # bytes / requests / blocked for the browser page load
+        self._waiter: Optional[PageWaiter] = None
     
     def _get_next_proxy(self) -> Optional[Dict[str, str]]:
         """Get next proxy from the rotation list."""
-        global PROXY_INDEX
+        return _next_proxy()
         
-        if not USE_PROXIES or not PROXY_LIST:
-            return None
-        
-        proxy = PROXY_LIST[PROXY_INDEX % len(PROXY_LIST)]
-        PROXY_INDEX += 1
-        
-        # Format proxy with http:// if not already included
-        if not proxy.startswith('http'):
-            proxy = f'http://{proxy}'
-        
-        return {"http": proxy, "https": proxy}
-        
-    def _get_chrome_options(self, proxy: Optional[str] = None) -> uc.ChromeOptions:
+    def _get_chrome_options(self, proxy: Optional[str] = None) -> "uc.ChromeOptions":
         """Create Chrome options with anti-detection measures and optional proxy."""
-        opts = uc.ChromeOptions()
-        opts.add_argument("--headless=new")
-        opts.add_argument("--disable-gpu")
-        opts.add_argument("--no-sandbox")
-        opts.add_argument("--disable-dev-shm-usage")
-        opts.add_argument("--disable-blink-features=AutomationControlled")
-        opts.add_argument("--disable-infobars")
-        opts.add_argument("--disable-extensions")
-        opts.add_argument("--disable-web-security")
-        
-        # User agent
-        opts.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
-        
-        # Add proxy if provided
-        if proxy:
-            opts.add_argument(f"--proxy-server={proxy}")
-            print(f"🌐 Using proxy: {proxy}")
-        
-        return opts
+        return _chrome_options(proxy)
     
     def _get_chrome_major_version(self) -> Optional[int]:
-        """Detect the installed Chrome major version from the Windows registry."""
-        try:
-            import subprocess
-            output = subprocess.check_output(
-                r'reg query "HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon" /v version',
-                shell=True, stderr=subprocess.DEVNULL
-            ).decode()
-            match = re.search(r'(\d+)\.\d+\.\d+\.\d+', output)
-            if match:
-                return int(match.group(1))
-        except Exception:
-            pass
-        return None
+        """Detect the installed Chrome major version (cached per process)."""
+        return _chrome_major_version()
 
-    def _create_driver(self) -> uc.Chrome:
+    def _create_driver(self) -> "uc.Chrome":
         """Create and configure Chrome driver with enhanced anti-detection and proxy rotation."""
-        chrome_version = self._get_chrome_major_version()
-        if chrome_version:
-            print(f"🔍 Detected Chrome version: {chrome_version}")
-        else:
-            print("⚠️ Could not detect Chrome version, letting uc auto-detect")
-
-        proxy = self._get_next_proxy()
-        proxy_str = proxy["http"] if proxy else None
-        opts = self._get_chrome_options(proxy=proxy_str)
+        return create_chrome_driver()
 
-        kwargs = {"options": opts, "use_subprocess": True}
-        if chrome_version:
-            kwargs["version_main"] = chrome_version
+    def _open_driver(self) -> None:
+        """Lease a warm driver from the pool, or start a fresh one when no pool is set."""
+        if self.driver_pool:
+            self.driver = self.driver_pool.acquire()
+        else:
+            self.driver = self._create_driver()
+        self._apply_load_profile()
 
+    def _apply_load_profile(self) -> None:
+        """Block the heavy resources / third-party hosts this scraper never needs."""
+        profile = get_load_profile(self.config.load_profile or self.LOAD_PROFILE)
         try:
-            print("🔧 Initializing Chrome driver...")
-            driver = uc.Chrome(**kwargs)
-            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36'
-            })
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            print("✅ Chrome driver initialized successfully")
-            return driver
+            blocked = profile.apply(self.driver, extra=self.BLOCKED_URL_PATTERNS)
+            print(f"🚫 Load profile '{profile.name}': blocking {blocked} URL patterns")
         except Exception as e:
-            print(f"⚠️ Driver initialization failed: {e}")
-            print("\n💡 TROUBLESHOOTING TIPS:")
-            print("   1. Update Chrome browser to the latest version")
-            print("   2. Clear Chrome driver cache:")
-            print("      - Delete folder: C:\\Users\\{username}\\.cache\\undetected_chromedriver\\")
-            print("   3. Try running: pip install --upgrade undetected-chromedriver")
-            raise e
-    
+            print(f"⚠️ Could not apply load profile '{profile.name}': {e}")
+
+    def _record_network_usage(self) -> None:
+        """Report what the browser page load cost (bytes received, requests made and blocked)."""
+        if self._waiter is None or self._waiter.driver is not self.driver:
+            return
+        try:
+            self.network_usage = self._waiter.network_usage()
+        except Exception:
+            return
+        print(f"📦 Page load: {format_bytes(self.network_usage['bytes'])} over "
+              f"{self.network_usage['requests']} requests ({self.network_usage['blocked']} blocked)")
+
+    def _close_driver(self) -> None:
+        """Hand the driver back to the pool (or quit it when running without a pool)."""
+        if not self.driver:
+            return
+        self._record_network_usage()
+        try:
+            if self.driver_pool:
+                self.driver_pool.release(self.driver)
+            else:
+                pids = driver_root_pids(self.driver)
+                try:
+                    self.driver.quit()
+                finally:
+                    kill_tree(pids, timeout=2)  # quit() can leave chromedriver / renderers behind
+        finally:
+            self.driver = None
+
+    def _page_waiter(self) -> PageWaiter:
+        """Readiness waiter bound to the current driver."""
+        if self._waiter is None or self._waiter.driver is not self.driver:
+            self._waiter = PageWaiter(self.driver)
+        return self._waiter
+
+    def _navigate(self, url: str) -> None:
+        """Load a URL, starting network tracking fresh for the readiness wait."""
+        self._page_waiter().reset_network()
+        self.driver.get(url)
+
+    def _wait_for_page(self, selectors: Optional[List[dict]] = None,
+                       budget: Optional[float] = None, **kwargs) -> Dict[str, float]:
+        """
+        Wait until the page is ready (readyState, selectors, network idle, DOM quiet)
+        instead of sleeping a fixed time. Never longer than WAIT_BUDGET (or `budget`).
+        """
+        self.wait_timings = self._page_waiter().wait_until_ready(
+            budget=budget if budget is not None else self.WAIT_BUDGET,
+            selectors=selectors,
+            **kwargs
+        )
+        return self.wait_timings
+
     def _sanitize_filename(self, filename: str) -> str:
         """Remove invalid characters from filename."""
         return re.sub(r'[<>:\"/\\|?*]', '', filename)
@@ -205,39 +348,23 @@ class BaseScraper(ABC):
                 f.write(f"Tags: {product.tags}\n")
     
     def _download_images(self, product_path: str) -> List[str]:
-        """Download images to product directory."""
+        """Download images to product directory (in parallel, streamed to disk)."""
         photos_dir = os.path.join(product_path, "Photos")
-        downloaded_files = []
+        image_urls = self.images[:self.config.max_images]
+        proxies = [self._get_next_proxy() for _ in image_urls]
         
-        for index, image_url in enumerate(self.images[:self.config.max_images]):
-            try:
-                proxy = self._get_next_proxy()
-                response = requests.get(image_url, timeout=30, proxies=proxy)
-                if response.status_code == 200:
-                    # try:
-                    #     image = Image.open(io.BytesIO(response.content))
-                    #     if image.width < 300 or image.height < 300:
-                    #         print(f"⏭️ Skipping small image ({image.width}x{image.height}): {image_url[:60]}")
-                    #         continue
-                    # except Exception:
-                    #     print(f"⏭️ Skipping unreadable image: {image_url[:60]}")
-                    #     continue
-
-                    filename = f'image_{index+1}.jpg'
-                    filepath = os.path.join(photos_dir, filename)
-
-                    with open(filepath, 'wb') as file:
-                        file.write(response.content)
-
-                    downloaded_files.append(filepath)
-                    print(f"✅ Saved: {filepath}")
-                else:
-                    print(f"❌ Failed to download {image_url}: HTTP {response.status_code}")
-                    
-            except Exception as e:
-                print(f'❌ Failed to download {image_url}: {e}')
-                
-        return downloaded_files
+        downloader = ImageDownloader(max_workers=self.config.image_workers)
+        on_saved = (lambda index, path: self._notify("on_image", index, path)) if self.progress else None
+        return downloader.download_all(image_urls, photos_dir, proxies=proxies, on_saved=on_saved)
+
+    def _notify(self, hook: str, *args) -> None:
+        """Pass a finished stage to the progress listener (a failing listener never fails the scrape)."""
+        if not self.progress:
+            return
+        try:
+            getattr(self.progress, hook)(*args)
+        except Exception as e:
+            print(f"⚠️ Progress listener {hook} failed: {e}")
     
     @abstractmethod
     def extract_product_data(self) -> Optional[ProductData]:
@@ -254,10 +381,62 @@ class BaseScraper(ABC):
         """Check if this scraper supports the given URL."""
         pass
     
+    def extract_from_html(self, snapshot: PageSnapshot) -> Optional[ProductData]:
+        """Extract product data from static HTML (no browser). Override to enable the fast path."""
+        return None
+    
+    def _take_snapshot(self, html: Optional[str] = None) -> PageSnapshot:
+        """Capture the page once (from `html`, or the live DOM) and share it with every extractor."""
+        if html is None:
+            html = self.driver.page_source if self.driver else (self.HTML or "")
+        self.snapshot = PageSnapshot(html, backend=self.config.html_parser)
+        self.HTML = self.snapshot.html
+        return self.snapshot
+    
+    def _current_snapshot(self) -> PageSnapshot:
+        """The snapshot for the current DOM state, captured lazily if needed."""
+        return self.snapshot or self._take_snapshot()
+    
+    def _invalidate_snapshot(self) -> None:
+        """Call after interacting with the page so the next reader re-captures the DOM once."""
+        self.snapshot = None
+    
+    def _resolve_selectors(self, fields: Dict[str, List[dict]], timeout: Union[float, Dict[str, float]] = 10) -> Dict[str, str]:
+        """
+        Resolve every field's candidate selectors against the live DOM in one batched
+        poll. Returns field -> text ('' when not found before its deadline).
+        """
+        matches = SelectorEngine(self.driver).resolve(fields, timeout)
+        self.selector_timings.update({name: round(match.elapsed, 3) for name, match in matches.items()})
+        return {name: match.text for name, match in matches.items()}
+    
+    def _find_element_by_selectors(self, selectors: List[dict], timeout: int = 10) -> Optional[str]:
+        """Try multiple selectors to find an element (first non-empty text wins)."""
+        return self._resolve_selectors({"element": selectors}, timeout)["element"] or None
+    
+    def _structured_product(self, snapshot: Optional[PageSnapshot] = None) -> Optional[StructuredProduct]:
+        """Schema.org Product data (JSON-LD / microdata) for a snapshot, parsed once per snapshot."""
+        snapshot = snapshot or self._current_snapshot()
+        if self._structured is None or self._structured[0] is not snapshot:
+            structured = extract_structured_product(snapshot)
+            if structured:
+                print(f"🧩 Found schema.org product data ({structured.source}, {len(structured.images)} images)")
+            self._structured = (snapshot, structured)
+        return self._structured[1]
+    
+    def _with_structured_images(self, image_urls: List[str]) -> List[str]:
+        """Put the retailer's declared product images first, de-duplicated and capped."""
+        structured = self._structured_product()
+        merged = list(structured.images) if structured else []
+        for url in image_urls:
+            if url not in merged:
+                merged.append(url)
+        return merged[:self.config.max_images]
+    
     def _check_for_captcha(self) -> bool:
         """Check if the page is showing a CAPTCHA or bot detection."""
         try:
-            page_text = self.driver.page_source.lower()
+            page_text = self._current_snapshot().lowered
             captcha_indicators = [
                 'press & hold',
                 'confirm you are a human',
@@ -276,127 +455,221 @@ class BaseScraper(ABC):
         except:
             return False
     
-    def extract_product_data_LLM(self, HTML: str):
-        """Raw LLM extraction — returns the ollama response object. Used for testing."""
-        soup = BeautifulSoup(HTML, 'html.parser')
-        for tag in soup(['script', 'style']):
-            tag.decompose()
-        clean_HTML = soup.get_text(separator=' ', strip=True)
-
-        return ollama.chat(model='mistral', messages=[
-            {
-                'role': 'user',
-                'content': """You are a product data extractor. Given raw HTML from a product page, extract the product details and return ONLY a JSON object with these exact fields:
-                {
-                    "title": "",
-                    "price": "",
-                    "description": "",
-                    "color": "",
-                    "brand": "",
-                    "tags": "",
-                    "link": ""
-                }
-
-                Rules:
-                - Return ONLY the JSON object, no explanation, no markdown, no code blocks
-                - If a field cannot be found, leave it as an empty string
-                - price should include the currency symbol
-                - tags should be a comma-separated string of relevant keywords"""
-            },
-            {
-                'role': 'user',
-                'content': clean_HTML
-            }
-        ])
-
-    def _fill_missing_with_llm(self, product: ProductData, html: str) -> ProductData:
-        """Check for empty fields and use LLM to fill only what's missing."""
+    def extract_product_data_LLM(self, HTML):
+        """Raw LLM extraction of every product field — returns the ollama response object. Used for testing."""
+        import ollama
+
+        clean_HTML = self._llm_page_text(PageSnapshot.of(HTML, backend=self.config.html_parser))
+        fields = list(SOURCED_FIELDS)
+
+        return ollama.chat(model=LLM_MODEL, messages=build_llm_messages(clean_HTML, fields),
+                           format=output_format(fields))
+
+    def _llm_page_text(self, snapshot: PageSnapshot) -> str:
+        """The product region of the page within the LLM token budget (content_reducer.py)."""
+        try:
+            reduced = reduce_content(snapshot)
+        except Exception as e:
+            print(f"⚠️ Content reduction failed, sending raw page text: {e}")
+            return snapshot.clean_text[:LLM_TEXT_LIMIT]
+        if not reduced.text:
+            return snapshot.clean_text[:LLM_TEXT_LIMIT]
+        print(reduced.summary())
+        return reduced.text
+
+    def _llm_queue(self):
+        return self.llm_queue or get_llm_queue()
+
+    def _fill_missing_with_llm(self, product: ProductData, snapshot=None) -> ProductData:
+        """Check for empty fields and use LLM to fill only what's missing (blocking)."""
+        return self._apply_llm_fill(product, self._request_llm_fill(product, snapshot))
+
+    def _request_llm_fill(self, product: ProductData, snapshot=None) -> Optional[Tuple[List[str], Future]]:
+        """
+        Fill what structured data can, then queue an LLM job for the fields still
+        missing. Returns (missing fields, future) or None when no LLM call is needed.
+        Only the snapshot is used, so the driver can be released before waiting.
+        """
+        product.mark_sources("scraper")
+        if snapshot is not None:
+            snapshot = PageSnapshot.of(snapshot, backend=self.config.html_parser)
+        else:
+            snapshot = self._current_snapshot()
+
+        # Schema.org data is exact - use it before paying for an LLM call
+        structured = self._structured_product(snapshot)
+        if structured:
+            filled = structured.apply_to(product)
+            if filled:
+                print(f"🧩 Structured data filled: {filled}")
+            if structured.is_complete():
+                print("✅ Structured data has title, price and description, skipping LLM fallback")
+                return None
+
         fields = ['title', 'price', 'color', 'brand', 'tags', 'link']
         missing = [f for f in fields if not getattr(product, f)]
 
         # Always let LLM write the description — scrapers rarely get a good one
-        missing.append('description')
+        # (unless the retailer published one in its structured data)
+        if not (structured and structured.description):
+            missing.append('description')
 
         if not missing:
             print("✅ All fields present, skipping LLM fallback")
-            return product
-
-        print(f"🤖 LLM fallback — filling missing fields: {missing}")
+            return None
 
-        soup = BeautifulSoup(html, 'html.parser')
-        for tag in soup(['script', 'style']):
-            tag.decompose()
-        clean_html = soup.get_text(separator=' ', strip=True)[:8000]
+        print(f"🤖 LLM fallback — queueing missing fields: {missing}")
+        future = self._llm_queue().submit(self._llm_page_text(snapshot), missing,
+                                        priority=self.config.llm_priority,
+                                        timeout=self.config.llm_timeout)
+        return missing, future
 
-        template = {f: "" for f in missing}
+    def _apply_llm_fill(self, product: ProductData, pending: Optional[Tuple[List[str], Future]]) -> ProductData:
+        """Wait for a queued LLM job and copy its answers onto the product."""
+        if pending is None:
+            return product
+        missing, future = pending
 
+        # The queue enforces the deadline; the margin only guards against a stopped queue
+        timeout = self.config.llm_timeout or self._llm_queue().default_timeout
         try:
-            response = ollama.chat(model='mistral', messages=[
-                {
-                    'role': 'user',
-                    'content': f"""You are a product data extractor. Extract ONLY the following fields from the product page text and return ONLY a JSON object with these exact keys:
-{json.dumps(template, indent=2)}
-
-Rules:
-- Return ONLY the JSON object, no explanation, no markdown, no code blocks
-- If a field cannot be found, leave it as an empty string
-- price should include the currency symbol
-- tags should be a comma-separated string of relevant keywords"""
-                },
-                {
-                    'role': 'user',
-                    'content': clean_html
-                }
-            ])
-
-            raw = response['message']['content']
-            print(f"🤖 LLM raw response:\n{raw}\n")
-
-            # Strip markdown code fences if the LLM includes them
-            cleaned = raw.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("```")[1]
-                if cleaned.startswith("json"):
-                    cleaned = cleaned[4:]
-
-            llm_data = json.loads(cleaned)
-
-            for field in missing:
-                value = llm_data.get(field, "")
-                if not value:
-                    continue
-
-                if field == 'description':
-                    scraper_desc = product.description or ""
-                    if len(value) >= len(scraper_desc):
-                        product.description = value
-                        print(f"  ✅ LLM description chosen ({len(value)} chars vs scraper's {len(scraper_desc)} chars)")
-                    else:
-                        print(f"  ✅ Scraper description kept ({len(scraper_desc)} chars vs LLM's {len(value)} chars)")
-                else:
-                    setattr(product, field, value)
-                    print(f"  ✅ LLM filled '{field}': {str(value)[:80]}")
-
-        except json.JSONDecodeError as e:
-            print(f"⚠️ LLM fallback — failed to parse JSON: {e}")
-            print(f"   Raw response was: {raw}")
-        except Exception as e:
-            print(f"⚠️ LLM fallback failed: {e}")
+            llm_data = future.result(timeout=timeout + 30)
+        except FutureTimeout:
+            future.cancel()
+            print("⚠️ LLM fallback — no answer from the LLM queue, continuing without it")
+            return product
+        if not llm_data:
+            return product
 
+        filled = False
+        for field in missing:
+            value = llm_data.get(field, "")
+            if not value:
+                continue
+
+            if field == 'description':
+                scraper_desc = product.description or ""
+                if len(value) >= len(scraper_desc):
+                    product.description = value
+                    product.sources[field] = "llm"
+                    filled = True
+                    print(f"  ✅ LLM description chosen ({len(value)} chars vs scraper's {len(scraper_desc)} chars)")
+                else:
+                    print(f"  ✅ Scraper description kept ({len(scraper_desc)} chars vs LLM's {len(value)} chars)")
+            else:
+                setattr(product, field, value)
+                product.sources[field] = "llm"
+                filled = True
+                print(f"  ✅ LLM filled '{field}': {str(value)[:80]}")
+
+        if filled:
+            self._notify("on_llm", product)
         return product
 
+    def _try_http_fast_path(self) -> Optional[ScrapingResult]:
+        """
+        Scrape from static HTML over plain HTTP. Returns None when Chrome is still
+        needed (fetch failed, bot wall, required fields or images missing).
+        """
+        if not self.config.http_fast_path:
+            return None
+        
+        print("⚡ Trying browserless HTTP fast path...")
+        html = fetch_html(self.url, timeout=self.config.timeout, proxies=self._get_next_proxy())
+        if not html:
+            return None
+        
+        snapshot = self._take_snapshot(html)
+        if self._check_for_captcha():
+            print("⚡ Static HTML is behind bot detection, falling back to Chrome")
+            return None
+        
+        product = self.extract_from_html(snapshot)
+        structured = self._structured_product(snapshot)
+        if structured:
+            product = product or ProductData(link=self.url)
+            structured.apply_to(product)
+        if not product:
+            print("⚡ No product data in static HTML, falling back to Chrome")
+            return None
+        
+        missing = [f for f in self.FAST_PATH_REQUIRED_FIELDS if not getattr(product, f)]
+        if missing:
+            print(f"⚡ Static HTML missing {missing}, falling back to Chrome")
+            return None
+        
+        self.images = self.extract_images()
+        if not self.images:
+            print("⚡ No images in static HTML, falling back to Chrome")
+            return None
+        
+        print("⚡ Fast path succeeded, skipping Chrome")
+        return self._complete_scrape(product, self._request_llm_fill(product))
+    
+    def _complete_scrape(self, product: ProductData,
+                         pending_llm: Optional[Tuple[List[str], Future]] = None) -> ScrapingResult:
+        """
+        Finish a scrape in stages, each published to the progress listener as it
+        lands: the browser is released and the scraped fields go out first, images
+        download while the queued LLM job runs, and the LLM answer comes last.
+        """
+        self._close_driver()
+        product.mark_sources("scraper")
+        self._notify("on_fields", product)
+
+        # The product folder is named after the title - without one, the LLM has to answer first
+        if not product.title:
+            product = self._apply_llm_fill(product, pending_llm)
+            pending_llm = None
+
+        product_path = self._create_product_directory(product)
+        downloaded_files = self._download_images(product_path)
+        deferred = None
+        if pending_llm is not None and self.defer_llm:
+            deferred = pending_llm[0]  # The job keeps running; the caller waits for it, not this scraper
+        else:
+            product = self._apply_llm_fill(product, pending_llm)
+        self._save_product_info(product, product_path)
+        
+        print(f"✅ Successfully scraped product: {product.title}")
+        print(f"✅ Downloaded {len(downloaded_files)} images")
+        
+        return ScrapingResult(
+            success=True, 
+            product=product, 
+            images=downloaded_files,
+            image_urls=self.images[:self.config.max_images],
+            product_path=product_path,
+            pending_llm=deferred
+        )
+
+    def apply_pending_llm(self, result: ScrapingResult, future) -> ScrapingResult:
+        """Apply the LLM answer a defer_llm scrape left pending and rewrite its info.txt."""
+        if not (result.success and result.pending_llm) or future is None:
+            return result
+        result.product = self._apply_llm_fill(result.product, (result.pending_llm, future))
+        result.pending_llm = None
+        if result.product_path:
+            self._save_product_info(result.product, result.product_path)
+        return result
+
     def scrape(self) -> ScrapingResult:
         """Main scraping method that orchestrates the entire process."""
         try:
-            # Initialize driver
-            self.driver = self._create_driver()
+            # Browserless attempt first - Chrome only launches if it comes up short
+            fast_result = self._try_http_fast_path()
+            if fast_result:
+                return fast_result
+
+            # Initialize driver (leased from the pool when one is configured)
+            self._open_driver()
 
             # Navigate to URL
-            self.driver.get(self.url)
+            self._navigate(self.url)
             print(f"➡️ Navigated to: {self.url}")
 
-            # Save HTML
-            self.HTML = self.driver.page_source
+            # Capture the DOM once - captcha check, extractors and LLM all share it
+            self._take_snapshot()
 
             # Check for CAPTCHA
             if self._check_for_captcha():
@@ -404,33 +677,21 @@ Rules:
                 print(f"⚠️ {error_msg}")
                 return ScrapingResult(
                     success=False,
-                    error=error_msg
+                    error=error_msg,
+                    blocked=True
                 )
 
-            # Extract product data, then fill any missing fields with LLM
+            # Extract product data, then queue the LLM for any missing fields
             product = self.extract_product_data()
-            if product:
-                product = self._fill_missing_with_llm(product, self.HTML)
-
             if not product:
                 return ScrapingResult(success=False, error="Failed to extract product data")
+            pending_llm = self._request_llm_fill(product)
             
-            # Extract images
+            # Extract images while the LLM runs
             self.images = self.extract_images()
             
-            # Create directory and save data
-            product_path = self._create_product_directory(product)
-            self._save_product_info(product, product_path)
-            downloaded_files = self._download_images(product_path)
-            
-            print(f"✅ Successfully scraped product: {product.title}")
-            print(f"✅ Downloaded {len(downloaded_files)} images")
-            
-            return ScrapingResult(
-                success=True, 
-                product=product, 
-                images=downloaded_files
-            )
+            # The rest only needs the snapshot - hand the browser on, then save stage by stage
+            return self._complete_scrape(product, pending_llm)
             
         except Exception as e:
             error_msg = f"Scraping failed for {self.url}: {str(e)}"
@@ -438,5 +699,4 @@ Rules:
             return ScrapingResult(success=False, error=error_msg)
             
         finally:
-            if self.driver:
-                self.driver.quit()
+            self._close_driver()
@@ -0,0 +1,152 @@
+"""
+Shared Chrome discovery (binary path + version), cached per process.
+
+Every driver creation used to shell out to `reg query` for the Chrome version,
+which always fails on Linux (our Docker image installs google-chrome-stable)
+and leaves undetected_chromedriver to its own slower detection. Discovery now
+runs once per process; later calls only stat() the binary and re-detect when
+its mtime changes (i.e. Chrome was updated in place).
+
+USAGE:
+    install = get_chrome_install()
+    install.path, install.version, install.major
+    chrome_major_version()  # shortcut used by the scrapers and posters
+"""
+import os
+import re
+import sys
+import shutil
+import threading
+import subprocess
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+_LINUX_BINARIES = ["google-chrome-stable", "google-chrome", "chromium", "chromium-browser"]
+_LINUX_PATHS = ["/opt/google/chrome/chrome", "/usr/bin/google-chrome-stable", "/usr/bin/chromium"]
+_MAC_PATHS = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+
+_VERSION_RE = re.compile(r'(\d+)\.\d+\.\d+\.\d+')
+
+
+@dataclass
+class ChromeInstall:
+    """A discovered Chrome install (any field may be None when unknown)."""
+    path: Optional[str] = None
+    version: Optional[str] = None
+
+    @property
+    def major(self) -> Optional[int]:
+        return int(self.version.split(".")[0]) if self.version else None
+
+
+# (binary path, mtime) the cached install was detected from
+_cache: Optional[Tuple[Optional[str], Optional[float], ChromeInstall]] = None
+_cache_lock = threading.Lock()
+
+
+def get_chrome_install() -> ChromeInstall:
+    """Chrome binary and version, detected once and re-detected only if the binary changes."""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            path, mtime, install = _cache
+            if _mtime(path) == mtime:
+                return install
+
+        path = find_chrome_binary()
+        mtime = _mtime(path)
+        install = ChromeInstall(path=path, version=_detect_version(path))
+        _cache = (path, mtime, install)
+
+    if install.version:
+        print(f"🔍 Chrome {install.version} at {install.path or 'registry'}")
+    else:
+        print("⚠️ Could not detect Chrome version")
+    return install
+
+
+def chrome_major_version() -> Optional[int]:
+    """Installed Chrome major version (cached), or None."""
+    return get_chrome_install().major
+
+
+def clear_cache() -> None:
+    """Forget the cached install (e.g. after installing Chrome mid-process)."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+# ========== DISCOVERY ==========
+
+def find_chrome_binary() -> Optional[str]:
+    """Locate the Chrome executable (CHROME_BINARY env var wins)."""
+    override = os.getenv("CHROME_BINARY")
+    if override and os.path.isfile(override):
+        return override
+
+    for candidate in _candidate_paths():
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _candidate_paths() -> List[str]:
+    if sys.platform == "win32":
+        roots = [os.getenv("PROGRAMFILES"), os.getenv("PROGRAMFILES(X86)"), os.getenv("LOCALAPPDATA")]
+        return [os.path.join(root, "Google", "Chrome", "Application", "chrome.exe") for root in roots if root]
+    if sys.platform == "darwin":
+        return list(_MAC_PATHS)
+    return [shutil.which(name) for name in _LINUX_BINARIES] + _LINUX_PATHS
+
+
+def _detect_version(path: Optional[str]) -> Optional[str]:
+    if sys.platform == "win32":
+        return _windows_registry_version() or _windows_folder_version(path)
+    if path:
+        return _binary_version(path)
+    return None
+
+
+def _binary_version(path: str) -> Optional[str]:
+    """`chrome --version` -> 'Google Chrome 128.0.6613.84' (Linux / macOS)."""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_RE.search(output)
+    return match.group(0) if match else None
+
+
+def _windows_registry_version() -> Optional[str]:
+    """Read HKCU\\Software\\Google\\Chrome\\BLBeacon directly (no `reg query` subprocess)."""
+    try:
+        import winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+            value, _ = winreg.QueryValueEx(key, "version")
+    except (ImportError, OSError):
+        return None
+    match = _VERSION_RE.search(str(value))
+    return match.group(0) if match else None
+
+
+def _windows_folder_version(path: Optional[str]) -> Optional[str]:
+    """Chrome's Application folder holds a directory named after the installed version."""
+    if not path:
+        return None
+    try:
+        versions = [name for name in os.listdir(os.path.dirname(path)) if _VERSION_RE.fullmatch(name)]
+    except OSError:
+        return None
+    if not versions:
+        return None
+    return max(versions, key=lambda v: tuple(int(part) for part in v.split(".")))
+
+
+def _mtime(path: Optional[str]) -> Optional[float]:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
@@ -0,0 +1,300 @@
+"""
+Main-content text reduction for LLM input.
+
+The LLM fallback used to get the first 8000 characters of the page text, which
+on retail pages is mostly navigation, header, cookie banner and footer links -
+the product often starts after the cut. This stage sends the product instead:
+
+1. The visible text is split into blocks (text grouped by its nearest
+   block-level element: p, li, td, h1...)
+2. Each block is scored. Boilerplate containers (nav / header / footer / aside,
+   ids and classes like menu, cookie, breadcrumb, recommendations) and
+   link-heavy blocks lose points. Product containers (title, price,
+   description, features, specs), prices and the H1 neighbourhood gain them
+3. Repeated text (menus rendered twice, carousels) is kept once
+4. The best blocks fill a token budget and are emitted in page order, after
+   the page title / meta description
+
+Tokens are estimated as characters / 4 (close enough for English text on the
+Mistral / Llama tokenizers, and free). Every reduction reports what it saved;
+running totals are in reduction_stats().
+
+CONFIG (env):
+    LLM_TOKEN_BUDGET   tokens of page text sent to the LLM (default: 2000)
+
+USAGE:
+    reduced = reduce_content(snapshot)
+    reduced.text, reduced.tokens_saved
+"""
+import os
+import re
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from bs4 import NavigableString, CData, Tag
+
+from .page_snapshot import PageSnapshot
+
+DEFAULT_TOKEN_BUDGET = 2000
+CHARS_PER_TOKEN = 4
+
+# Elements that start a new block of text
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'button', 'dd', 'details', 'div', 'dl',
+    'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'label', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table',
+    'td', 'th', 'tr', 'ul',
+}
+INVISIBLE_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+BOILERPLATE_TAGS = {'nav', 'header', 'footer', 'aside', 'form'}
+
+# Matched against each ancestor's id / class / role / aria-label
+BOILERPLATE_PATTERN = re.compile(
+    r'nav|menu|header|footer|cookie|consent|gdpr|banner|breadcrumb|sidebar|newsletter|signup|'
+    r'sign-in|login|account|cart|modal|popup|share|social|recommend|related|sponsor|advert|'
+    r'carousel|also-viewed|similar|promo|skip', re.IGNORECASE)
+PRODUCT_PATTERN = re.compile(
+    r'product|title|price|description|detail|feature|spec|overview|about|dimension|buybox|'
+    r'dp-container|ppd|pdp', re.IGNORECASE)
+PRICE_PATTERN = re.compile(r'(?:[$€£¥₹]\s?\d)|(?:\d[\d,.]*\s?(?:USD|CAD|EUR|GBP))')
+
+# Blocks this far (in blocks) from the H1 still get part of the product-region bonus
+REGION_WINDOW = 40
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class Block:
+    """Text of one block-level element (its direct text, not its child blocks)."""
+    index: int
+    text: str
+    tag: str
+    link_chars: int = 0
+    boilerplate: bool = False
+    product: bool = False
+    score: float = 0.0
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / len(self.text) if self.text else 0.0
+
+
+@dataclass
+class ReducedContent:
+    """Reduced LLM input plus what the reduction did."""
+    text: str
+    original_tokens: int
+    tokens: int
+    blocks_total: int = 0
+    blocks_kept: int = 0
+    boilerplate_dropped: int = 0
+    duplicates_dropped: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+    def summary(self) -> str:
+        percent = 100 * self.tokens_saved / self.original_tokens if self.original_tokens else 0
+        return (f"✂️ LLM input: {self.original_tokens:,} → {self.tokens:,} tokens "
+                f"(saved {self.tokens_saved:,}, {percent:.0f}%; kept {self.blocks_kept}/{self.blocks_total} blocks, "
+                f"dropped {self.boilerplate_dropped} boilerplate, {self.duplicates_dropped} duplicates)")
+
+
+# ========== SEGMENTATION ==========
+
+def _attr_text(tag: Tag) -> str:
+    values = []
+    for name in ('id', 'class', 'role', 'aria-label', 'data-component-type'):
+        value = tag.get(name)
+        if value:
+            values.append(" ".join(value) if isinstance(value, list) else value)
+    return " ".join(values)
+
+
+class _Context:
+    """Memoized boilerplate / product flags for elements and their ancestors."""
+
+    def __init__(self):
+        self._flags: Dict[int, tuple] = {}
+
+    def flags(self, tag: Optional[Tag]) -> tuple:
+        if tag is None or not isinstance(tag, Tag) or tag.name == '[document]':
+            return False, False
+        key = id(tag)
+        if key not in self._flags:
+            boilerplate, product = self.flags(tag.parent)
+            attrs = _attr_text(tag)
+            # "related-products" is a carousel, not the product
+            here = tag.name in BOILERPLATE_TAGS or bool(BOILERPLATE_PATTERN.search(attrs))
+            boilerplate = boilerplate or here
+            product = product or (not here and bool(PRODUCT_PATTERN.search(attrs)))
+            self._flags[key] = (boilerplate, product)
+        return self._flags[key]
+
+
+def split_blocks(snapshot: PageSnapshot) -> List[Block]:
+    """Visible text grouped by nearest block-level element, in document order."""
+    blocks: Dict[int, Block] = {}
+    context = _Context()
+
+    for string in snapshot.soup.find_all(string=True):
+        if type(string) not in (NavigableString, CData):
+            continue  # comments, doctype, processing instructions
+        text = " ".join(string.split())
+        if not text:
+            continue
+
+        in_link = False
+        element = string.parent
+        invisible = False
+        while element is not None and element.name not in BLOCK_TAGS:
+            if element.name in INVISIBLE_TAGS:
+                invisible = True
+                break
+            if element.name == 'a':
+                in_link = True
+            element = element.parent
+        if invisible or element is None:
+            continue
+
+        block = blocks.get(id(element))
+        if block is None:
+            boilerplate, product = context.flags(element)
+            block = Block(index=len(blocks), text=text, tag=element.name,
+                          boilerplate=boilerplate, product=product)
+            blocks[id(element)] = block
+        else:
+            block.text += " " + text
+        if in_link:
+            block.link_chars += len(text)
+
+    return list(blocks.values())
+
+
+# ========== SCORING ==========
+
+def score_blocks(blocks: List[Block]) -> None:
+    """Score each block: positive looks like product content, zero or less is boilerplate."""
+    h1 = next((block.index for block in blocks if block.tag == 'h1'), None)
+
+    for block in blocks:
+        words = len(block.text.split())
+        score = min(words, 50) / 10  # Running text beats labels and menu items
+        if block.link_density > 0.5:
+            score -= 3
+        if block.boilerplate:
+            score -= 4
+        if block.product:
+            score += 3
+        if block.tag == 'h1':
+            score += 10
+        elif block.tag in ('h2', 'h3'):
+            score += 1
+        # Prices and nearness to the title only count inside content - carousels have prices too
+        if block.product or not block.boilerplate:
+            if PRICE_PATTERN.search(block.text):
+                score += 3
+            if h1 is not None:
+                score += 3 * max(0.0, 1 - abs(block.index - h1) / REGION_WINDOW)
+        block.score = score
+
+
+# ========== REDUCTION ==========
+
+def _page_header(snapshot: PageSnapshot) -> List[str]:
+    """Page title and meta description - short, and usually exactly the product."""
+    lines = []
+    for prop in ("og:title", "og:description", "description"):
+        content = snapshot.meta_content(prop)
+        if content:
+            lines.append(" ".join(content.split()))
+    if not lines and snapshot.soup.title and snapshot.soup.title.string:
+        lines.append(" ".join(snapshot.soup.title.string.split()))
+    return lines
+
+
+def reduce_content(snapshot: Any, token_budget: Optional[int] = None) -> ReducedContent:
+    """Product-focused page text within `token_budget` tokens (see module docstring)."""
+    snapshot = PageSnapshot.of(snapshot)
+    token_budget = token_budget or int(os.getenv("LLM_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+    original_tokens = estimate_tokens(snapshot.clean_text)
+    budget_chars = token_budget * CHARS_PER_TOKEN
+
+    blocks = split_blocks(snapshot)
+    score_blocks(blocks)
+
+    # Dedup on normalized text, keeping the best-scoring copy
+    seen = set()
+    header = []
+    for line in _page_header(snapshot):
+        key = line.lower()
+        if key not in seen:
+            seen.add(key)
+            header.append(line)
+    used = sum(len(line) + 1 for line in header)
+
+    boilerplate = duplicates = 0
+    chosen: List[tuple] = []
+    for block in sorted(blocks, key=lambda b: (-b.score, b.index)):
+        if block.score <= 0:
+            boilerplate += 1
+            continue
+        key = block.text.lower()
+        if key in seen:
+            duplicates += 1
+            continue
+        remaining = budget_chars - used
+        if remaining <= 0:
+            break
+        text = block.text
+        if len(text) + 1 > remaining:
+            if remaining < 200:
+                continue  # Too little room left for a useful fragment - try shorter blocks
+            text = text[:remaining - 1]
+        seen.add(key)
+        chosen.append((block.index, text))
+        used += len(text) + 1
+
+    lines = header + [text for _, text in sorted(chosen)]
+    text = "\n".join(lines)
+    reduced = ReducedContent(
+        text=text,
+        original_tokens=original_tokens,
+        tokens=estimate_tokens(text),
+        blocks_total=len(blocks),
+        blocks_kept=len(chosen),
+        boilerplate_dropped=boilerplate,
+        duplicates_dropped=duplicates,
+    )
+    _record(reduced)
+    return reduced
+
+
+# ========== RUNNING TOTALS ==========
+
+_totals = {"pages": 0, "original_tokens": 0, "tokens": 0}
+_totals_lock = threading.Lock()
+
+
+def _record(reduced: ReducedContent) -> None:
+    with _totals_lock:
+        _totals["pages"] += 1
+        _totals["original_tokens"] += reduced.original_tokens
+        _totals["tokens"] += reduced.tokens
+
+
+def reduction_stats() -> Dict[str, Any]:
+    """Tokens sent vs the full page text, over every reduction in this process."""
+    with _totals_lock:
+        saved = _totals["original_tokens"] - _totals["tokens"]
+        return {
+            **_totals,
+            "tokens_saved": saved,
+            "saved_ratio": round(saved / _totals["original_tokens"], 3) if _totals["original_tokens"] else 0.0,
+        }
@@ -0,0 +1,341 @@
+"""
+Pool of pre-warmed Chrome drivers shared across scrapes.
+
+Starting a fresh undetected Chrome process costs several seconds per URL, so
+scrapers lease a warm driver from the pool and hand it back when they are done.
+Returned drivers are reset (extra tabs closed, cookies and storage cleared) and
+recycled after a fixed number of pages, when they fail a health check, or when
+their process tree grows past the memory limit (see memory_watchdog.py).
+
+USAGE:
+    pool = get_driver_pool()
+    with pool.lease() as driver:
+        driver.get(url)
+"""
+import os
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .memory_watchdog import MemoryWatchdog, driver_root_pids, kill_tree, tree_rss, watchdog_from_env
+
+
+class _PooledDriver:
+    """Bookkeeping for a single driver owned by the pool."""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+        self.pids = driver_root_pids(driver)  # chromedriver + browser, for memory sampling / cleanup
+        self.rss = 0  # Last sampled process-tree RSS (bytes)
+        self.recycle = False  # Set by the watchdog: discard on release
+
+
+class DriverPool:
+    """Thread-safe pool of reusable Chrome drivers."""
+
+    def __init__(self,
+                 driver_factory: Callable[[], Any],
+                 size: int = 2,
+                 max_pages_per_driver: int = 25,
+                 acquire_timeout: float = 300,
+                 max_rss_mb: float = 0):
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.acquire_timeout = acquire_timeout
+        self.max_rss_bytes = int(max_rss_mb * 1024 * 1024)  # 0 = no memory limit
+        self.watchdog: Optional[MemoryWatchdog] = None
+
+        self._idle: List[_PooledDriver] = []
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    # ========== LIFECYCLE ==========
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """Start drivers until `count` (default: pool size) are alive. Returns drivers started."""
+        target = min(count or self.size, self.size)
+        started = 0
+
+        while True:
+            with self._cond:
+                if self._closed or self._live >= target:
+                    break
+                self._live += 1
+
+            try:
+                entry = _PooledDriver(self.driver_factory())
+            except Exception as e:
+                print(f"⚠️ Driver pool warm-up failed: {e}")
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                break
+
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+            started += 1
+
+        if started:
+            print(f"🔥 Driver pool warmed {started} Chrome instance(s)")
+        return started
+
+    def warm_async(self, count: Optional[int] = None) -> None:
+        """Warm the pool on a background thread so callers are not blocked."""
+        threading.Thread(target=self.warm, args=(count,), daemon=True).start()
+
+    def close(self) -> None:
+        """Quit every idle driver and stop handing out new ones."""
+        if self.watchdog:
+            self.watchdog.stop()
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+
+        for entry in idle:
+            self._quit(entry)
+
+    # ========== LEASING ==========
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Lease a healthy driver, starting a new one if the pool has spare capacity."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            entry = None
+            create = False
+
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._live < self.size:
+                        self._live += 1
+                        create = True
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No Chrome driver became available within {timeout}s")
+                    self._cond.wait(remaining)
+
+            if create:
+                try:
+                    entry = _PooledDriver(self.driver_factory())
+                except Exception:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(entry):
+                print("♻️ Pooled driver failed health check, replacing it")
+                self._discard(entry)
+                continue
+
+            with self._cond:
+                self._leased[id(entry.driver)] = entry
+            return entry.driver
+
+    def release(self, driver: Any, discard: bool = False) -> None:
+        """Return a leased driver. It is reset for reuse or recycled if worn out."""
+        with self._cond:
+            entry = self._leased.pop(id(driver), None)
+
+        if entry is None:
+            # Not one of ours - just make sure it does not leak
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return
+
+        entry.pages += 1
+
+        if discard or self._closed:
+            self._discard(entry)
+            return
+
+        if entry.pages >= self.max_pages_per_driver:
+            print(f"♻️ Recycling driver after {entry.pages} pages")
+            self._discard(entry)
+            return
+
+        if self.max_rss_bytes:
+            entry.rss = tree_rss(entry.pids)
+        if entry.recycle or (self.max_rss_bytes and entry.rss > self.max_rss_bytes):
+            print(f"♻️ Recycling driver using {entry.rss / (1024 * 1024):.0f} MB after {entry.pages} pages")
+            self._discard(entry)
+            return
+
+        if not self._reset(entry.driver):
+            print("♻️ Driver reset failed, recycling it")
+            self._discard(entry)
+            return
+
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Context manager wrapper around acquire()/release()."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage, including each driver's last sampled memory."""
+        with self._cond:
+            entries = self._idle + list(self._leased.values())
+            return {
+                "size": self.size,
+                "live": self._live,
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "pages_per_driver": [e.pages for e in entries],
+                "max_pages_per_driver": self.max_pages_per_driver,
+                "memory_mb_per_driver": [round(e.rss / (1024 * 1024)) for e in entries],
+                "total_memory_mb": round(sum(e.rss for e in entries) / (1024 * 1024)),
+                "max_rss_mb": self.max_rss_bytes // (1024 * 1024),
+                "watchdog": self.watchdog.stats() if self.watchdog else None,
+            }
+
+    # ========== MEMORY ==========
+
+    def owned_pids(self) -> Set[int]:
+        """Root PIDs of every driver the pool currently owns (never reaped as orphans)."""
+        with self._cond:
+            return {pid for e in self._idle + list(self._leased.values()) for pid in e.pids}
+
+    def enforce_memory_limit(self, max_rss_bytes: int) -> int:
+        """
+        Sample every driver's process-tree RSS. Idle drivers over the limit are
+        discarded now; leased ones are flagged and discarded on release.
+        Returns the number of drivers recycled or flagged.
+        """
+        with self._cond:
+            idle = list(self._idle)
+            leased = list(self._leased.values())
+
+        for entry in idle + leased:
+            entry.rss = tree_rss(entry.pids)
+
+        over = 0
+        for entry in leased:
+            if max_rss_bytes and entry.rss > max_rss_bytes and not entry.recycle:
+                print(f"🧠 Leased driver at {entry.rss / (1024 * 1024):.0f} MB, recycling when released")
+                entry.recycle = True
+                over += 1
+
+        for entry in idle:
+            if not (max_rss_bytes and entry.rss > max_rss_bytes):
+                continue
+            with self._cond:
+                if entry not in self._idle:
+                    continue  # Leased out meanwhile - release() checks it
+                self._idle.remove(entry)
+            print(f"♻️ Recycling idle driver using {entry.rss / (1024 * 1024):.0f} MB")
+            self._discard(entry)
+            over += 1
+
+        return over
+
+    # ========== HELPERS ==========
+
+    def _is_healthy(self, entry: _PooledDriver) -> bool:
+        """Check the browser is still responsive."""
+        try:
+            entry.driver.execute_script("return 1")
+            return len(entry.driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _reset(self, driver: Any) -> bool:
+        """Close extra tabs, drop cookies/storage and park the driver on a blank page."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            try:
+                origin = driver.execute_script("return window.location.origin")
+                if origin and origin.startswith("http"):
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                        "origin": origin,
+                        "storageTypes": "local_storage,session_storage,indexeddb,service_workers,cache_storage",
+                    })
+            except Exception:
+                pass
+
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            print(f"⚠️ Driver reset failed: {e}")
+            return False
+
+    def _discard(self, entry: _PooledDriver) -> None:
+        """Quit a driver and free its slot."""
+        self._quit(entry)
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    def _quit(self, entry: _PooledDriver) -> None:
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+        # quit() can leave chromedriver / renderer processes behind - make sure the tree is gone
+        kill_tree(entry.pids, timeout=2)
+
+
+# Global pool instance
+_pool_instance: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Get or create the shared driver pool (singleton pattern)."""
+    global _pool_instance
+    with _pool_lock:
+        if _pool_instance is None:
+            from .base_scraper import create_chrome_driver
+
+            _pool_instance = DriverPool(
+                driver_factory=create_chrome_driver,
+                size=int(os.getenv("DRIVER_POOL_SIZE", "2")),
+                max_pages_per_driver=int(os.getenv("DRIVER_POOL_MAX_PAGES", "25")),
+            )
+            # Samples driver memory, recycles oversized drivers and reaps orphaned Chrome processes
+            _pool_instance.watchdog = watchdog_from_env(_pool_instance)
+            _pool_instance.max_rss_bytes = _pool_instance.watchdog.max_rss_bytes
+            _pool_instance.watchdog.start()
+            atexit.register(_pool_instance.close)
+
+            if os.getenv("DRIVER_POOL_PREWARM", "1") == "1":
+                _pool_instance.warm_async()
+    return _pool_instance
+
+
+def peek_driver_pool() -> Optional[DriverPool]:
+    """The shared pool if one was created in this process (never starts Chrome)."""
+    return _pool_instance
@@ -7,18 +7,24 @@ import time
 import random
 
 from typing import Optional, List
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
 
 from .base_scraper import BaseScraper, ScrapingResult
 from .models import ProductData
+from .scraper_registry import register_scraper
+from .page_snapshot import PageSnapshot
 
 
+@register_scraper(fallback=True)
 class GenericScraper(BaseScraper):
     """Generic scraper with aggressive anti-detection for heavily protected sites."""
     
+    # Short readiness cap - the HTML is grabbed before any interaction
+    WAIT_BUDGET = 5.0
+    
+    # Extraction reads the raw HTML only, so stylesheets can be skipped too
+    LOAD_PROFILE = "minimal"
+    
     # Stealth injection scripts to bypass detection
     STEALTH_SCRIPTS = [
         # Remove navigator.webdriver
@@ -127,20 +133,24 @@ class GenericScraper(BaseScraper):
     def scrape(self) -> 'ScrapingResult':
         """Override scrape to grab HTML immediately before any interaction."""
         try:
+            # Static HTML often already has the OpenGraph data - skip Chrome if so
+            fast_result = self._try_http_fast_path()
+            if fast_result:
+                return fast_result
+            
             # Initialize driver
-            self.driver = self._create_driver()
+            self._open_driver()
             
             # Navigate to URL WITHOUT any stealth stuff yet
             print("🌐 Navigating to target URL...")
-            self.driver.get(self.url)
-            time.sleep(random.uniform(1, 2))
+            self._navigate(self.url)
+            self._wait_for_page()
             print(f"✅ Successfully loaded: {self.url}")
             
-            # IMMEDIATELY grab HTML before any interaction
+            # IMMEDIATELY grab HTML before any interaction (one snapshot shared by every step)
             print("📄 Grabbing page HTML immediately...")
-            initial_html = self.driver.page_source
-            soup = BeautifulSoup(initial_html, "html.parser")
-            print(f"✅ Captured {len(initial_html)} bytes of page source")
+            snapshot = self._take_snapshot()
+            print(f"✅ Captured {len(snapshot)} bytes of page source")
             
             # Check for CAPTCHA in initial load (before interaction)
             print("🔍 Checking for bot detection...")
@@ -149,36 +159,25 @@ class GenericScraper(BaseScraper):
                 print(f"⚠️ {error_msg}")
                 return ScrapingResult(
                     success=False, 
-                    error=error_msg
+                    error=error_msg,
+                    blocked=True
                 )
             else:
                 print("✅ No bot detection found, proceeding...")
             
             # Extract product data BEFORE any heavy interaction
             print("📊 Starting product data extraction from HTML...")
-            product = self._extract_from_soup(soup)
-            if product:
-                product = self._fill_missing_with_llm(product, initial_html)
+            product = self._extract_from_snapshot(snapshot)
             if not product:
                 return ScrapingResult(success=False, error="Failed to extract product data")
+            pending_llm = self._request_llm_fill(product, snapshot)
             
-            # Now that we have basic data, try to get images (may interact)
+            # Now that we have basic data, try to get images (may interact) while the LLM runs
             print("🖼️ Attempting image extraction...")
             self.images = self.extract_images()
             
-            # Create directory and save data
-            product_path = self._create_product_directory(product)
-            self._save_product_info(product, product_path)
-            downloaded_files = self._download_images(product_path)
-            
-            print(f"✅ Successfully scraped product: {product.title}")
-            print(f"✅ Downloaded {len(downloaded_files)} images")
-            
-            return ScrapingResult(
-                success=True, 
-                product=product, 
-                images=downloaded_files
-            )
+            # Release the browser before waiting on the LLM, then save
+            return self._complete_scrape(product, pending_llm)
             
         except Exception as e:
             error_msg = f"Scraping failed for {self.url}: {str(e)}"
@@ -186,16 +185,24 @@ class GenericScraper(BaseScraper):
             return ScrapingResult(success=False, error=error_msg)
             
         finally:
-            if self.driver:
-                self.driver.quit()
+            self._close_driver()
+    
+    def extract_from_html(self, snapshot: PageSnapshot) -> Optional[ProductData]:
+        """Fast-path extraction reuses the same snapshot-based strategies."""
+        return self._extract_from_snapshot(snapshot)
     
-    def _extract_from_soup(self, soup: BeautifulSoup) -> Optional[ProductData]:
-        """Extract product data directly from soup (no browser interaction needed)."""
+    def _extract_from_snapshot(self, snapshot: PageSnapshot) -> Optional[ProductData]:
+        """Extract product data directly from the snapshot (no browser interaction needed)."""
         product = ProductData()
         
+        # Schema.org JSON-LD / microdata is exact - heuristics only fill what it lacks
+        structured = self._structured_product(snapshot)
+        if structured:
+            structured.apply_to(product)
+        
         # Extract title
         print("ℹ️ Extracting title...")
-        title = self._find_best_title(soup)
+        title = self._sanitize_filename(product.title) if product.title else self._find_best_title(snapshot)
         if title:
             product.title = title
             print(f"✅ Found title: {product.title}")
@@ -205,16 +212,16 @@ class GenericScraper(BaseScraper):
         
         # Extract description
         print("ℹ️ Extracting description...")
-        description = self._find_best_description(soup)
+        description = product.description or self._find_best_description(snapshot)
         if description:
             product.description = description
             print(f"✅ Found description: {product.description[:100]}...")
         else:
             print("⚠️ Description not found")
         
-        # Extract price
+        # Extract price (the whole-page text scan only runs without structured data)
         print("ℹ️ Extracting price...")
-        price = self._find_best_price(soup)
+        price = product.price or self._find_best_price(snapshot)
         if price:
             product.price = price
             print(f"✅ Found price: {product.price}")
@@ -226,19 +233,9 @@ class GenericScraper(BaseScraper):
         
         return product
     
-    def _get_meta_property(self, soup: BeautifulSoup, prop: str) -> Optional[str]:
-        """Extract content from meta property or name tag."""
-        # Try property attribute first (OpenGraph)
-        tag = soup.find("meta", {"property": prop})
-        if tag and tag.get("content"):
-            return tag["content"]
-        
-        # Try name attribute as fallback
-        tag = soup.find("meta", {"name": prop})
-        if tag and tag.get("content"):
-            return tag["content"]
-        
-        return None
+    def _get_meta_property(self, snapshot: PageSnapshot, prop: str) -> Optional[str]:
+        """Extract content from meta property or name tag (property first, OpenGraph)."""
+        return snapshot.meta_content(prop)
     
     def _extract_price_from_text(self, text: str) -> Optional[str]:
         """Extract price from text using regex."""
@@ -258,39 +255,39 @@ class GenericScraper(BaseScraper):
         
         return None
     
-    def _find_best_title(self, soup: BeautifulSoup) -> Optional[str]:
+    def _find_best_title(self, snapshot: PageSnapshot) -> Optional[str]:
         """Find product title using multiple strategies."""
         # Strategy 1: OpenGraph
-        title = self._get_meta_property(soup, "og:title")
+        title = self._get_meta_property(snapshot, "og:title")
         if title:
             return self._sanitize_filename(title)
         
         # Strategy 2: Meta description tag
-        title = self._get_meta_property(soup, "title")
+        title = self._get_meta_property(snapshot, "title")
         if title:
             return self._sanitize_filename(title)
         
         # Strategy 3: H1 tag
-        h1 = soup.find("h1")
-        if h1 and h1.text.strip():
-            return self._sanitize_filename(h1.text.strip())
+        h1 = snapshot.select_one_text("h1")
+        if h1:
+            return self._sanitize_filename(h1)
         
         # Strategy 4: First h2
-        h2 = soup.find("h2")
-        if h2 and h2.text.strip():
-            return self._sanitize_filename(h2.text.strip())
+        h2 = snapshot.select_one_text("h2")
+        if h2:
+            return self._sanitize_filename(h2)
         
         return None
     
-    def _find_best_description(self, soup: BeautifulSoup) -> Optional[str]:
+    def _find_best_description(self, snapshot: PageSnapshot) -> Optional[str]:
         """Find product description using multiple strategies."""
         # Strategy 1: OpenGraph description
-        desc = self._get_meta_property(soup, "og:description")
+        desc = self._get_meta_property(snapshot, "og:description")
         if desc:
             return desc
         
         # Strategy 2: Meta description
-        desc = self._get_meta_property(soup, "description")
+        desc = self._get_meta_property(snapshot, "description")
         if desc:
             return desc
         
@@ -304,14 +301,13 @@ class GenericScraper(BaseScraper):
         ]
         
         for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem and elem.text.strip():
-                text = elem.text.strip()[:500]  # Limit to 500 chars
-                return text
+            text = snapshot.select_one_text(selector)
+            if text:
+                return text[:500]  # Limit to 500 chars
         
         return None
     
-    def _find_best_price(self, soup: BeautifulSoup) -> Optional[str]:
+    def _find_best_price(self, snapshot: PageSnapshot) -> Optional[str]:
         """Find product price using multiple strategies."""
         # Strategy 1: Look for price in common locations
         price_selectors = [
@@ -323,14 +319,14 @@ class GenericScraper(BaseScraper):
         ]
         
         for selector in price_selectors:
-            elem = soup.select_one(selector)
-            if elem and elem.text.strip():
-                price = self._extract_price_from_text(elem.text.strip())
+            text = snapshot.select_one_text(selector)
+            if text:
+                price = self._extract_price_from_text(text)
                 if price:
                     return price
         
         # Strategy 2: Search entire page for price patterns
-        page_text = soup.get_text()
+        page_text = snapshot.text
         price = self._extract_price_from_text(page_text)
         if price:
             return price
@@ -340,44 +336,7 @@ class GenericScraper(BaseScraper):
     def extract_product_data(self) -> Optional[ProductData]:
         """Extract product data from any e-commerce page."""
         try:
-            time.sleep(random.uniform(*self.config.request_delay))
-            
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            
-            product = ProductData()
-            
-            # Extract title
-            print("ℹ️ Extracting title...")
-            title = self._find_best_title(soup)
-            if title:
-                product.title = title
-                print(f"✅ Found title: {product.title}")
-            else:
-                print("❌ Failed to find product title")
-                return None
-            
-            # Extract description
-            print("ℹ️ Extracting description...")
-            description = self._find_best_description(soup)
-            if description:
-                product.description = description
-                print(f"✅ Found description: {product.description[:100]}...")
-            else:
-                print("⚠️ Description not found")
-            
-            # Extract price
-            print("ℹ️ Extracting price...")
-            price = self._find_best_price(soup)
-            if price:
-                product.price = price
-                print(f"✅ Found price: {product.price}")
-            else:
-                print("⚠️ Price not found")
-            
-            # Set link
-            product.link = self.url
-            
-            return product
+            return self._extract_from_snapshot(self._current_snapshot())
             
         except Exception as e:
             print(f"❌ Failed to extract product data: {e}")
@@ -388,23 +347,31 @@ class GenericScraper(BaseScraper):
         print("🌐 [START] extract_images (generic)")
         
         try:
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
+            snapshot = self._current_snapshot()
             image_urls = []
             
             # Strategy 1: OpenGraph image
-            og_image = self._get_meta_property(soup, "og:image")
+            og_image = self._get_meta_property(snapshot, "og:image")
             if og_image:
                 image_urls.append(og_image)
                 print(f"✅ Found OG image: {og_image[:60]}...")
             
             # Strategy 2: Twitter image
-            twitter_image = self._get_meta_property(soup, "twitter:image")
+            twitter_image = self._get_meta_property(snapshot, "twitter:image")
             if twitter_image and twitter_image not in image_urls:
                 image_urls.append(twitter_image)
                 print(f"✅ Found Twitter image: {twitter_image[:60]}...")
             
-            # Strategy 3: Collect all img tags
-            images = soup.find_all("img")
+            # Strategy 3: Retailer-declared product images (schema.org) - exact, so skip the <img> sweep
+            structured = self._structured_product(snapshot)
+            if structured and structured.images:
+                image_urls = self._with_structured_images(image_urls)
+                print(f"✅ Found {len(image_urls)} images (structured data)")
+                print("🌐 [END] extract_images")
+                return image_urls
+            
+            # Strategy 4: Collect all img tags
+            images = snapshot.img_attributes()
             print(f"🔍 Found {len(images)} <img> tags")
             
             for img in images:
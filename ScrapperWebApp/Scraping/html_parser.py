@@ -0,0 +1,88 @@
+"""
+Pluggable HTML parser backends.
+
+Parsing and selector evaluation is the biggest CPU cost per scrape, so the
+backend is configurable instead of hard-coding BeautifulSoup's pure-Python
+"html.parser":
+
+    lxml         BeautifulSoup on the C-backed lxml parser (default)
+    html.parser  BeautifulSoup on the stdlib parser (slowest, always available)
+    selectolax   Lexbor-based selectolax for CSS selection / text extraction,
+                 with a lazily built lxml BeautifulSoup tree for code that
+                 still needs the BeautifulSoup API
+
+Select with ScraperConfig(html_parser=...) or the SCRAPER_HTML_PARSER env var.
+Missing optional backends fall back to lxml, then html.parser.
+"""
+import os
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional
+    LexborHTMLParser = None
+
+DEFAULT_BACKEND = "lxml"
+SOUP_BACKENDS = ("lxml", "html.parser")
+FAST_BACKENDS = ("selectolax",)
+BACKENDS = SOUP_BACKENDS + FAST_BACKENDS
+
+_warned = set()
+
+
+def _warn_once(message: str) -> None:
+    if message not in _warned:
+        _warned.add(message)
+        print(f"⚠️ {message}")
+
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Pick the backend to use: explicit name, then SCRAPER_HTML_PARSER, then the default."""
+    name = (name or os.getenv("SCRAPER_HTML_PARSER") or DEFAULT_BACKEND).lower()
+
+    if name not in BACKENDS:
+        _warn_once(f"Unknown HTML parser '{name}', using {DEFAULT_BACKEND}")
+        name = DEFAULT_BACKEND
+
+    if name == "selectolax" and LexborHTMLParser is None:
+        _warn_once("selectolax is not installed, falling back to lxml")
+        name = "lxml"
+
+    if name == "lxml" and not _lxml_available():
+        _warn_once("lxml is not installed, falling back to html.parser")
+        name = "html.parser"
+
+    return name
+
+
+def soup_parser_for(backend: str) -> str:
+    """BeautifulSoup parser feature used for a backend's BeautifulSoup-compatible tree."""
+    if backend in SOUP_BACKENDS:
+        return backend
+    return "lxml" if _lxml_available() else "html.parser"
+
+
+def make_soup(html: str, backend: Optional[str] = None) -> BeautifulSoup:
+    """Parse HTML into a BeautifulSoup tree using the backend's parser."""
+    parser = soup_parser_for(resolve_backend(backend))
+    try:
+        return BeautifulSoup(html, parser)
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
+
+
+def make_fast_tree(html: str) -> Any:
+    """Parse HTML with selectolax (Lexbor). Only valid when selectolax is installed."""
+    if LexborHTMLParser is None:
+        raise RuntimeError("selectolax is not installed")
+    return LexborHTMLParser(html)
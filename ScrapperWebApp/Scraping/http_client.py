@@ -0,0 +1,75 @@
+"""
+Shared, connection-pooled HTTP client for browserless fetches.
+
+A single requests.Session is reused for every request so TCP/TLS connections
+to the same host are kept alive between scrapes. Headers mirror a real Chrome
+navigation (same approach as legacy/WayfairAPI.py) so static HTML is served
+the same way it would be to the browser.
+"""
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import get_rate_limiter
+
+BROWSER_HEADERS = {
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'accept-language': 'en-CA,en;q=0.9',
+    'cache-control': 'max-age=0',
+    'sec-ch-ua': '"Chromium";v="128", "Not;A=Brand";v="24", "Google Chrome";v="128"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'sec-fetch-dest': 'document',
+    'sec-fetch-mode': 'navigate',
+    'sec-fetch-site': 'none',
+    'sec-fetch-user': '?1',
+    'upgrade-insecure-requests': '1',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36',
+}
+
+# Keep-alive pool sizing: connections cached per host / hosts cached overall
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 20
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Get or create the shared pooled session (singleton pattern)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(BROWSER_HEADERS)
+            _session = session
+    return _session
+
+
+def fetch_html(url: str, timeout: float = 10,
+               proxies: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """Fetch a page's static HTML. Returns None on network errors or non-200 responses."""
+    try:
+        response = get_http_session().get(url, timeout=timeout, proxies=proxies)
+    except requests.RequestException as e:
+        print(f"⚠️ HTTP fetch failed for {url}: {e}")
+        return None
+
+    if response.status_code != 200:
+        print(f"⚠️ HTTP fetch returned {response.status_code} for {url}")
+        if response.status_code in (429, 503):
+            # The host is telling us to slow down
+            get_rate_limiter().record_failure(url, f"HTTP {response.status_code}")
+        return None
+
+    content_type = response.headers.get("content-type", "")
+    if content_type and "html" not in content_type:
+        print(f"⚠️ HTTP fetch returned non-HTML content ({content_type}) for {url}")
+        return None
+
+    return response.text
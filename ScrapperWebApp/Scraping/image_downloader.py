@@ -0,0 +1,124 @@
+"""
+Bounded-concurrency image downloader.
+
+Images for a product almost always come from one or two CDN hosts, so all
+downloads share the pooled keep-alive session from http_client and run on a
+small thread pool. Bodies are streamed to disk in chunks (never held fully in
+memory) and each image gets its own timeout and retry budget.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import requests
+
+from .http_client import get_http_session
+
+IMAGE_HEADERS = {
+    'accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+    'sec-fetch-dest': 'image',
+    'sec-fetch-mode': 'no-cors',
+    'sec-fetch-site': 'cross-site',
+}
+
+# Status codes worth retrying - anything else (404, 403...) fails immediately
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class ImageDownloader:
+    """Downloads image URLs in parallel, streaming each one to disk."""
+
+    def __init__(self,
+                 max_workers: int = 6,
+                 connect_timeout: float = 5,
+                 read_timeout: float = 30,
+                 retries: int = 2,
+                 backoff: float = 0.5,
+                 chunk_size: int = 64 * 1024):
+        self.max_workers = max(1, max_workers)
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+
+    def download_all(self, urls: Sequence[str], dest_dir: str,
+                     proxies: Optional[Sequence[Optional[Dict[str, str]]]] = None,
+                     filename_for: Optional[Callable[[int], str]] = None,
+                     on_saved: Optional[Callable[[int, str], None]] = None) -> List[str]:
+        """
+        Download every URL into dest_dir. Returns saved file paths in the same
+        order as `urls`, skipping the ones that failed. `on_saved(index, path)`
+        is called (from a download thread) the moment each image lands.
+        """
+        if not urls:
+            return []
+
+        filename_for = filename_for or (lambda index: f'image_{index + 1}.jpg')
+        proxies = proxies or [None] * len(urls)
+        workers = min(self.max_workers, len(urls))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._download_and_notify, index, url,
+                                os.path.join(dest_dir, filename_for(index)),
+                                proxies[index], on_saved)
+                for index, url in enumerate(urls)
+            ]
+            results = [future.result() for future in futures]
+
+        return [path for path in results if path]
+
+    def _download_and_notify(self, index: int, url: str, filepath: str,
+                             proxies: Optional[Dict[str, str]],
+                             on_saved: Optional[Callable[[int, str], None]]) -> Optional[str]:
+        path = self._download_one(url, filepath, proxies)
+        if path and on_saved:
+            try:
+                on_saved(index, path)
+            except Exception as e:
+                print(f"⚠️ Image callback failed for {path}: {e}")
+        return path
+
+    def _download_one(self, url: str, filepath: str,
+                      proxies: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Download a single image with retries. Returns the file path or None."""
+        session = get_http_session()
+        temp_path = filepath + ".part"
+
+        for attempt in range(self.retries + 1):
+            try:
+                with session.get(url, headers=IMAGE_HEADERS, timeout=self.timeout,
+                                 proxies=proxies, stream=True) as response:
+                    if response.status_code != 200:
+                        if response.status_code in RETRYABLE_STATUSES and attempt < self.retries:
+                            self._sleep_before_retry(attempt)
+                            continue
+                        print(f"❌ Failed to download {url}: HTTP {response.status_code}")
+                        return None
+
+                    with open(temp_path, 'wb') as file:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            if chunk:
+                                file.write(chunk)
+
+                os.replace(temp_path, filepath)
+                print(f"✅ Saved: {filepath}")
+                return filepath
+
+            except (requests.RequestException, OSError) as e:
+                if attempt < self.retries:
+                    self._sleep_before_retry(attempt)
+                    continue
+                print(f'❌ Failed to download {url}: {e}')
+            finally:
+                if os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+
+        return None
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        time.sleep(self.backoff * (2 ** attempt))
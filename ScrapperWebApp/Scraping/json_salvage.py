@@ -0,0 +1,104 @@
+"""
+Tolerant JSON object parsing for LLM replies.
+
+A reply that isn't exactly one valid JSON object used to be thrown away with
+the 10-60 seconds of inference behind it. This parser keeps whatever is
+usable:
+
+- markdown fences and chatter before / after the object are skipped
+- a reply cut off mid-object (token limit, deadline) keeps its complete members
+- trailing commas and dangling keys are dropped
+
+A member whose value was cut off is dropped rather than kept half-written -
+"$12" salvaged from "$129.99" would be worse than an empty field.
+
+USAGE:
+    salvaged = salvage_json_object(raw)
+    if salvaged:
+        salvaged.data, salvaged.complete
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+_decoder = json.JSONDecoder()
+
+# A body ending in one of these ends on a complete value; anything else
+# (a digit, a partial literal) may be a value cut short
+_CLOSING_TOKENS = ('"', '}', ']', 'true', 'false', 'null')
+
+
+@dataclass
+class SalvagedJson:
+    data: Dict[str, Any]
+    complete: bool  # False when members were dropped to make the object parse
+
+
+def _scan(text: str) -> Tuple[List[str], bool, List[int]]:
+    """
+    Walk the text once: the containers still open at the end, whether it ends
+    inside a string, and the position of every comma outside strings.
+    """
+    stack: List[str] = []
+    commas: List[int] = []
+    in_string = False
+    escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            commas.append(index)
+    return stack, in_string, commas
+
+
+def _close(prefix: str) -> Optional[Dict[str, Any]]:
+    """Close every open container of a prefix that ends between members, and parse it."""
+    stack, in_string, _ = _scan(prefix)
+    if in_string:
+        return None
+    prefix = prefix.rstrip().rstrip(",")
+    closers = "".join("}" if opener == "{" else "]" for opener in reversed(stack))
+    try:
+        data = json.loads(prefix + closers)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def salvage_json_object(text: str) -> Optional[SalvagedJson]:
+    """The first JSON object in `text`, repaired if needed. None when nothing is recoverable."""
+    start = text.find("{")  # Skips markdown fences and leading chatter
+    if start < 0:
+        return None
+    body = text[start:]
+
+    # Well-formed object, possibly followed by a closing fence or chatter
+    try:
+        data, _ = _decoder.raw_decode(body)
+        if isinstance(data, dict):
+            return SalvagedJson(data, complete=True)
+    except ValueError:
+        pass
+
+    # Truncated / malformed: cut after the last complete member and close what is open
+    _, _, commas = _scan(body)
+    cuts = list(reversed(commas))
+    if body.rstrip().endswith(_CLOSING_TOKENS):
+        cuts.insert(0, len(body))  # "129" may be "129.99" cut short - only keep the last member when it ended
+    for cut in cuts:
+        data = _close(body[:cut])
+        if data is not None:
+            return SalvagedJson(data, complete=False)
+    return None
@@ -0,0 +1,186 @@
+"""
+Persistent cache of LLM extraction results.
+
+_fill_missing_with_llm pays 10-60s of CPU inference per call, and re-scrapes /
+retries of the same page used to pay it again. Results are cached in SQLite,
+keyed by a SHA-256 over everything that determines the answer: the cleaned page
+text, the model, the prompt version and the requested fields. A hit returns
+the parsed JSON without touching Ollama.
+
+Bump the prompt version (LLM_PROMPT_VERSION in llm_enrichment.py) whenever the
+prompt changes, so stale answers are never served.
+
+Eviction: entries expire after LLM_CACHE_TTL seconds, and the least recently
+used ones are dropped once the cache holds more than LLM_CACHE_MAX_ENTRIES.
+
+CONFIG (env):
+    LLM_CACHE_PATH          SQLite file (default: ScrapperWebApp/.cache/llm_cache.sqlite3)
+    LLM_CACHE_TTL           seconds (default: 604800 = 7 days, 0 disables the cache)
+    LLM_CACHE_MAX_ENTRIES   LRU bound (default: 5000)
+
+USAGE:
+    cache = get_llm_cache()
+    data = cache.get(text, model, prompt_version, fields)    # dict or None
+    cache.put(text, model, prompt_version, fields, data, inference_seconds)
+    cache.stats()                                            # hit_rate, seconds_saved ...
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            ".cache", "llm_cache.sqlite3")
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    inference_seconds REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def cache_key(text: str, model: str, prompt_version: Any, fields: Iterable[str]) -> str:
+    """Content hash of everything that determines the LLM's answer (field order ignored)."""
+    digest = hashlib.sha256()
+    for part in (model, str(prompt_version), ",".join(sorted(fields)), text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed TTL + LRU cache of parsed LLM responses."""
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0  # Inference time the hits would have cost
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, text: str, model: str, prompt_version: Any,
+            fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """Cached parsed response, or None on a miss / expired entry."""
+        if not self.enabled:
+            return None
+
+        key = cache_key(text, model, prompt_version, fields)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response, inference_seconds, created_at FROM llm_cache WHERE key = ?",
+                (key,)).fetchone()
+
+            if row is None or now - row[2] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    conn.commit()
+                    self.evictions += 1
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            self.seconds_saved += row[1]
+
+        return json.loads(row[0])
+
+    def put(self, text: str, model: str, prompt_version: Any, fields: Iterable[str],
+            response: Dict[str, Any], inference_seconds: float = 0.0) -> None:
+        """Store a parsed response, then evict expired and least recently used entries."""
+        if not self.enabled:
+            return
+
+        key = cache_key(text, model, prompt_version, fields)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, model, response, inference_seconds, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, json.dumps(response), inference_seconds, now, now))
+            self.stores += 1
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        evicted = conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            evicted += conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?)", (overflow,)).rowcount
+        self.evictions += evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM llm_cache")
+            self._connection().commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit / miss counters since process start plus the current entry count."""
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "seconds_saved": round(self.seconds_saved, 1),
+            }
+
+
+# Global cache instance
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Get or create the shared LLM cache (singleton pattern)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                path=os.getenv("LLM_CACHE_PATH", DEFAULT_PATH),
+                ttl=float(os.getenv("LLM_CACHE_TTL", DEFAULT_TTL)),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+    return _cache
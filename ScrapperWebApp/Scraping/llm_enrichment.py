@@ -0,0 +1,341 @@
+"""
+Asynchronous LLM enrichment queue.
+
+The Ollama fallback used to run as a blocking call in the middle of a scrape,
+with the Chrome driver leased the whole time. Inference now runs on its own
+queue: scrapers submit a job as soon as the DOM is captured, hand the driver
+back to the pool, and only then wait for the answer. Browser capacity (driver
+pool size / processes) and LLM capacity (LLM_CONCURRENCY) scale independently.
+
+- One asyncio event loop on a daemon thread drives `ollama.AsyncClient`
+- LLM_CONCURRENCY workers pull from a priority queue - match it to the
+  inference server's parallelism (OLLAMA_NUM_PARALLEL)
+- Lower priority numbers run first: interactive API scrapes jump ahead of
+  batch runs
+- Every job carries a deadline; a job still queued (or still running) when it
+  passes resolves to None and the product is saved without the LLM fields
+- Answers go through the LLM cache (llm_cache.py) in both directions
+- Output is constrained by Ollama structured outputs (`format` = a JSON schema
+  of the requested fields), and replies are parsed tolerantly (json_salvage.py),
+  so a stray fence or a truncated reply no longer wastes the inference
+
+In process-pool mode (SCRAPER_PROCESSES) workers send their jobs to the parent
+process's queue (see process_pool.py), so the limit holds for the whole pool.
+
+CONFIG (env):
+    LLM_CONCURRENCY   concurrent Ollama requests (default: 2)
+    LLM_TIMEOUT       default per-job deadline in seconds (default: 180)
+    LLM_OUTPUT_FORMAT schema (default, needs Ollama >= 0.5), json, or off
+    OLLAMA_HOST       read by the ollama client itself
+
+USAGE:
+    queue = get_llm_queue()
+    future = queue.submit(page_text, ["title", "price"], priority=PRIORITY_BATCH)
+    ...                                   # release the driver, extract images...
+    data = future.result()                # dict, or None on failure / deadline
+"""
+import os
+import json
+import time
+import atexit
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .llm_cache import get_llm_cache
+from .json_salvage import salvage_json_object
+
+# Bump LLM_PROMPT_VERSION whenever the prompt changes - it is part of the LLM
+# cache key, so answers to the old prompt stop matching.
+LLM_MODEL = 'mistral'
+LLM_PROMPT_VERSION = 2
+LLM_TEXT_LIMIT = 8000  # Characters of raw page text sent when content reduction finds nothing
+
+PRIORITY_INTERACTIVE = 0  # A user is waiting on the API
+PRIORITY_BATCH = 10       # Orchestrator / CLI runs
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_TIMEOUT = 180.0
+DEFAULT_OUTPUT_FORMAT = "schema"
+
+
+def output_schema(fields: List[str]) -> Dict[str, Any]:
+    """JSON schema for a reply holding exactly `fields`, each a string."""
+    return {
+        "type": "object",
+        "properties": {name: {"type": "string"} for name in fields},
+        "required": list(fields),
+        "additionalProperties": False,
+    }
+
+
+def output_format(fields: List[str]) -> Any:
+    """`format` argument for ollama.chat per LLM_OUTPUT_FORMAT (None: unconstrained)."""
+    mode = os.getenv("LLM_OUTPUT_FORMAT", DEFAULT_OUTPUT_FORMAT).lower()
+    if mode == "schema":
+        return output_schema(fields)
+    if mode == "json":
+        return "json"
+    return None
+
+
+def build_llm_messages(page_text: str, fields: List[str]) -> List[Dict[str, str]]:
+    """Chat messages asking for exactly `fields` as a JSON object."""
+    template = {f: "" for f in fields}
+    return [
+        {
+            'role': 'user',
+            'content': f"""You are a product data extractor. Extract ONLY the following fields from the product page text and return ONLY a JSON object with these exact keys:
+{json.dumps(template, indent=2)}
+
+Rules:
+- Return ONLY the JSON object, no explanation, no markdown, no code blocks
+- If a field cannot be found, leave it as an empty string
+- price should include the currency symbol
+- tags should be a comma-separated string of relevant keywords"""
+        },
+        {
+            'role': 'user',
+            'content': page_text
+        }
+    ]
+
+
+@dataclass
+class ParsedReply:
+    """Requested fields from a model reply, and how cleanly they parsed."""
+    data: Dict[str, str]
+    complete: bool  # False when the reply had to be repaired (members may be missing)
+
+
+def _as_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value if item is not None)
+    return str(value)
+
+
+def parse_llm_json(raw: str, fields: Optional[List[str]] = None) -> Optional[ParsedReply]:
+    """
+    The requested fields in a model reply, salvaged from fenced, chatty or
+    truncated JSON. Values are coerced to strings (lists joined with ', ').
+    None when no object could be recovered.
+    """
+    salvaged = salvage_json_object(raw)
+    if salvaged is None or not salvaged.data:
+        print("⚠️ LLM fallback — no JSON object in the reply")
+        print(f"   Raw response was: {raw}")
+        return None
+
+    data = salvaged.data
+    if fields is not None:
+        data = {name: value for name, value in data.items() if name in fields}
+    if not salvaged.complete:
+        print(f"⚠️ LLM fallback — repaired malformed JSON, kept {sorted(data)}")
+    return ParsedReply({name: _as_text(value) for name, value in data.items()}, salvaged.complete)
+
+
+@dataclass(order=True)
+class LLMJob:
+    """One queued extraction; ordered by priority, then submission order."""
+    priority: int
+    seq: int
+    deadline: float = field(compare=False)  # time.monotonic()
+    page_text: str = field(compare=False)
+    fields: List[str] = field(compare=False)
+    future: Future = field(compare=False)
+
+
+class LLMQueue:
+    """Priority queue of LLM extractions served by async workers on a background loop."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, model: str = LLM_MODEL,
+                 default_timeout: float = DEFAULT_TIMEOUT):
+        self.concurrency = max(1, concurrency)
+        self.model = model
+        self.default_timeout = default_timeout
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._client = None
+        self._seq = itertools.count()
+        self.submitted = 0
+        self.cache_hits = 0
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+        self.running = 0
+        self.parsed = 0
+        self.repaired = 0
+        self.parse_failures = 0
+        self.inference_seconds = 0.0
+
+    # ========== SUBMITTING (any thread) ==========
+
+    def submit(self, page_text: str, fields: List[str], priority: int = PRIORITY_INTERACTIVE,
+               timeout: Optional[float] = None) -> Future:
+        """Queue an extraction. The future resolves to the parsed dict, or None."""
+        future: Future = Future()
+        cached = get_llm_cache().get(page_text, self.model, LLM_PROMPT_VERSION, fields)
+        if cached is not None:
+            print(f"💾 LLM cache hit - skipping inference for {fields}")
+            with self._lock:
+                self.cache_hits += 1
+            future.set_result(cached)
+            return future
+
+        timeout = timeout if timeout is not None else self.default_timeout
+        job = LLMJob(priority, next(self._seq), time.monotonic() + timeout, page_text, list(fields), future)
+        loop = self._ensure_started()
+        with self._lock:
+            self.submitted += 1
+        loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return future
+
+    def extract(self, page_text: str, fields: List[str], priority: int = PRIORITY_INTERACTIVE,
+                timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Submit and wait (blocking) for the answer."""
+        return self.submit(page_text, fields, priority, timeout).result()
+
+    # ========== EVENT LOOP (background thread) ==========
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_loop, args=(ready,),
+                                                name="llm-enrichment", daemon=True)
+                self._thread.start()
+                ready.wait()
+                print(f"🤖 LLM queue started: {self.concurrency} concurrent request(s) to {self.model}")
+            return self._loop
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.PriorityQueue()
+        for _ in range(self.concurrency):
+            self._loop.create_task(self._worker())
+        ready.set()
+        self._loop.run_forever()
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._serve(job)
+            finally:
+                self._queue.task_done()
+
+    async def _serve(self, job: LLMJob) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return  # The scraper stopped waiting
+
+        remaining = job.deadline - time.monotonic()
+        if remaining <= 0:
+            self._expire(job, "expired in the queue")
+            return
+
+        self.running += 1
+        try:
+            result = await asyncio.wait_for(self._extract(job), remaining)
+        except asyncio.TimeoutError:
+            self._expire(job, "deadline passed during inference")
+        except Exception as e:
+            print(f"⚠️ LLM fallback failed: {e}")
+            self.failed += 1
+            job.future.set_result(None)
+        else:
+            if result is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            job.future.set_result(result)
+        finally:
+            self.running -= 1
+
+    def _expire(self, job: LLMJob, reason: str) -> None:
+        print(f"⏰ LLM job for {job.fields} {reason}, continuing without LLM fields")
+        self.expired += 1
+        job.future.set_result(None)
+
+    async def _extract(self, job: LLMJob) -> Optional[Dict[str, Any]]:
+        if self._client is None:
+            import ollama
+            self._client = ollama.AsyncClient()
+
+        start = time.monotonic()
+        response = await self._client.chat(model=self.model,
+                                           messages=build_llm_messages(job.page_text, job.fields),
+                                           format=output_format(job.fields))
+        elapsed = time.monotonic() - start
+        self.inference_seconds += elapsed
+
+        raw = response['message']['content']
+        print(f"🤖 LLM raw response ({elapsed:.1f}s):\n{raw}\n")
+
+        reply = parse_llm_json(raw, job.fields)
+        if reply is None:
+            self.parse_failures += 1
+            return None
+
+        self.parsed += 1
+        if reply.complete:
+            # Repaired replies are used but not cached - the next scrape gets a fresh attempt
+            get_llm_cache().put(job.page_text, self.model, LLM_PROMPT_VERSION, job.fields, reply.data, elapsed)
+        else:
+            self.repaired += 1
+        return reply.data
+
+    # ========== LIFECYCLE ==========
+
+    def stats(self) -> Dict[str, Any]:
+        replies = self.parsed + self.parse_failures
+        return {
+            "concurrency": self.concurrency,
+            "model": self.model,
+            "started": self._loop is not None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "cache_hits": self.cache_hits,
+            "completed": self.completed,
+            "failed": self.failed,
+            "expired": self.expired,
+            "inference_seconds": round(self.inference_seconds, 1),
+            "parsed": self.parsed,
+            "repaired": self.repaired,
+            "parse_failures": self.parse_failures,
+            "parse_failure_rate": round(self.parse_failures / replies, 3) if replies else 0.0,
+        }
+
+    def close(self) -> None:
+        """Stop the loop; jobs still queued are abandoned (their scrapes time out)."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+
+
+# Global queue instance
+_queue: Optional[LLMQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_llm_queue() -> LLMQueue:
+    """Get or create the shared LLM queue (singleton pattern)."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = LLMQueue(
+                concurrency=int(os.getenv("LLM_CONCURRENCY", DEFAULT_CONCURRENCY)),
+                default_timeout=float(os.getenv("LLM_TIMEOUT", DEFAULT_TIMEOUT)),
+            )
+            atexit.register(_queue.close)
+    return _queue
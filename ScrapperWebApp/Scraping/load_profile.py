@@ -0,0 +1,105 @@
+"""
+Resource load profiles for extraction-only page loads.
+
+Scrapers only read the DOM; product images are re-fetched later by URL in
+_download_images. Letting Chrome download every image, font, video and
+third-party tracker wastes bandwidth and page-load time, which adds up fast
+when several browsers share one box.
+
+A profile is a list of CDP Network.setBlockedURLs patterns, applied once per
+lease of a driver (the driver pool clears the list on release). Heavy
+resource types are matched by file extension at the end of the path (with or
+without a query string), so "www.movies..." or "cdn.icons..." never match
+".mov" / ".ico"; trackers are matched by host.
+
+Profiles:
+    full        nothing blocked
+    extraction  images, media, fonts and third-party trackers (default)
+    minimal     extraction + stylesheets (for scrapers that only read raw HTML)
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"],
+    "media": ["mp4", "webm", "m3u8", "m4s", "mp3", "ogg", "mov"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "stylesheet": ["css"],
+}
+
+
+def extension_patterns(extension: str) -> List[str]:
+    """Blocked-URL patterns for a path ending in `.extension`, with or without a query string."""
+    return [f"*.{extension}", f"*.{extension}?*"]
+
+
+RESOURCE_TYPE_PATTERNS = {
+    resource_type: [pattern for extension in extensions for pattern in extension_patterns(extension)]
+    for resource_type, extensions in RESOURCE_TYPE_EXTENSIONS.items()
+}
+
+# Ads / analytics / session-replay hosts - never needed to read a product page
+THIRD_PARTY_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*googleadservices.com*",
+    "*doubleclick.net*", "*googlesyndication.com*", "*amazon-adsystem.com*",
+    "*facebook.net*", "*analytics.tiktok.com*", "*ct.pinterest.com*", "*sc-static.net*",
+    "*bat.bing.com*", "*clarity.ms*", "*hotjar.com*", "*fullstory.com*",
+    "*cdn.segment.com*", "*api.segment.io*", "*optimizely.com*",
+    "*nr-data.net*", "*js-agent.newrelic.com*", "*criteo.com*", "*criteo.net*",
+    "*taboola.com*", "*outbrain.com*", "*quantserve.com*", "*scorecardresearch.com*",
+    "*adsrvr.org*",
+]
+
+
+class LoadProfile:
+    """Which requests a page load may skip."""
+
+    def __init__(self, name: str, resource_types: Iterable[str] = (), block_third_party: bool = False):
+        self.name = name
+        self.resource_types = list(resource_types)
+        self.block_third_party = block_third_party
+
+    def blocked_patterns(self, extra: Iterable[str] = ()) -> List[str]:
+        """URL patterns for Network.setBlockedURLs (profile patterns + scraper extras)."""
+        patterns: List[str] = []
+        for resource_type in self.resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        if self.block_third_party:
+            patterns.extend(THIRD_PARTY_PATTERNS)
+        for pattern in extra:
+            if pattern not in patterns:
+                patterns.append(pattern)
+        return patterns
+
+    def apply(self, driver: Any, extra: Iterable[str] = ()) -> int:
+        """Install the profile on a driver. Returns the number of patterns blocked."""
+        patterns = self.blocked_patterns(extra)
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        return len(patterns)
+
+
+PROFILES: Dict[str, LoadProfile] = {
+    "full": LoadProfile("full"),
+    "extraction": LoadProfile("extraction", ["image", "media", "font"], block_third_party=True),
+    "minimal": LoadProfile("minimal", ["image", "media", "font", "stylesheet"], block_third_party=True),
+}
+
+DEFAULT_PROFILE = "extraction"
+
+
+def get_load_profile(name: Optional[str] = None) -> LoadProfile:
+    """Look up a profile by name (unknown names fall back to the default)."""
+    profile = PROFILES.get((name or DEFAULT_PROFILE).lower())
+    if profile is None:
+        print(f"⚠️ Unknown load profile '{name}', using {DEFAULT_PROFILE}")
+        profile = PROFILES[DEFAULT_PROFILE]
+    return profile
+
+
+def format_bytes(size: float) -> str:
+    """Human-readable byte count."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
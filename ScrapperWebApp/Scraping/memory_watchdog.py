@@ -0,0 +1,266 @@
+"""
+Chrome memory watchdog and orphan reaper.
+
+Long-lived drivers grow: renderer processes keep heap from every page they
+rendered, and a driver that throws before quit() (use_subprocess=True) leaves
+its chrome / chromedriver process tree behind. On 8 GB workers that ran us out
+of memory after a few hundred scrapes.
+
+The watchdog runs next to the driver pool on a background thread:
+- samples the RSS of each pooled driver's whole process tree
+  (chromedriver + browser + renderers / GPU / utility children)
+- recycles a driver whose tree crosses DRIVER_MAX_RSS_MB (idle drivers at
+  once, leased drivers when they are handed back)
+- reaps orphaned automation chrome / chromedriver processes at startup and on
+  every tick: their parent died (or they were re-parented to init) and no live
+  driver owns them
+
+Every process that starts drivers (the API, each process-pool worker) runs its
+own watchdog, so a process must never reap a sibling's browsers. Drivers are
+tagged with the pid of the process that started them (the SCRAPER_CHROME_OWNER
+environment variable, inherited by chromedriver and chrome), and the reaper
+only kills tagged trees whose owner is dead, or its own trees that lost their
+driver. Untagged browsers (other tools, older runs) are left alone.
+
+psutil is required for sampling and reaping; without it the watchdog logs
+once and stays off.
+
+CONFIG (env):
+    DRIVER_MAX_RSS_MB        recycle a driver above this tree RSS (default: 1500)
+    DRIVER_WATCHDOG_INTERVAL seconds between samples / reaps (default: 30, 0 disables)
+"""
+import os
+import time
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import psutil
+except ImportError:  # Optional at import time so API-only installs still start
+    psutil = None
+
+DEFAULT_MAX_RSS_MB = 1500
+DEFAULT_INTERVAL = 30
+
+# Processes the reaper may kill: chromedriver always, chrome only when started for automation
+DRIVER_PROCESS_NAMES = ("chromedriver",)
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "google-chrome", "chrome.exe")
+AUTOMATION_FLAGS = ("--remote-debugging-port", "--remote-debugging-pipe")
+# Orphans get re-parented to init or to a container's init shim
+INIT_PROCESS_NAMES = ("init", "systemd", "tini", "dumb-init", "docker-init", "launchd")
+# Never reap processes younger than this - a driver may be starting right now
+REAP_GRACE_SECONDS = 60
+# Environment variable holding the pid of the process that started a driver
+OWNER_ENV = "SCRAPER_CHROME_OWNER"
+
+_warned = False
+
+
+def psutil_available() -> bool:
+    global _warned
+    if psutil is None and not _warned:
+        _warned = True
+        print("⚠️ psutil not installed - Chrome memory watchdog and orphan reaping are disabled")
+    return psutil is not None
+
+
+# ========== PER-DRIVER MEMORY ==========
+
+def driver_root_pids(driver: Any) -> List[int]:
+    """PIDs a driver owns: the chromedriver service and the browser (uc exposes browser_pid)."""
+    pids = []
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is not None and getattr(process, "pid", None):
+        pids.append(process.pid)
+    browser_pid = getattr(driver, "browser_pid", None)
+    if browser_pid:
+        pids.append(browser_pid)
+    return pids
+
+
+def process_tree(pids: Iterable[int]) -> List["psutil.Process"]:
+    """The given processes plus all their descendants (dead ones skipped)."""
+    seen: Dict[int, "psutil.Process"] = {}
+    for pid in pids:
+        try:
+            root = psutil.Process(pid)
+            for proc in [root] + root.children(recursive=True):
+                seen.setdefault(proc.pid, proc)
+        except psutil.Error:
+            continue
+    return list(seen.values())
+
+
+def tree_rss(pids: Iterable[int]) -> int:
+    """Resident memory (bytes) of the process trees rooted at `pids`."""
+    if not psutil_available():
+        return 0
+    total = 0
+    for proc in process_tree(pids):
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+def driver_rss(driver: Any) -> int:
+    """Resident memory (bytes) of a driver's whole process tree."""
+    return tree_rss(driver_root_pids(driver))
+
+
+def kill_tree(pids: Iterable[int], timeout: float = 5) -> int:
+    """Terminate (then kill) the process trees rooted at `pids`. Returns processes stopped."""
+    if not psutil_available():
+        return 0
+    procs = process_tree(pids)
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+    return len(procs)
+
+
+# ========== ORPHAN REAPING ==========
+
+def mark_driver_owner() -> None:
+    """Tag drivers started from now on with this process's pid (call before launching one)."""
+    # Spawned workers inherit the parent's value - each process overwrites it with its own pid
+    os.environ[OWNER_ENV] = str(os.getpid())
+
+
+def _owner_pid(proc: "psutil.Process") -> Optional[int]:
+    """Pid of the process that started this driver, None when it isn't one of ours."""
+    try:
+        value = proc.environ().get(OWNER_ENV, "")
+    except psutil.Error:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def _is_automation_process(proc: "psutil.Process") -> bool:
+    name = (proc.name() or "").lower()
+    if any(marker in name for marker in DRIVER_PROCESS_NAMES):
+        return True
+    if name in BROWSER_PROCESS_NAMES or name.startswith(BROWSER_PROCESS_NAMES):
+        cmdline = " ".join(proc.cmdline())
+        return any(flag in cmdline for flag in AUTOMATION_FLAGS)
+    return False
+
+
+def _is_orphaned(proc: "psutil.Process") -> bool:
+    owner = _owner_pid(proc)
+    if owner is None:
+        return False  # Not started by a scraper
+    if owner != os.getpid():
+        # Another worker's driver - only fair game once that worker is gone
+        return not psutil.pid_exists(owner)
+    ppid = proc.ppid()
+    if ppid == os.getpid():
+        return False  # Our own child (e.g. a poster's browser) - alive and accounted for
+    if ppid <= 1 or not psutil.pid_exists(ppid):
+        return True
+    try:
+        return psutil.Process(ppid).name().lower() in INIT_PROCESS_NAMES
+    except psutil.Error:
+        return True
+
+
+def find_orphans(owned_pids: Optional[Set[int]] = None) -> List["psutil.Process"]:
+    """Our automation chrome / chromedriver roots whose driver or owning process is gone."""
+    if not psutil_available():
+        return []
+    owned_pids = owned_pids or set()
+    now = time.time()
+    try:
+        me = psutil.Process().username()
+    except psutil.Error:
+        me = None
+
+    orphans = []
+    for proc in psutil.process_iter(["pid"]):
+        try:
+            if proc.pid in owned_pids or now - proc.create_time() < REAP_GRACE_SECONDS:
+                continue
+            if me and proc.username() != me:
+                continue
+            if _is_automation_process(proc) and _is_orphaned(proc):
+                orphans.append(proc)
+        except psutil.Error:
+            continue
+    return orphans
+
+
+def reap_orphans(owned_pids: Optional[Set[int]] = None) -> int:
+    """Kill orphaned automation browser / chromedriver trees. Returns processes killed."""
+    orphans = find_orphans(owned_pids)
+    if not orphans:
+        return 0
+    freed = tree_rss(proc.pid for proc in orphans)
+    killed = kill_tree([proc.pid for proc in orphans])
+    print(f"🧹 Reaped {killed} orphaned Chrome process(es), freed ~{freed / (1024 * 1024):.0f} MB")
+    return killed
+
+
+# ========== WATCHDOG ==========
+
+class MemoryWatchdog:
+    """Samples pooled drivers' memory, flags oversized ones for recycling and reaps orphans."""
+
+    def __init__(self, pool: Any, max_rss_mb: float = DEFAULT_MAX_RSS_MB, interval: float = DEFAULT_INTERVAL):
+        self.pool = pool
+        self.max_rss_bytes = int(max_rss_mb * 1024 * 1024)
+        self.interval = interval
+        self.recycled = 0
+        self.reaped = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MemoryWatchdog":
+        """Reap leftovers from earlier runs, then sample on a daemon thread."""
+        if self.interval <= 0 or not psutil_available():
+            return self
+        self.reaped += reap_orphans(self.pool.owned_pids())
+        self._thread = threading.Thread(target=self._run, name="chrome-memory-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"⚠️ Memory watchdog tick failed: {e}")
+
+    def tick(self) -> None:
+        """One sample: update per-driver RSS, recycle oversized drivers, reap orphans."""
+        self.recycled += self.pool.enforce_memory_limit(self.max_rss_bytes)
+        self.reaped += reap_orphans(self.pool.owned_pids())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self._thread is not None,
+            "max_rss_mb": self.max_rss_bytes // (1024 * 1024),
+            "interval_sec": self.interval,
+            "recycled": self.recycled,
+            "reaped": self.reaped,
+        }
+
+
+def watchdog_from_env(pool: Any) -> MemoryWatchdog:
+    return MemoryWatchdog(
+        pool,
+        max_rss_mb=float(os.getenv("DRIVER_MAX_RSS_MB", DEFAULT_MAX_RSS_MB)),
+        interval=float(os.getenv("DRIVER_WATCHDOG_INTERVAL", DEFAULT_INTERVAL)),
+    )
@@ -1,4 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict
+
+# Fields whose origin is tracked in ProductData.sources
+SOURCED_FIELDS = ("title", "price", "description", "color", "brand", "tags", "link")
+
 
 @dataclass
 class ProductData:
@@ -8,4 +13,12 @@ class ProductData:
     color: str = ""
     brand: str = ""
     tags: str = ""
-    link: str = ""
\ No newline at end of file
+    link: str = ""
+    # field -> where its value came from: "scraper", "json-ld" / "microdata" or "llm"
+    sources: Dict[str, str] = field(default_factory=dict)
+
+    def mark_sources(self, source: str) -> None:
+        """Attribute every filled field without a recorded source to `source`."""
+        for name in SOURCED_FIELDS:
+            if getattr(self, name) and name not in self.sources:
+                self.sources[name] = source
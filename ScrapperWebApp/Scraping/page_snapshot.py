@@ -0,0 +1,161 @@
+"""
+Per-scrape document snapshot.
+
+Pulling page_source out of Chrome and re-parsing it is expensive on multi-MB
+retail pages, so a scrape captures the HTML once and every extractor shares
+the same snapshot: the parsed tree, the lowered HTML (for bot-wall checks)
+and the cleaned visible text (for the LLM) are each built lazily, once.
+
+The parser backend is pluggable (see html_parser.py). Scrapers should prefer
+the backend-neutral helpers (meta_content, select_one_text, img_attributes,
+text, clean_text), which run on selectolax when it is selected; `soup` is
+always available for code that needs the full BeautifulSoup API.
+"""
+from typing import Any, Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup, NavigableString, CData
+
+from .html_parser import resolve_backend, make_soup, make_fast_tree, FAST_BACKENDS
+
+# Tags whose text is never visible content
+_INVISIBLE_TAGS = {'script', 'style', 'noscript', 'template'}
+
+
+class PageSnapshot:
+    """HTML captured once per DOM state, parsed lazily exactly once."""
+
+    def __init__(self, html: str, backend: Optional[str] = None):
+        self.html = html or ""
+        self.backend = resolve_backend(backend)
+        self._soup: Optional[BeautifulSoup] = None
+        self._fast_tree: Any = None
+        self._lowered: Optional[str] = None
+        self._text: Optional[str] = None
+        self._clean_text: Optional[str] = None
+
+    @classmethod
+    def from_driver(cls, driver: Any, backend: Optional[str] = None) -> "PageSnapshot":
+        """Capture the live DOM of a Selenium driver."""
+        return cls(driver.page_source, backend=backend)
+
+    @classmethod
+    def of(cls, html_or_snapshot: Union[str, "PageSnapshot"],
+           backend: Optional[str] = None) -> "PageSnapshot":
+        """Accept either raw HTML or an existing snapshot."""
+        if isinstance(html_or_snapshot, PageSnapshot):
+            return html_or_snapshot
+        return cls(html_or_snapshot, backend=backend)
+
+    def __len__(self) -> int:
+        return len(self.html)
+
+    # ========== TREES ==========
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """BeautifulSoup tree (parsed on first access)."""
+        if self._soup is None:
+            self._soup = make_soup(self.html, self.backend)
+        return self._soup
+
+    @property
+    def fast_tree(self) -> Any:
+        """selectolax tree, or None when the backend is BeautifulSoup-based."""
+        if self._fast_tree is None and self.backend in FAST_BACKENDS:
+            self._fast_tree = make_fast_tree(self.html)
+        return self._fast_tree
+
+    # ========== QUERIES ==========
+
+    def meta_content(self, prop: str) -> Optional[str]:
+        """Content of <meta property=prop> (OpenGraph), falling back to <meta name=prop>."""
+        for attr in ("property", "name"):
+            if self.fast_tree is not None:
+                node = self.fast_tree.css_first(f'meta[{attr}="{prop}"]')
+                content = node.attributes.get("content") if node is not None else None
+            else:
+                tag = self.soup.find("meta", {attr: prop})
+                content = tag.get("content") if tag else None
+            if content:
+                return content
+        return None
+
+    def select_one_text(self, selector: str, separator: Optional[str] = None) -> Optional[str]:
+        """
+        Stripped text of the first element matching a CSS selector, or None if
+        missing/empty. With `separator`, every text node is stripped and joined
+        with it (like get_text(separator, strip=True)).
+        """
+        if self.fast_tree is not None:
+            node = self.fast_tree.css_first(selector)
+            if node is None:
+                return None
+            text = node.text() if separator is None else node.text(separator=separator, strip=True)
+        else:
+            elem = self.soup.select_one(selector)
+            if elem is None:
+                return None
+            text = elem.text if separator is None else elem.get_text(separator=separator, strip=True)
+        return text.strip() or None
+
+    def select_texts(self, selector: str) -> List[str]:
+        """Raw text of every element matching a CSS selector (e.g. JSON-LD script bodies)."""
+        if self.fast_tree is not None:
+            return [node.text() for node in self.fast_tree.css(selector)]
+        return [elem.get_text() for elem in self.soup.select(selector)]
+
+    def img_attributes(self) -> List[Dict[str, str]]:
+        """Attributes of every <img> in document order (missing values as '')."""
+        if self.fast_tree is not None:
+            return [{key: value or "" for key, value in node.attributes.items()}
+                    for node in self.fast_tree.css("img")]
+        return [{key: " ".join(value) if isinstance(value, list) else (value or "")
+                 for key, value in img.attrs.items()}
+                for img in self.soup.find_all("img")]
+
+    # ========== TEXT ==========
+
+    @property
+    def lowered(self) -> str:
+        """Lower-cased raw HTML, for cheap substring checks (CAPTCHA markers etc.)."""
+        if self._lowered is None:
+            self._lowered = self.html.lower()
+        return self._lowered
+
+    @property
+    def text(self) -> str:
+        """All document text, unfiltered (equivalent to soup.get_text())."""
+        if self._text is None:
+            if self.fast_tree is not None:
+                self._text = self.fast_tree.text()
+            else:
+                self._text = self.soup.get_text()
+        return self._text
+
+    @property
+    def clean_text(self) -> str:
+        """
+        Visible text, space-separated: what get_text(' ', strip=True) returns after
+        decomposing script/style (and noscript/template) tags, but computed
+        without mutating the shared tree.
+        """
+        if self._clean_text is None:
+            if self.fast_tree is not None:
+                tree = self.fast_tree.clone()
+                tree.strip_tags(list(_INVISIBLE_TAGS))
+                self._clean_text = tree.text(separator=" ", strip=True)
+            else:
+                self._clean_text = self._clean_text_from_soup()
+        return self._clean_text
+
+    def _clean_text_from_soup(self) -> str:
+        parts = []
+        for string in self.soup.find_all(string=True):
+            if type(string) not in (NavigableString, CData):
+                continue  # comments, doctype, processing instructions
+            if string.parent is not None and string.parent.name in _INVISIBLE_TAGS:
+                continue
+            text = string.strip()
+            if text:
+                parts.append(text)
+        return " ".join(parts)
@@ -0,0 +1,231 @@
+"""
+Readiness-driven page waits.
+
+Fixed sleeps pay their full duration even when the content was there on first
+paint. PageWaiter instead returns as soon as the page is actually ready:
+
+    1. document.readyState is interactive/complete
+    2. the required selectors have text (batched via SelectorEngine)
+    3. the network is idle (CDP Network events from Chrome's performance log,
+       falling back to the Resource Timing buffer when logging is unavailable)
+    4. the DOM has stopped mutating (MutationObserver quiescence)
+
+All stages share one budget, so a slow site can never wait longer than its
+scraper's WAIT_BUDGET. Since the waiter consumes the performance log, it also
+keeps the page's byte / request / blocked-request counters (network_usage).
+"""
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from .selector_engine import SelectorEngine
+
+# Tracks the time of the last DOM mutation in the page (installed once per document)
+_INSTALL_OBSERVER_SCRIPT = """
+if (!window.__scraperMutationObserver) {
+    window.__scraperLastMutation = performance.now();
+    window.__scraperMutationObserver = new MutationObserver(() => {
+        window.__scraperLastMutation = performance.now();
+    });
+    window.__scraperMutationObserver.observe(document.documentElement || document,
+        {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__scraperLastMutation;
+"""
+
+_MS_SINCE_MUTATION_SCRIPT = """
+return window.__scraperLastMutation === undefined ? null : performance.now() - window.__scraperLastMutation;
+"""
+
+_RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+
+# Requests that never "finish" in a way that matters for content readiness
+_IGNORED_REQUEST_TYPES = {'WebSocket', 'EventSource', 'Ping'}
+
+# Requests pending longer than this are treated as long-polling and ignored
+STALE_REQUEST_SECONDS = 10.0
+
+
+class PageWaiter:
+    """Waits for a live page to become ready, bounded by a time budget."""
+
+    def __init__(self, driver: Any, poll_interval: float = 0.1):
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, float] = {}
+        self._perf_log_available: Optional[bool] = None
+        self.bytes_received = 0
+        self.requests = 0
+        self.blocked = 0
+
+    def reset_network(self) -> None:
+        """Drain the performance log and zero the counters (call right before navigating)."""
+        self._drain_network_events()
+        self._inflight.clear()
+        self.bytes_received = 0
+        self.requests = 0
+        self.blocked = 0
+
+    def network_usage(self) -> Dict[str, int]:
+        """Bytes received and requests made/blocked since the last reset_network()."""
+        self._drain_network_events()
+        return {"bytes": self.bytes_received, "requests": self.requests, "blocked": self.blocked}
+
+    def wait_until_ready(self,
+                         budget: float = 10.0,
+                         selectors: Optional[List[dict]] = None,
+                         network_idle: bool = True,
+                         dom_quiet: bool = True,
+                         quiet_window: float = 0.5) -> Dict[str, float]:
+        """
+        Run the readiness stages in order within `budget` seconds. Returns the time
+        each stage took; stages that hit the budget are reported as timed out.
+        """
+        start = time.monotonic()
+        deadline = start + budget
+        timings: Dict[str, float] = {}
+        timed_out: List[str] = []
+
+        stages = [("readyState", lambda: self.wait_for_ready_state(deadline))]
+        if selectors:
+            stages.append(("selectors", lambda: self.wait_for_selectors(selectors, deadline)))
+        if network_idle:
+            stages.append(("network", lambda: self.wait_for_network_idle(deadline, quiet_window)))
+        if dom_quiet:
+            stages.append(("dom", lambda: self.wait_for_dom_quiet(deadline, quiet_window)))
+
+        for name, stage in stages:
+            stage_start = time.monotonic()
+            ready = stage()
+            timings[name] = round(time.monotonic() - stage_start, 2)
+            if not ready:
+                timed_out.append(name)
+            if time.monotonic() >= deadline:
+                break
+
+        total = time.monotonic() - start
+        detail = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in timings.items())
+        if timed_out or total >= budget:
+            print(f"⌛ Wait budget {budget:.0f}s used ({detail}); not ready: {timed_out or 'budget'}")
+        else:
+            print(f"⏳ Page ready in {total:.1f}s ({detail})")
+        timings["total"] = round(total, 2)
+        return timings
+
+    # ========== STAGES ==========
+
+    def wait_for_ready_state(self, deadline: float, states=("interactive", "complete")) -> bool:
+        """Wait for document.readyState to reach one of `states`."""
+        while True:
+            try:
+                if self.driver.execute_script("return document.readyState") in states:
+                    return True
+            except Exception:
+                pass  # navigation in progress
+            if not self._sleep_until_next_poll(deadline):
+                return False
+
+    def wait_for_selectors(self, selectors: List[dict], deadline: float) -> bool:
+        """Wait until any of the candidate selectors has text."""
+        remaining = max(0.0, deadline - time.monotonic())
+        match = SelectorEngine(self.driver).resolve({"ready": selectors}, timeout=remaining)["ready"]
+        return match.found
+
+    def wait_for_network_idle(self, deadline: float, quiet_window: float = 0.5,
+                              max_inflight: int = 2) -> bool:
+        """
+        Wait until at most `max_inflight` requests have been pending for
+        `quiet_window` seconds (long-lived analytics beacons never settle).
+        """
+        quiet_since = None
+        last_count = -1
+        while True:
+            if self._perf_log_available is not False:
+                self._drain_network_events()
+            if self._perf_log_available:
+                now = time.monotonic()
+                pending = sum(1 for sent in self._inflight.values() if now - sent < STALE_REQUEST_SECONDS)
+                busy = pending > max_inflight
+            else:
+                # No CDP log: treat a growing resource-timing buffer as activity
+                count = self._resource_count()
+                busy = count != last_count
+                last_count = count
+
+            now = time.monotonic()
+            if busy:
+                quiet_since = None
+            elif quiet_since is None:
+                quiet_since = now
+            elif now - quiet_since >= quiet_window:
+                return True
+
+            if not self._sleep_until_next_poll(deadline):
+                return False
+
+    def wait_for_dom_quiet(self, deadline: float, quiet_window: float = 0.5) -> bool:
+        """Wait until no DOM mutation has happened for `quiet_window` seconds."""
+        try:
+            self.driver.execute_script(_INSTALL_OBSERVER_SCRIPT)
+        except Exception:
+            return True  # cannot observe (e.g. document replaced mid-call) - don't block on it
+
+        while True:
+            try:
+                # A navigation replaces window, so re-install when the marker is gone
+                quiet_ms = self.driver.execute_script(_MS_SINCE_MUTATION_SCRIPT)
+                if quiet_ms is None:
+                    quiet_ms = self.driver.execute_script(_INSTALL_OBSERVER_SCRIPT)
+                if quiet_ms is not None and quiet_ms >= quiet_window * 1000:
+                    return True
+            except Exception:
+                pass
+            if not self._sleep_until_next_poll(deadline):
+                return False
+
+    # ========== HELPERS ==========
+
+    def _drain_network_events(self) -> None:
+        """Apply pending CDP Network events from the performance log to the in-flight set."""
+        try:
+            entries = self.driver.get_log("performance")
+            self._perf_log_available = True
+        except Exception:
+            self._perf_log_available = False
+            return
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get("method", "")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            if not request_id:
+                continue
+            if method == "Network.requestWillBeSent":
+                self.requests += 1
+                if params.get("type") not in _IGNORED_REQUEST_TYPES:
+                    self._inflight[request_id] = time.monotonic()
+            elif method == "Network.loadingFinished":
+                self.bytes_received += int(params.get("encodedDataLength") or 0)
+                self._inflight.pop(request_id, None)
+            elif method == "Network.loadingFailed":
+                if params.get("blockedReason"):
+                    self.blocked += 1
+                self._inflight.pop(request_id, None)
+
+    def _resource_count(self) -> int:
+        try:
+            return int(self.driver.execute_script(_RESOURCE_COUNT_SCRIPT) or 0)
+        except Exception:
+            return 0
+
+    def _sleep_until_next_poll(self, deadline: float) -> bool:
+        """Sleep one poll interval (capped at the deadline). False once the deadline has passed."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(self.poll_interval, remaining))
+        return True
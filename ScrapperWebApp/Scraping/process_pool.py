@@ -0,0 +1,353 @@
+"""
+Process pool for scraping across CPU cores.
+
+Chrome automation plus HTML parsing is CPU-heavy, and in one Python process
+every job's parsing competes for the same GIL. In process-pool mode each scrape
+runs in a worker process that owns its own warm Chrome driver, so jobs parse in
+parallel and never block the API's event loop or each other.
+
+Rate limiting stays in the parent (the API / orchestrator acquire a token
+before submitting), so per-domain pacing still holds across all workers.
+
+LLM jobs run on the parent's queue too, so LLM_CONCURRENCY is the limit for the
+whole pool rather than per worker. A worker sends its job to the parent over a
+multiprocessing manager queue as soon as the DOM is captured, downloads the
+images and returns without waiting. The parent waits for the answer and applies
+it (BaseScraper.apply_pending_llm), so the worker is free for the next page.
+A ScrapeProgress listener passed to scrape() gets the worker's stages (fields,
+each image) over the same channel, on the thread waiting for the scrape.
+
+Pool size follows the machine: min(cores, available memory / memory per worker),
+because each worker carries a Chrome instance.
+
+CONFIG (env):
+    SCRAPER_PROCESSES            unset / 0 = scrape in-process (default), auto, or a number
+    SCRAPER_WORKER_MEMORY_MB     memory budgeted per worker process (default: 700)
+
+USAGE:
+    pool = get_scraper_process_pool()       # None when process mode is off
+    result = pool.scrape(url, config)       # blocks the calling thread, not the GIL
+    result = pool.scrape(url, config, progress=SupabaseProgress(product_id))
+"""
+import os
+import queue
+import atexit
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from .llm_enrichment import DEFAULT_TIMEOUT, PRIORITY_INTERACTIVE
+from .scrape_progress import ScrapeProgress
+
+DEFAULT_WORKER_MEMORY_MB = 700
+
+
+def available_memory_mb() -> Optional[int]:
+    """Memory available for new processes (MemAvailable on Linux), or None if unknown."""
+    try:
+        import psutil
+        return int(psutil.virtual_memory().available / (1024 * 1024))
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def default_worker_count(memory_per_worker_mb: Optional[int] = None) -> int:
+    """Worker processes this machine can carry: bounded by cores and by memory."""
+    memory_per_worker_mb = memory_per_worker_mb or int(
+        os.getenv("SCRAPER_WORKER_MEMORY_MB", DEFAULT_WORKER_MEMORY_MB))
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    memory = available_memory_mb()
+    by_memory = memory // memory_per_worker_mb if memory else cores
+    return max(1, min(cores, by_memory))
+
+
+def resolve_worker_count(setting: Optional[str]) -> int:
+    """'auto' -> sized to the machine, '8' -> 8, None / '' / '0' -> 0 (process mode off)."""
+    if not setting:
+        return 0
+    if setting.strip().lower() == "auto":
+        return default_worker_count()
+    return max(0, int(setting))
+
+
+# ========== WORKER PROCESS SIDE ==========
+
+_events = None  # Worker -> parent messages: (job id, kind, args); set by _init_worker
+
+
+def _init_worker(events: Any) -> None:
+    """Runs once in each worker process: one warm driver per process (one job at a time)."""
+    global _events
+    _events = events
+    os.environ["DRIVER_POOL_SIZE"] = "1"
+    os.environ.setdefault("DRIVER_POOL_PREWARM", "1")
+    from .driver_pool import get_driver_pool
+    get_driver_pool()
+
+
+class _ParentAnswer:
+    """Future-like handle on the parent's answer to a forwarded LLM job, read on demand."""
+
+    def __init__(self, replies: Any):
+        self._replies = replies
+
+    def result(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        try:
+            return self._replies.get(timeout=timeout)
+        except queue.Empty:
+            raise FutureTimeout()
+
+    def cancel(self) -> bool:
+        return False
+
+
+class _ParentLLMQueue:
+    """The LLM queue as seen from a worker: jobs are sent to the parent's queue."""
+
+    def __init__(self, job_id: int, replies: Any):
+        self.job_id = job_id
+        self.replies = replies
+        self.default_timeout = float(os.getenv("LLM_TIMEOUT", DEFAULT_TIMEOUT))
+
+    def submit(self, page_text: str, fields: List[str], priority: int = PRIORITY_INTERACTIVE,
+               timeout: Optional[float] = None) -> _ParentAnswer:
+        _events.put((self.job_id, "llm", (page_text, list(fields), priority, timeout)))
+        return _ParentAnswer(self.replies)
+
+
+class _ForwardedProgress(ScrapeProgress):
+    """Sends each finished stage to the parent, where the real listener runs."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+
+    def on_fields(self, product) -> None:
+        _events.put((self.job_id, "on_fields", (product,)))
+
+    def on_image(self, index: int, path: str) -> None:
+        _events.put((self.job_id, "on_image", (index, path)))
+
+    def on_llm(self, product) -> None:
+        _events.put((self.job_id, "on_llm", (product,)))
+
+
+def _scrape_in_worker(url: str, config: Any, job_id: int, replies: Any, forward_progress: bool) -> Any:
+    """Scrape one URL inside a worker process with that process's own driver pool."""
+    from .base_scraper import ScrapingResult
+    from .driver_pool import get_driver_pool
+    from .scraper_factory import ScraperFactory
+
+    try:
+        progress = _ForwardedProgress(job_id) if forward_progress else None
+        scraper = ScraperFactory.create_scraper(url, config, driver_pool=get_driver_pool(), progress=progress,
+                                                llm_queue=_ParentLLMQueue(job_id, replies))
+        if not scraper:
+            return ScrapingResult(success=False, error=f"No scraper available for URL: {url}")
+        # The parent applies the LLM answer; this process moves on to the next page
+        scraper.defer_llm = True
+        return scraper.scrape()
+    except Exception as e:
+        return ScrapingResult(success=False, error=f"Scraping failed for {url}: {e}")
+    finally:
+        # Sent last, so the parent has seen every earlier message of this job when it arrives
+        _events.put((job_id, "done", ()))
+
+
+# ========== PARENT SIDE ==========
+
+class _PoolJob:
+    """Parent-side state of one scrape running in a worker."""
+
+    def __init__(self, job_id: int, replies: Any):
+        self.id = job_id
+        self.replies = replies  # Parent -> worker: the LLM answer, if the worker asks for it
+        self.events: queue.Queue = queue.Queue()  # This job's messages, for the thread waiting on it
+        self.llm: Optional[Future] = None  # The job's LLM extraction on the parent's queue
+
+
+class ScraperProcessPool:
+    """Runs scrapes in worker processes that each own a Chrome driver."""
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes or default_worker_count()
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._events = None
+        self._jobs: Dict[int, _PoolJob] = {}
+        self._job_ids = itertools.count()
+        self.submitted = 0
+        self.completed = 0
+        self.crashed = 0
+        self.llm_jobs = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("spawn")
+                if self._manager is None:
+                    # Manager queues can be passed to workers per job, unlike plain multiprocessing queues
+                    self._manager = context.Manager()
+                    self._events = self._manager.Queue()
+                    threading.Thread(target=self._pump_events, args=(self._events,),
+                                     name="scraper-pool-events", daemon=True).start()
+                # spawn: workers never inherit the parent's threads, locks or drivers
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._events,),
+                )
+                print(f"🧵 Scraper process pool started with {self.processes} worker(s)")
+            return self._executor
+
+    def _pump_events(self, events: Any) -> None:
+        """Route worker messages: LLM jobs go to the parent's queue, the rest to the waiting thread."""
+        while True:
+            try:
+                job_id, kind, args = events.get()
+            except (EOFError, OSError):
+                return  # Manager shut down
+            if kind == "stop":
+                return
+            with self._lock:
+                job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            if kind == "llm":
+                self._submit_llm(job, *args)
+            else:
+                job.events.put((kind, args))
+
+    def _submit_llm(self, job: _PoolJob, page_text: str, fields: List[str], priority: int,
+                    timeout: Optional[float]) -> None:
+        from .llm_enrichment import get_llm_queue
+
+        with self._lock:
+            self.llm_jobs += 1
+        job.llm = get_llm_queue().submit(page_text, fields, priority=priority, timeout=timeout)
+        job.llm.add_done_callback(lambda future: self._answer_worker(job, future))
+
+    def _answer_worker(self, job: _PoolJob, future: Future) -> None:
+        """Hand the answer to a worker still waiting on it (scrapes without a title yet)."""
+        with self._lock:
+            if job.id not in self._jobs:
+                return  # Scrape finished - the parent applies the answer itself
+        try:
+            job.replies.put(None if future.cancelled() else future.result())
+        except Exception as e:
+            print(f"⚠️ Could not pass the LLM answer to worker job {job.id}: {e}")
+
+    def _wait(self, job: _PoolJob, future: Future, progress: Optional[ScrapeProgress]) -> None:
+        """Run the worker's stage events through `progress` until its "done" message (or it died)."""
+        while True:
+            try:
+                kind, args = job.events.get(timeout=0.5)
+            except queue.Empty:
+                if future.done() and (future.cancelled() or future.exception() is not None):
+                    return  # Crashed or cancelled - no "done" is coming
+                continue
+            if kind == "done":
+                return
+            if progress is None:
+                continue
+            try:
+                getattr(progress, kind)(*args)
+            except Exception as e:
+                print(f"⚠️ Progress listener {kind} failed: {e}")
+
+    def scrape(self, url: str, config: Any, progress: Optional[ScrapeProgress] = None) -> Any:
+        """
+        Scrape in a worker process and wait for the result, including the LLM
+        answer the worker left pending. `progress` gets each stage as it lands.
+        """
+        from .base_scraper import ScrapingResult
+        from .scraper_factory import ScraperFactory
+
+        executor = self._get_executor()
+        job = _PoolJob(next(self._job_ids), self._manager.Queue())
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            future = executor.submit(_scrape_in_worker, url, config, job.id, job.replies, progress is not None)
+            with self._lock:
+                self.submitted += 1
+            future.add_done_callback(self._on_done)
+            self._wait(job, future, progress)
+            result = future.result()
+            if result.pending_llm:
+                scraper = ScraperFactory.create_scraper(url, config, progress=progress)
+                if scraper:
+                    result = scraper.apply_pending_llm(result, job.llm)
+            return result
+        except BrokenProcessPool as e:
+            # A worker died (Chrome took the process down, OOM kill...) - start a fresh pool
+            print(f"💥 Scraper worker crashed, restarting process pool: {e}")
+            with self._lock:
+                self.crashed += 1
+                executor, self._executor = self._executor, None
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            return ScrapingResult(success=False, error=f"Scraper worker crashed for {url}")
+        except CancelledError:
+            # Still queued when the pool was restarted after a crash, or closed
+            return ScrapingResult(success=False, error=f"Scrape cancelled for {url}: process pool shut down")
+        finally:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "started": self._executor is not None,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "in_flight": self.submitted - self.completed,
+                "crashed": self.crashed,
+                "llm_jobs": self.llm_jobs,  # Sent to the parent's LLM queue
+            }
+
+    def close(self) -> None:
+        """Stop the workers (their drivers are closed by each process's atexit hook)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            manager, self._manager = self._manager, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            self._events.put((None, "stop", ()))
+            manager.shutdown()
+
+
+# Global pool instance
+_pool: Optional[ScraperProcessPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_scraper_process_pool() -> Optional[ScraperProcessPool]:
+    """Shared process pool when SCRAPER_PROCESSES enables it, else None (singleton pattern)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            processes = resolve_worker_count(os.getenv("SCRAPER_PROCESSES"))
+            if processes <= 0:
+                return None
+            _pool = ScraperProcessPool(processes)
+            atexit.register(_pool.close)
+    return _pool
@@ -0,0 +1,177 @@
+"""
+Adaptive per-domain rate limiter shared by every scraper.
+
+Each domain gets its own token bucket, so pacing one host never stalls
+requests to another. The refill rate adapts AIMD-style (additive increase,
+multiplicative decrease): every healthy response nudges the rate up, while
+errors, HTTP 429s and CAPTCHA hits halve it.
+
+USAGE:
+    limiter = get_rate_limiter()
+    limiter.acquire(url)             # blocks until the domain has a token
+    limiter.record_success(url)      # or record_failure(url, "captcha")
+    print(limiter.snapshot())        # inspect per-domain state
+"""
+import time
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+
+def domain_key(url_or_domain: str) -> str:
+    """Normalize a URL or bare host to the key used for rate limiting."""
+    host = urlparse(url_or_domain).hostname if "://" in url_or_domain else url_or_domain
+    host = (host or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _DomainBucket:
+    """Token bucket state for one domain."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_failure: Optional[str] = None
+        self.total_wait = 0.0
+
+
+class DomainRateLimiter:
+    """Per-domain token buckets with AIMD rate adaptation."""
+
+    def __init__(self,
+                 initial_rate: float = 0.2,
+                 min_rate: float = 0.025,
+                 max_rate: float = 0.4,
+                 burst: float = 1.0,
+                 increase: float = 0.02,
+                 decrease_factor: float = 0.5):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+
+        self._buckets: Dict[str, _DomainBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay_seconds: float) -> "DomainRateLimiter":
+        """
+        Build a limiter around a nominal per-domain delay: start at one request per
+        `delay_seconds`, recover up to twice that rate, back off down to 1/8 of it.
+        """
+        base = 1.0 / max(delay_seconds, 0.1)
+        return cls(initial_rate=base, min_rate=base / 8, max_rate=base * 2, increase=base / 10)
+
+    # ========== SCHEDULING ==========
+
+    def try_acquire(self, url_or_domain: str) -> float:
+        """Take a token if one is available. Returns 0 on success, else seconds until one is."""
+        with self._lock:
+            bucket = self._bucket(domain_key(url_or_domain))
+            self._refill(bucket)
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / bucket.rate
+
+    def acquire(self, url_or_domain: str, timeout: Optional[float] = None) -> float:
+        """Block until the domain has a token. Returns the time spent waiting."""
+        start = time.monotonic()
+        while True:
+            wait = self.try_acquire(url_or_domain)
+            waited = time.monotonic() - start
+            if wait <= 0:
+                if waited > 0:
+                    with self._lock:
+                        self._bucket(domain_key(url_or_domain)).total_wait += waited
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(f"Rate limit for {domain_key(url_or_domain)} not available within {timeout}s")
+            time.sleep(wait)
+
+    # ========== FEEDBACK ==========
+
+    def record_success(self, url_or_domain: str) -> None:
+        """Healthy response: additively increase the domain's rate."""
+        with self._lock:
+            bucket = self._bucket(domain_key(url_or_domain))
+            self._refill(bucket)
+            bucket.successes += 1
+            bucket.consecutive_failures = 0
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def record_failure(self, url_or_domain: str, reason: str = "error") -> None:
+        """Error, 429 or bot wall: multiplicatively decrease the domain's rate."""
+        domain = domain_key(url_or_domain)
+        with self._lock:
+            bucket = self._bucket(domain)
+            self._refill(bucket)
+            bucket.failures += 1
+            bucket.consecutive_failures += 1
+            bucket.last_failure = reason
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+            # Drain the bucket so the next request waits a full (slower) interval
+            bucket.tokens = min(bucket.tokens, 0.0)
+            rate = bucket.rate
+        print(f"🐢 Backing off {domain} ({reason}): now 1 request / {1 / rate:.1f}s")
+
+    # ========== INSPECTION ==========
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-domain limiter state, for logging and tuning."""
+        with self._lock:
+            state = {}
+            for domain, bucket in self._buckets.items():
+                self._refill(bucket)
+                state[domain] = {
+                    "rate_per_sec": round(bucket.rate, 4),
+                    "interval_sec": round(1 / bucket.rate, 2),
+                    "tokens": round(bucket.tokens, 2),
+                    "successes": bucket.successes,
+                    "failures": bucket.failures,
+                    "consecutive_failures": bucket.consecutive_failures,
+                    "last_failure": bucket.last_failure,
+                    "total_wait_sec": round(bucket.total_wait, 2),
+                }
+            return state
+
+    # ========== HELPERS ==========
+
+    def _bucket(self, domain: str) -> _DomainBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = _DomainBucket(self.initial_rate, self.burst)
+            self._buckets[domain] = bucket
+        return bucket
+
+    def _refill(self, bucket: _DomainBucket) -> None:
+        now = time.monotonic()
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.last_refill) * bucket.rate)
+        bucket.last_refill = now
+
+
+# Global limiter instance
+_limiter_instance: Optional[DomainRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> DomainRateLimiter:
+    """Get or create the shared rate limiter (singleton pattern)."""
+    global _limiter_instance
+    with _limiter_lock:
+        if _limiter_instance is None:
+            _limiter_instance = DomainRateLimiter()
+        return _limiter_instance
+
+
+def set_rate_limiter(limiter: DomainRateLimiter) -> None:
+    """Replace the shared limiter (e.g. one tuned from the CLI --delay)."""
+    global _limiter_instance
+    with _limiter_lock:
+        _limiter_instance = limiter
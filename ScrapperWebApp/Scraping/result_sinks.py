@@ -0,0 +1,205 @@
+"""
+Result sinks for streamed batch scrapes.
+
+The orchestrator's streaming API (ScrapingOrchestrator.stream / iter_scrape)
+hands every ScrapingResult to a list of sinks the moment it completes, instead
+of building the whole result list and reporting at the end. Downstream work -
+writing a report, uploading to Supabase - starts on the first product while
+the batch is still running, and memory stays flat however long the URL file is.
+
+Sinks:
+    NdjsonSink(path)     one JSON record per result, appended and flushed
+    StdoutSink()         the same records on stdout (progress output moves to stderr, so
+                         `--sink stdout | jq` gets clean NDJSON)
+    SupabaseSink()       creates / updates the product row and uploads its images
+    ScrapeSummary()      incremental counters for the end-of-run summary
+
+CLI spec (see parse_sink): "ndjson:report.ndjson", "stdout", "supabase"
+"""
+import os
+import sys
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from .url_canonicalizer import canonical_key
+
+
+def result_record(url: str, result: Any) -> Dict[str, Any]:
+    """JSON-serialisable record for one ScrapingResult."""
+    product = asdict(result.product) if result.product else None
+    return {
+        "url": url,
+        "key": canonical_key(url),
+        "success": result.success,
+        "product": product,
+        "images": list(result.images),
+        "image_urls": list(getattr(result, "image_urls", [])),
+        "output_path": getattr(result, "product_path", None),
+        "error": result.error,
+        "blocked": result.blocked,
+        "at": time.time(),
+    }
+
+
+class ResultSink(ABC):
+    """Receives each result as soon as it completes."""
+
+    @abstractmethod
+    def write(self, url: str, result: Any) -> None:
+        """Handle one finished result (called from scraping threads)."""
+
+    def close(self) -> None:
+        """Flush / wait for outstanding work. Called once at the end of the run."""
+
+
+class NdjsonSink(ResultSink):
+    """Appends one JSON line per result to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, url: str, result: Any) -> None:
+        line = json.dumps(result_record(url, result), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class StdoutSink(ResultSink):
+    """Writes the NDJSON records to a stream (stdout by default)."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+
+    def write(self, url: str, result: Any) -> None:
+        print(json.dumps(result_record(url, result), ensure_ascii=False), file=self.stream, flush=True)
+
+
+def reserve_stdout(sinks: List[ResultSink]) -> None:
+    """
+    When a StdoutSink is in use, keep the real stdout for its records and point
+    file descriptor 1 at stderr, so every progress print - including those of
+    spawned worker processes, which inherit the descriptor - stays out of the
+    NDJSON stream.
+    """
+    stdout_sinks = [sink for sink in sinks if isinstance(sink, StdoutSink) and sink.stream is sys.stdout]
+    if not stdout_sinks:
+        return
+    sys.stdout.flush()
+    records = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    for sink in stdout_sinks:
+        sink.stream = records
+
+
+class SupabaseSink(ResultSink):
+    """
+    Saves successful results to Supabase on a background thread, so uploads
+    overlap with the next scrapes. At most `max_pending` products wait in the
+    queue; beyond that write() blocks, which keeps memory bounded.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 8):
+        from database import get_db  # App-level module; only needed when this sink is used
+        self.db = get_db()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.saved = 0
+        self.failed = 0
+
+    def write(self, url: str, result: Any) -> None:
+        if not result.success or result.product is None:
+            return
+        self._slots.acquire()
+        future = self._executor.submit(self._save, url, result)
+        future.add_done_callback(lambda _: self._slots.release())
+
+    def _save(self, url: str, result: Any) -> None:
+        product = result.product
+        missing_fields = [name for name in ("title", "price", "description") if not getattr(product, name)]
+        if not result.images:
+            missing_fields.append("images")
+
+        try:
+            existing = self.db.find_duplicate_product(url)
+            row = existing or self.db.create_product(url, status="pending")
+            self.db.update_product(
+                row["id"],
+                title=product.title,
+                price=product.price,
+                description=product.description,
+                status="ready_to_post" if not missing_fields else "collected",
+                missing_fields=missing_fields,
+                field_sources=product.sources,
+            )
+            if result.images and not (existing and self.db.get_product_images(row["id"])):
+                self.db.upload_product_images(row["id"], result.images)
+            self.saved += 1
+            print(f"☁️ Saved to Supabase: {product.title}")
+        except Exception as e:
+            self.failed += 1
+            print(f"❌ Supabase save failed for {url}: {e}")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        print(f"☁️ Supabase: {self.saved} saved, {self.failed} failed")
+
+
+class ScrapeSummary(ResultSink):
+    """Running totals, so the summary never needs the full result list."""
+
+    # Failed URLs listed in the summary (the counts always include every failure)
+    MAX_LISTED_FAILURES = 50
+
+    def __init__(self):
+        self.total = 0
+        self.successful = 0
+        self.failed = 0
+        self.blocked = 0
+        self.failures: List[Tuple[str, Optional[str]]] = []
+        self.started_at = time.monotonic()
+
+    def write(self, url: str, result: Any) -> None:
+        self.total += 1
+        if result.success:
+            self.successful += 1
+            return
+        self.failed += 1
+        if result.blocked:
+            self.blocked += 1
+        if len(self.failures) < self.MAX_LISTED_FAILURES:
+            self.failures.append((url, result.error))
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def all_succeeded(self) -> bool:
+        return self.failed == 0
+
+
+def parse_sink(spec: str) -> ResultSink:
+    """Build a sink from a CLI spec: 'ndjson:<path>', 'stdout' or 'supabase'."""
+    kind, _, arg = spec.partition(":")
+    kind = kind.lower()
+    if kind == "ndjson":
+        if not arg:
+            raise ValueError("ndjson sink needs a path, e.g. ndjson:report.ndjson")
+        return NdjsonSink(arg)
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "supabase":
+        return SupabaseSink()
+    raise ValueError(f"Unknown sink '{spec}' (expected ndjson:<path>, stdout or supabase)")
@@ -0,0 +1,250 @@
+"""
+SQLite cache of finished scrapes, keyed on the canonical product URL.
+
+The UI often deletes a product and re-scrapes the same URL straight away, and
+failed jobs get retried - each of those used to open Chrome again. A cache
+entry holds the extracted ProductData, the image URLs and the downloaded image
+files with their SHA-256 hashes, so a repeat request for the same product
+(under any tracking-param variant of its URL) returns without a browser.
+
+On a hit the local image files are checked against their hashes; if any were
+cleaned up or changed, the images are re-downloaded from the cached URLs
+(plain HTTP, still no browser).
+
+CONFIG (env):
+    SCRAPE_CACHE_PATH   SQLite file (default: ScrapperWebApp/.cache/scrape_cache.sqlite3)
+    SCRAPE_CACHE_TTL    Entry lifetime in seconds (default: 21600 = 6h, 0 disables the cache)
+
+USAGE:
+    cache = get_scrape_cache()
+    entry = cache.get(url)               # CachedScrape or None
+    cache.put(url, result)               # after a successful ScrapingResult
+    cache.stats()                        # hits / misses / hit_rate ...
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+from .models import ProductData
+from .url_canonicalizer import canonical_key
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            ".cache", "scrape_cache.sqlite3")
+DEFAULT_TTL = 6 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_cache (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    product TEXT NOT NULL,
+    image_urls TEXT NOT NULL,
+    image_files TEXT NOT NULL,
+    image_hashes TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """SHA-256 of a file's contents, or None if it can't be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _product_from_json(data: str) -> ProductData:
+    """Rebuild ProductData, ignoring fields that no longer exist on the dataclass."""
+    known = {f.name for f in fields(ProductData)}
+    return ProductData(**{name: value for name, value in json.loads(data).items() if name in known})
+
+
+@dataclass
+class CachedScrape:
+    """One cached scrape."""
+    key: str
+    url: str
+    product: ProductData
+    image_urls: List[str] = field(default_factory=list)
+    image_files: List[str] = field(default_factory=list)
+    image_hashes: List[str] = field(default_factory=list)
+    created_at: float = 0.0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def images_intact(self) -> bool:
+        """True when every cached image file still exists with the same content."""
+        return all(file_sha256(path) == expected
+                   for path, expected in zip(self.image_files, self.image_hashes))
+
+
+class ScrapeCache:
+    """TTL cache of scrape results in a local SQLite file."""
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.image_refetches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            # Entries nobody asked for again would otherwise linger forever
+            self._conn.execute("DELETE FROM scrape_cache WHERE created_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+        return self._conn
+
+    # ========== LOOKUP ==========
+
+    def get(self, url: str) -> Optional[CachedScrape]:
+        """Fresh cached scrape for the URL's product, or None (counts a hit or miss)."""
+        if not self.enabled:
+            return None
+
+        key = canonical_key(url)
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT key, url, product, image_urls, image_files, image_hashes, created_at "
+                "FROM scrape_cache WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            if time.time() - row[6] > self.ttl:
+                self._connection().execute("DELETE FROM scrape_cache WHERE key = ?", (key,))
+                self._connection().commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return CachedScrape(
+            key=row[0],
+            url=row[1],
+            product=_product_from_json(row[2]),
+            image_urls=json.loads(row[3]),
+            image_files=json.loads(row[4]),
+            image_hashes=json.loads(row[5]),
+            created_at=row[6],
+        )
+
+    def ensure_images(self, entry: CachedScrape, dest_dir: str) -> List[str]:
+        """
+        Local image files for a cache hit. Re-downloads from the cached URLs when
+        the files are gone or changed, then refreshes the stored hashes.
+        """
+        if entry.images_intact():
+            return entry.image_files
+
+        from .image_downloader import ImageDownloader
+
+        print(f"🖼️ Cached images missing for {entry.key}, re-downloading {len(entry.image_urls)}")
+        os.makedirs(dest_dir, exist_ok=True)
+        files = ImageDownloader().download_all(entry.image_urls, dest_dir)
+        entry.image_files = files
+        entry.image_hashes = [file_sha256(path) or "" for path in files]
+
+        with self._lock:
+            self.image_refetches += 1
+            self._connection().execute(
+                "UPDATE scrape_cache SET image_files = ?, image_hashes = ? WHERE key = ?",
+                (json.dumps(entry.image_files), json.dumps(entry.image_hashes), entry.key))
+            self._connection().commit()
+        return files
+
+    # ========== STORE ==========
+
+    def put(self, url: str, result: Any) -> None:
+        """Cache a successful ScrapingResult (product, image URLs, image files + hashes)."""
+        if not self.enabled or not result.success or result.product is None:
+            return
+
+        hashes = [file_sha256(path) or "" for path in result.images]
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO scrape_cache "
+                "(key, url, product, image_urls, image_files, image_hashes, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (canonical_key(url), url, json.dumps(asdict(result.product)),
+                 json.dumps(result.image_urls), json.dumps(result.images),
+                 json.dumps(hashes), time.time()))
+            self._connection().commit()
+            self.stores += 1
+
+    def invalidate(self, url: str) -> bool:
+        """Drop the entry for a URL's product. Returns True if one existed."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM scrape_cache WHERE key = ?", (canonical_key(url),))
+            self._connection().commit()
+        return cursor.rowcount > 0
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry. Returns the number removed."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM scrape_cache WHERE created_at < ?", (time.time() - self.ttl,))
+            self._connection().commit()
+        return cursor.rowcount
+
+    # ========== METRICS ==========
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit / miss counters since process start plus the current entry count."""
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM scrape_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "ttl_sec": self.ttl,
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "stores": self.stores,
+                "image_refetches": self.image_refetches,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Global cache instance
+_cache: Optional[ScrapeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> ScrapeCache:
+    """Get or create the shared scrape cache (singleton pattern)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScrapeCache(
+                path=os.getenv("SCRAPE_CACHE_PATH", DEFAULT_PATH),
+                ttl=float(os.getenv("SCRAPE_CACHE_TTL", DEFAULT_TTL)),
+            )
+    return _cache
@@ -0,0 +1,148 @@
+"""
+Write-ahead checkpoint journal for batch scrapes.
+
+Every URL gets a "started" record before it is scraped and an outcome record
+(success / failed / unsupported) after, one JSON object per line, flushed and
+fsynced as it is written. A crash, a Chrome hang or Ctrl-C therefore loses at
+most the URLs that were in flight, and `--resume` picks up from the journal:
+finished URLs are skipped, failed ones (and ones that started but never
+finished) are retried until they reach the attempt limit.
+
+Large batches can be split across machines with shards: each URL belongs to
+shard hash(canonical key) % N, and each shard keeps its own journal file.
+
+RECORD:
+    {"url": ..., "key": "amazon.ca:B0CX23V2ZK", "status": "success", "attempt": 1,
+     "at": 1718000000.0, "elapsed": 12.4, "output_path": ..., "images": [...],
+     "title": ..., "error": null, "blocked": false}
+
+USAGE:
+    journal = ScrapeJournal("links.txt.journal.ndjson")
+    if journal.is_pending(url, max_attempts=3):   # filtered per URL as links stream in
+        journal.record_start(url)
+        journal.record_result(url, result, elapsed)
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .url_canonicalizer import canonical_key
+
+# Outcomes that mean "don't scrape this URL again on resume"
+FINAL_STATUSES = {"success", "unsupported"}
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """'2/4' -> (2, 4). Shards are numbered from 1."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected K/N (e.g. 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', K must be between 1 and N")
+    return index, count
+
+
+def in_shard(url: str, index: int, count: int) -> bool:
+    """Stable shard assignment: the same product always lands in the same shard."""
+    digest = hashlib.md5(canonical_key(url).encode("utf-8")).hexdigest()
+    return int(digest, 16) % count == index - 1
+
+
+def default_journal_path(input_path: str, shard: Optional[Tuple[int, int]] = None) -> str:
+    """links.txt -> links.txt.journal.ndjson (links.txt.shard-2-of-4.journal.ndjson for shards)."""
+    if shard:
+        return f"{input_path}.shard-{shard[0]}-of-{shard[1]}.journal.ndjson"
+    return f"{input_path}.journal.ndjson"
+
+
+class ScrapeJournal:
+    """Append-only NDJSON journal of per-URL scrape attempts."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        # Replayed state (statuses only, so memory stays small): key -> last status, key -> attempts
+        self.last: Dict[str, str] = {}
+        self.attempts: Dict[str, int] = {}
+        self._replay()
+
+    def _replay(self) -> None:
+        """Rebuild per-URL state from an existing journal (a torn last line is ignored)."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                key = record.get("key")
+                if not key:
+                    continue
+                self.last[key] = record.get("status")
+                if record.get("status") == "started":
+                    self.attempts[key] = self.attempts.get(key, 0) + 1
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.last[record["key"]] = record["status"]
+
+    # ========== RESUME ==========
+
+    def status(self, url: str) -> Optional[str]:
+        """Last journaled status for the URL's product ('started' means it never finished)."""
+        return self.last.get(canonical_key(url))
+
+    def is_pending(self, url: str, max_attempts: int = 3) -> bool:
+        """True when the URL was never tried, or failed / was interrupted with attempts left."""
+        key = canonical_key(url)
+        status = self.last.get(key)
+        if status in FINAL_STATUSES:
+            return False
+        return status is None or self.attempts.get(key, 0) < max_attempts
+
+    # ========== RECORDING ==========
+
+    def record_start(self, url: str) -> int:
+        """Write-ahead record before scraping. Returns the attempt number."""
+        key = canonical_key(url)
+        with self._lock:
+            attempt = self.attempts.get(key, 0) + 1
+            self.attempts[key] = attempt
+        self._append({"url": url, "key": key, "status": "started", "attempt": attempt, "at": time.time()})
+        return attempt
+
+    def record_result(self, url: str, result: Any, elapsed: float, unsupported: bool = False) -> None:
+        """Outcome record with timings and output paths."""
+        key = canonical_key(url)
+        product = getattr(result, "product", None)
+        self._append({
+            "url": url,
+            "key": key,
+            "status": "unsupported" if unsupported else ("success" if result.success else "failed"),
+            "attempt": self.attempts.get(key, 1),
+            "at": time.time(),
+            "elapsed": round(elapsed, 2),
+            "output_path": getattr(result, "product_path", None),
+            "images": list(result.images),
+            "title": product.title if product else None,
+            "error": result.error,
+            "blocked": result.blocked,
+        })
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
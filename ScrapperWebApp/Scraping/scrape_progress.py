@@ -0,0 +1,84 @@
+"""
+Progressive scrape results.
+
+A scrape finishes in stages that land seconds apart: selector / structured
+data fields as soon as the DOM is read, each image as its download completes,
+and the LLM answer last. A ScrapeProgress listener passed to the scraper gets
+every stage the moment it lands, so the product card can fill in gradually
+instead of waiting on the slowest stage.
+
+Hooks run on the scraping thread (on_image on a download thread) and must not
+raise; a failing hook is logged and the scrape carries on. In process-pool mode
+the worker forwards each stage to the parent, where the listener runs on the
+thread waiting for the scrape (see process_pool.py).
+
+USAGE:
+    progress = SupabaseProgress(product_id)
+    scraper = ScraperFactory.create_scraper(url, config, progress=progress)
+    result = scraper.scrape()
+    progress.image_urls(result.images)     # storage URLs of the images uploaded on the way
+"""
+import threading
+from typing import Any, Dict, List
+
+from .models import ProductData
+
+
+class ScrapeProgress:
+    """Receives partial results while a scrape runs. Every hook is optional."""
+
+    def on_fields(self, product: ProductData) -> None:
+        """Scraped fields are known (the browser has been released)."""
+
+    def on_image(self, index: int, path: str) -> None:
+        """Image `index` finished downloading to `path`."""
+
+    def on_llm(self, product: ProductData) -> None:
+        """The LLM filled in fields (product.sources marks them 'llm')."""
+
+
+class SupabaseProgress(ScrapeProgress):
+    """Writes each stage to the product row, uploading images as they land."""
+
+    def __init__(self, product_id: str, db: Any = None):
+        if db is None:
+            from database import get_db  # App-level module; only needed when this listener is used
+            db = get_db()
+        self.db = db
+        self.product_id = product_id
+        self.uploaded: Dict[str, str] = {}  # local path -> storage URL
+        self._lock = threading.Lock()
+
+    def on_fields(self, product: ProductData) -> None:
+        self._write_fields(product, status="scraping")
+        print(f"📝 Product {self.product_id}: scraped fields saved ({product.title[:60]})")
+
+    def on_image(self, index: int, path: str) -> None:
+        # The Supabase client is shared - one upload at a time, downloads keep running
+        with self._lock:
+            url = self.db.upload_image(self.product_id, path, image_order=index)
+            if url:
+                self.uploaded[path] = url
+
+    def on_llm(self, product: ProductData) -> None:
+        self._write_fields(product)
+        print(f"📝 Product {self.product_id}: LLM fields saved")
+
+    def _write_fields(self, product: ProductData, **extra: Any) -> None:
+        with self._lock:
+            self.db.update_product(
+                self.product_id,
+                title=product.title,
+                price=product.price,
+                description=product.description,
+                field_sources=product.sources,
+                **extra,
+            )
+
+    def image_urls(self, paths: List[str]) -> List[str]:
+        """Storage URLs of the given local images that were already uploaded, in order."""
+        return [self.uploaded[path] for path in paths if path in self.uploaded]
+
+    def pending_images(self, paths: List[str]) -> List[str]:
+        """Local images not uploaded yet (cache hits, failed uploads)."""
+        return [path for path in paths if path not in self.uploaded]
@@ -2,48 +2,37 @@
 Scraper factory for creating appropriate scrapers based on URL.
 """
 from typing import Optional, List
-from urllib.parse import urlparse
 
 from .base_scraper import BaseScraper, ScraperConfig
-from .amazon_scraper import AmazonScraper
-from .wayfair_scraper import WayfairScraper
-from .generic_scraper import GenericScraper
+from .scraper_registry import get_scraper_registry
+
+# Importing the scraper modules registers them (see @register_scraper)
+from . import amazon_scraper, wayfair_scraper, generic_scraper  # noqa: F401
 
 
 class ScraperFactory:
     """Factory class for creating appropriate scrapers."""
-    
-    # Registry of available scrapers (order matters - specific scrapers first)
-    SCRAPERS = [
-        AmazonScraper,
-        WayfairScraper,
-        GenericScraper,  # Fallback for any URL
-    ]
-    
+
     @classmethod
-    def create_scraper(cls, url: str, config: Optional[ScraperConfig] = None) -> Optional[BaseScraper]:
-        """Create appropriate scraper for the given URL."""
-        for scraper_class in cls.SCRAPERS:
-            # Create temporary instance to check URL support
-            temp_scraper = scraper_class(url, config)
-            if temp_scraper.is_supported_url(url):
-                return temp_scraper
-        
-        return None
-    
+    def create_scraper(cls, url: str, config: Optional[ScraperConfig] = None,
+                       driver_pool=None, progress=None, llm_queue=None) -> Optional[BaseScraper]:
+        """
+        Create appropriate scraper for the given URL, optionally leasing drivers from
+        a pool, reporting each finished stage to a ScrapeProgress listener and sending
+        LLM jobs to a given queue (default: this process's).
+        """
+        # Resolved from the hostname index - only the winning class is instantiated
+        scraper_class = get_scraper_registry().resolve(url)
+        if scraper_class is None:
+            return None
+        return scraper_class(url, config, driver_pool=driver_pool, progress=progress, llm_queue=llm_queue)
+
     @classmethod
     def get_supported_domains(cls) -> List[str]:
         """Get list of all supported domains."""
-        domains = []
-        for scraper_class in cls.SCRAPERS:
-            if hasattr(scraper_class, 'SUPPORTED_DOMAINS'):
-                domains.extend(scraper_class.SUPPORTED_DOMAINS)
-        return domains
-    
+        return get_scraper_registry().domains()
+
     @classmethod
     def is_supported_url(cls, url: str) -> bool:
         """Check if any scraper supports the given URL."""
-        return any(
-            scraper_class(url).is_supported_url(url) 
-            for scraper_class in cls.SCRAPERS
-        )
+        return get_scraper_registry().resolve(url) is not None
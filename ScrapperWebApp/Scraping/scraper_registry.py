@@ -0,0 +1,107 @@
+"""
+Hostname-indexed scraper registry.
+
+Scrapers register themselves with a decorator; their SUPPORTED_DOMAINS go into
+a suffix index, so resolving a URL is one hostname parse plus a dict lookup
+per domain label (www.amazon.co.uk -> amazon.co.uk -> co.uk -> uk). Only the
+hostname is matched, so "amazon.com" in a query string no longer counts.
+
+USAGE:
+    @register_scraper
+    class MyScraper(BaseScraper):
+        SUPPORTED_DOMAINS = ['example.com']
+
+    @register_scraper(fallback=True)
+    class GenericScraper(BaseScraper): ...
+
+    scraper_class = get_scraper_registry().resolve(url)
+"""
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Type
+from urllib.parse import urlsplit
+
+
+def url_hostname(url: str) -> str:
+    """Lower-cased hostname of a URL ('' when it has none). Scheme-less URLs are accepted."""
+    if "//" not in url:
+        url = "//" + url
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host.rstrip(".")
+
+
+def host_suffixes(host: str) -> List[str]:
+    """'www.amazon.co.uk' -> ['www.amazon.co.uk', 'amazon.co.uk', 'co.uk', 'uk']"""
+    labels = host.split(".")
+    return [".".join(labels[i:]) for i in range(len(labels))]
+
+
+def host_matches(url: str, domains: Iterable[str]) -> bool:
+    """True when the URL's host is one of `domains` or a subdomain of one."""
+    wanted = {domain.lower() for domain in domains}
+    return any(suffix in wanted for suffix in host_suffixes(url_hostname(url)))
+
+
+class ScraperRegistry:
+    """Maps hostnames to scraper classes through a precomputed suffix index."""
+
+    def __init__(self):
+        self._by_domain: Dict[str, type] = {}
+        self._classes: List[type] = []
+        self._fallback: Optional[type] = None
+        self._lock = threading.Lock()
+
+    def register(self, scraper_class: Optional[type] = None, *, fallback: bool = False):
+        """Class decorator: index the class's SUPPORTED_DOMAINS (or make it the fallback)."""
+        def decorator(cls: type) -> type:
+            with self._lock:
+                if fallback:
+                    self._fallback = cls
+                for domain in getattr(cls, "SUPPORTED_DOMAINS", []):
+                    domain = domain.lower().lstrip(".")
+                    existing = self._by_domain.get(domain)
+                    if existing is not None and existing is not cls:
+                        print(f"⚠️ {domain} already handled by {existing.__name__}, now {cls.__name__}")
+                    self._by_domain[domain] = cls
+                if cls not in self._classes:
+                    self._classes.append(cls)
+                self._resolve_host.cache_clear()
+            return cls
+
+        return decorator(scraper_class) if scraper_class is not None else decorator
+
+    def resolve(self, url: str) -> Optional[type]:
+        """Scraper class for a URL: the longest registered domain suffix, else the fallback."""
+        return self._resolve_host(url_hostname(url))
+
+    @lru_cache(maxsize=4096)
+    def _resolve_host(self, host: str) -> Optional[type]:
+        for suffix in host_suffixes(host) if host else []:
+            scraper_class = self._by_domain.get(suffix)
+            if scraper_class is not None:
+                return scraper_class
+        return self._fallback
+
+    def domains(self) -> List[str]:
+        """Every registered domain, in registration order."""
+        return list(self._by_domain)
+
+    def scraper_classes(self) -> List[type]:
+        return list(self._classes)
+
+
+# Global registry instance
+_registry = ScraperRegistry()
+
+
+def get_scraper_registry() -> ScraperRegistry:
+    """Get the shared scraper registry."""
+    return _registry
+
+
+def register_scraper(scraper_class: Optional[Type] = None, *, fallback: bool = False):
+    """Register a scraper class with the shared registry (usable with or without arguments)."""
+    return _registry.register(scraper_class, fallback=fallback)
@@ -17,18 +17,35 @@ QUICK START:
 OPTIONS:
     -i, --input     Text file with URLs (REQUIRED)
     -o, --output    Custom output directory
-    -d, --delay     Seconds between requests (default: 5)
+    -d, --delay     Seconds between requests to the same domain (default: 5)
     --max-images    Max images per product (default: 20)
+    --workers       URLs scraped at the same time (default: 1 = sequential)
+    --per-domain    Max concurrent scrapes against one domain (default: 1)
+    --journal       Checkpoint journal path (default: <input>.journal.ndjson)
+    --resume        Skip URLs the journal marks done, retry failed ones
+    --max-attempts  Attempts per URL before --resume gives up on it (default: 3)
+    --shard K/N     Only scrape shard K of N (split a batch across machines)
+    --sink SPEC     Stream each result as it completes: ndjson:<path>, stdout, supabase (repeatable)
+    --processes N   Scrape in N worker processes, each with its own Chrome ("auto": sized to cores + memory)
 
 EXAMPLES:
     python scraping_orchestrator.py -i links.txt
     python scraping_orchestrator.py -i links.txt -o "C:/Output" -d 3
     python scraping_orchestrator.py -i links.txt --max-images 10
+    python scraping_orchestrator.py -i links.txt --workers 4 --per-domain 1
+    python scraping_orchestrator.py -i links.txt --resume
+    python scraping_orchestrator.py -i links.txt --shard 2/4 --resume
+    python scraping_orchestrator.py -i links.txt --sink ndjson:report.ndjson --sink supabase
+    python scraping_orchestrator.py -i links.txt --processes auto --per-domain 2
 """
 import time
+import math
 import sys
 import io
-from typing import List, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 
 # Fix Windows console encoding for emojis
@@ -37,13 +54,29 @@ if sys.platform == 'win32':
 
 from .base_scraper import ScraperConfig, ScrapingResult
 from .scraper_factory import ScraperFactory
+from .driver_pool import DriverPool
+from .rate_limiter import DomainRateLimiter, domain_key, get_rate_limiter, set_rate_limiter
+from .url_canonicalizer import canonical_key
+from .scrape_journal import ScrapeJournal, default_journal_path, in_shard, parse_shard
+from .result_sinks import ResultSink, ScrapeSummary, parse_sink, reserve_stdout
+from .process_pool import ScraperProcessPool, resolve_worker_count
+from .llm_enrichment import PRIORITY_BATCH
 
 
 class ScrapingOrchestrator:
     """Main class that orchestrates the scraping of multiple URLs."""
     
-    def __init__(self, config: Optional[ScraperConfig] = None):
+    # URLs read ahead of the workers in concurrent mode (for per-domain scheduling)
+    LOOKAHEAD_PER_WORKER = 8
+    
+    def __init__(self, config: Optional[ScraperConfig] = None, driver_pool: Optional[DriverPool] = None,
+                 rate_limiter: Optional[DomainRateLimiter] = None, journal: Optional[ScrapeJournal] = None,
+                 process_pool: Optional[ScraperProcessPool] = None):
         self.config = config or ScraperConfig()
+        self.driver_pool = driver_pool
+        self.process_pool = process_pool  # When set, scrapes run in worker processes with their own drivers
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.journal = journal  # Checkpoint journal (None: progress is only kept in memory)
         self.results = []
         self.unsupported_urls = []
     
@@ -58,79 +91,306 @@ class ScrapingOrchestrator:
         print(f"\r✅ {message} completed!" + " " * 20)  # Clear the line
         print()  # New line for next output
     
-    def scrape_urls(self, urls: List[str], delay_between_requests: int = 5) -> List[ScrapingResult]:
-        """Scrape multiple URLs with delay between requests."""
-        results = []
+    def _use_delay(self, delay_between_requests: Optional[float]) -> None:
+        """Re-tune the shared limiter around a nominal per-domain delay (CLI --delay)."""
+        if delay_between_requests is None:
+            return
+        self.rate_limiter = DomainRateLimiter.from_delay(delay_between_requests)
+        set_rate_limiter(self.rate_limiter)
+    
+    def _wait_for_rate_limit(self, url: str) -> None:
+        """Block (with a countdown) until the URL's domain has a rate-limit token."""
+        while True:
+            wait_time = self.rate_limiter.try_acquire(url)
+            if wait_time <= 0:
+                return
+            self._progress_countdown(math.ceil(wait_time), f"Pacing requests to {domain_key(url)}")
+    
+    def _record_outcome(self, url: str, result: ScrapingResult) -> None:
+        """Feed the scrape outcome back into the adaptive limiter."""
+        if result.success:
+            self.rate_limiter.record_success(url)
+        else:
+            self.rate_limiter.record_failure(url, "captcha" if result.blocked else "error")
+    
+    def scrape_urls(self, urls: List[str], delay_between_requests: Optional[float] = None,
+                    workers: int = 1, per_domain: int = 1) -> List[ScrapingResult]:
+        """
+        Scrape multiple URLs, pacing each domain through the adaptive rate limiter.
+        With workers > 1 URLs run concurrently (see _iter_concurrent); results
+        are always returned in input order. Long batches should use stream().
+        """
+        results: List[Optional[ScrapingResult]] = [None] * len(urls)
+        summary = ScrapeSummary()
+        
+        for index, url, result in self.iter_scrape(urls, delay_between_requests, workers, per_domain):
+            results[index] = result
+            summary.write(url, result)
+        
+        # Print summary
+        self._print_summary(summary)
+        
+        return results
+    
+    def stream(self, urls: Iterable[str], sinks: Sequence[ResultSink] = (),
+               delay_between_requests: Optional[float] = None,
+               workers: int = 1, per_domain: int = 1) -> ScrapeSummary:
+        """
+        Scrape URLs and hand each result to every sink as soon as it completes.
+        Only the running summary is kept, so memory stays flat for any batch size.
+        """
+        summary = ScrapeSummary()
+        try:
+            for _, url, result in self.iter_scrape(urls, delay_between_requests, workers, per_domain):
+                summary.write(url, result)
+                for sink in sinks:
+                    try:
+                        sink.write(url, result)
+                    except Exception as e:
+                        print(f"⚠️ {type(sink).__name__} failed for {url}: {e}")
+        finally:
+            for sink in sinks:
+                sink.close()
+        
+        self._print_summary(summary)
+        return summary
+    
+    def iter_scrape(self, urls: Iterable[str], delay_between_requests: Optional[float] = None,
+                    workers: int = 1, per_domain: int = 1) -> Iterator[Tuple[int, str, ScrapingResult]]:
+        """
+        Yield (index, url, result) as each scrape finishes - in completion order when
+        workers > 1. URLs are pulled from the iterable lazily, so a generator over a
+        huge file is never loaded into memory.
+        """
+        self._use_delay(delay_between_requests)
+        total = len(urls) if hasattr(urls, "__len__") else None
+        
+        if workers > 1:
+            yield from self._iter_concurrent(urls, total, workers, per_domain)
+            return
         
-        print(f"🚀 Starting scraping process for {len(urls)} URLs")
+        print(f"🚀 Starting scraping process for {total if total is not None else 'streamed'} URLs")
         print(f"📁 Output directory: {self.config.output_path}")
         
-        for i, url in enumerate(urls, 1):
+        for index, url in enumerate(urls):
             print(f"\n{'='*60}")
-            print(f"🔄 Processing URL {i}/{len(urls)}: {url}")
+            print(f"🔄 Processing URL {_position(index, total)}: {url}")
             print(f"{'='*60}")
             
-            # Create appropriate scraper
-            scraper = ScraperFactory.create_scraper(url, self.config)
-            
-            if not scraper:
-                error_msg = f"No scraper available for URL: {url}"
-                print(f"❌ {error_msg}")
-                self.unsupported_urls.append(url)  # Track unsupported URL
-                results.append(ScrapingResult(success=False, error=error_msg))
-                continue
+            # Only waits if this domain was hit recently - other hosts go straight through
+            self._wait_for_rate_limit(url)
             
             # Perform scraping
-            result = scraper.scrape()
-            results.append(result)
-            
-            # Add delay between requests (except for last URL)
-            if i < len(urls):
-                self._progress_countdown(delay_between_requests, f"Cooling down before next request ({i+1}/{len(urls)})")
+            result = self._scrape_one(url)
+            self._record_outcome(url, result)
+            yield index, url, result
+    
+    async def aiter_scrape(self, urls: Iterable[str], delay_between_requests: Optional[float] = None,
+                           workers: int = 1, per_domain: int = 1) -> AsyncIterator[Tuple[int, str, ScrapingResult]]:
+        """Async variant of iter_scrape: the blocking scrapes run on a worker thread."""
+        results = self.iter_scrape(urls, delay_between_requests, workers, per_domain)
+        finished = object()
+        while True:
+            item = await asyncio.to_thread(next, results, finished)
+            if item is finished:
+                return
+            yield item
+    
+    def _scrape_one(self, url: str) -> ScrapingResult:
+        """Scrape a single URL with the scraper chosen by the factory (journaled when enabled)."""
+        if self.journal:
+            self.journal.record_start(url)
+        start = time.monotonic()
         
-        # Print summary
-        self._print_summary(results)
+        scraper = None
+        if self.process_pool is None:
+            scraper = ScraperFactory.create_scraper(url, self.config, driver_pool=self.driver_pool)
         
-        return results
+        if not (scraper or (self.process_pool and ScraperFactory.is_supported_url(url))):
+            error_msg = f"No scraper available for URL: {url}"
+            print(f"❌ {error_msg}")
+            self.unsupported_urls.append(url)  # Track unsupported URL
+            result = ScrapingResult(success=False, error=error_msg)
+            if self.journal:
+                self.journal.record_result(url, result, time.monotonic() - start, unsupported=True)
+            return result
+        
+        try:
+            # In process mode this thread only waits; parsing happens in the worker process
+            result = self.process_pool.scrape(url, self.config) if self.process_pool else scraper.scrape()
+        except Exception as e:
+            result = ScrapingResult(success=False, error=f"Scraping failed for {url}: {e}")
+        
+        if self.journal:
+            self.journal.record_result(url, result, time.monotonic() - start)
+        return result
     
-    def scrape_from_file(self, file_path: str, delay_between_requests: int = 5) -> List[ScrapingResult]:
-        """Scrape URLs from a text file."""
+    def _iter_concurrent(self, urls: Iterable[str], total: Optional[int], workers: int,
+                         per_domain: int) -> Iterator[Tuple[int, str, ScrapingResult]]:
+        """
+        Scrape URLs on a worker pool. At most `workers` scrapes run at once and at
+        most `per_domain` against any single domain; pacing comes from the per-domain
+        rate limiter, so unrelated hosts never wait on each other. Only a small
+        look-ahead window of URLs is read from `urls` at a time.
+        """
+        source = enumerate(urls)
+        lookahead = workers * self.LOOKAHEAD_PER_WORKER
+        pending = deque()
+        running: Dict[str, int] = {}
+        in_flight = {}
+        
+        def refill() -> None:
+            while len(pending) < lookahead:
+                item = next(source, None)
+                if item is None:
+                    return
+                pending.append(item)
+        
+        print(f"🚀 Starting concurrent scraping for {total if total is not None else 'streamed'} URLs "
+              f"({workers} workers, {per_domain} per domain)")
+        print(f"📁 Output directory: {self.config.output_path}")
+        
+        # Worker processes bring their own drivers; otherwise this batch shares one pool
+        owns_pool = self.driver_pool is None and self.process_pool is None
+        if owns_pool:
+            from .base_scraper import create_chrome_driver
+            self.driver_pool = DriverPool(create_chrome_driver, size=workers)
+        
         try:
-            file_path = Path(file_path)
-            if not file_path.exists():
-                raise FileNotFoundError(f"File not found: {file_path}")
-            
-            with open(file_path, "r", encoding="utf-8") as file:
-                urls = [line.strip() for line in file if line.strip()]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                refill()
+                while pending or in_flight:
+                    # Dispatch every URL whose domain has a free slot and a rate-limit token
+                    now = time.monotonic()
+                    wake_times = []
+                    skipped = deque()
+                    while pending and len(in_flight) < workers:
+                        index, url = pending.popleft()
+                        domain = domain_key(url)
+                        if running.get(domain, 0) >= per_domain:
+                            skipped.append((index, url))
+                            continue
+                        
+                        wait_time = self.rate_limiter.try_acquire(domain)
+                        if wait_time > 0:
+                            wake_times.append(now + wait_time)
+                            skipped.append((index, url))
+                            continue
+                        
+                        running[domain] = running.get(domain, 0) + 1
+                        print(f"🔄 [{_position(index, total)}] Processing: {url}")
+                        future = executor.submit(self._scrape_one, url)
+                        in_flight[future] = (index, url, domain)
+                    pending.extendleft(reversed(skipped))
+                    
+                    timeout = max(0.0, min(wake_times) - now) if wake_times else None
+                    
+                    if not in_flight:
+                        # Everything left is waiting on the limiter - sleep until the first domain is ready
+                        time.sleep(timeout or 0.1)
+                        continue
+                    
+                    done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, url, domain = in_flight.pop(future)
+                        running[domain] -= 1
+                        result = future.result()
+                        self._record_outcome(url, result)
+                        status = "✅" if result.success else "❌"
+                        print(f"{status} [{_position(index, total)}] Finished: {url}")
+                        yield index, url, result
+                    refill()
+        finally:
+            if owns_pool:
+                self.driver_pool.close()
+                self.driver_pool = None
+    
+    def scrape_from_file(self, file_path: str, delay_between_requests: Optional[float] = None,
+                         workers: int = 1, per_domain: int = 1, resume: bool = False,
+                         max_attempts: int = 3, shard: Optional[str] = None) -> List[ScrapingResult]:
+        """
+        Scrape URLs from a text file. With a journal, resume=True skips URLs already
+        done and retries failed ones up to max_attempts; shard='K/N' keeps only
+        that shard's URLs.
+        """
+        try:
+            urls = list(self.iter_file_urls(file_path, resume, max_attempts, shard))
             
             if not urls:
-                print("⚠️ No URLs found in file")
+                print("⚠️ No URLs left to scrape in file")
                 return []
             
-            return self.scrape_urls(urls, delay_between_requests)
+            return self.scrape_urls(urls, delay_between_requests, workers, per_domain)
             
         except Exception as e:
             error_msg = f"Failed to read URLs from file: {e}"
             print(f"❌ {error_msg}")
             return [ScrapingResult(success=False, error=error_msg)]
     
-    def _print_summary(self, results: List[ScrapingResult]) -> None:
-        """Print scraping summary."""
-        successful = sum(1 for r in results if r.success)
-        failed = len(results) - successful
+    def stream_from_file(self, file_path: str, sinks: Sequence[ResultSink] = (),
+                         delay_between_requests: Optional[float] = None, workers: int = 1,
+                         per_domain: int = 1, resume: bool = False, max_attempts: int = 3,
+                         shard: Optional[str] = None) -> ScrapeSummary:
+        """Streaming scrape_from_file: the file is read line by line while results flow to `sinks`."""
+        urls = self.iter_file_urls(file_path, resume, max_attempts, shard)
+        return self.stream(urls, sinks, delay_between_requests, workers, per_domain)
+    
+    def iter_file_urls(self, file_path: str, resume: bool = False, max_attempts: int = 3,
+                       shard: Optional[str] = None) -> Iterator[str]:
+        """
+        Lazily read URLs from a file: blank lines and duplicate products are dropped,
+        then the shard filter and (with resume) the journal filter are applied.
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        shard_spec = parse_shard(shard) if shard else None
+        seen = set()
+        skipped = {"shard": 0, "done": 0}
+        
+        with open(file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                url = line.strip()
+                if not url:
+                    continue
+                
+                key = canonical_key(url)
+                if key in seen:
+                    print(f"⏭️ Skipping duplicate product ({key}): {url}")
+                    continue
+                seen.add(key)
+                
+                if shard_spec and not in_shard(url, *shard_spec):
+                    skipped["shard"] += 1
+                    continue
+                
+                if resume and self.journal and not self.journal.is_pending(url, max_attempts):
+                    skipped["done"] += 1
+                    continue
+                
+                yield url
         
+        if shard_spec:
+            print(f"🧩 Shard {shard_spec[0]}/{shard_spec[1]}: skipped {skipped['shard']} URLs from other shards")
+        if resume and self.journal:
+            print(f"📒 Journal {self.journal.path}: skipped {skipped['done']} URLs already done or out of attempts")
+    
+    def _print_summary(self, summary: ScrapeSummary) -> None:
+        """Print scraping summary."""
         print(f"\n{'='*60}")
         print(f"📊 SCRAPING SUMMARY")
         print(f"{'='*60}")
-        print(f"✅ Successful: {successful}")
-        print(f"❌ Failed: {failed}")
-        print(f"📊 Total: {len(results)}")
+        print(f"✅ Successful: {summary.successful}")
+        print(f"❌ Failed: {summary.failed}" + (f" ({summary.blocked} blocked)" if summary.blocked else ""))
+        print(f"📊 Total: {summary.total} in {summary.elapsed:.0f}s")
         
-        if failed > 0:
+        if summary.failures:
             print(f"\n❌ Failed URLs:")
-            for result in results:
-                if not result.success:
-                    print(f"   • Error: {result.error}")
+            for url, error in summary.failures:
+                print(f"   • Error: {error}")
+            if summary.failed > len(summary.failures):
+                print(f"   • ... and {summary.failed - len(summary.failures)} more")
         
         # Print unsupported URLs at the end
         if self.unsupported_urls:
@@ -139,13 +399,26 @@ class ScrapingOrchestrator:
                 print(f"   • {url}")
             
             # Show supported domains
-            from scraper_factory import ScraperFactory
             supported_domains = ScraperFactory.get_supported_domains()
             print(f"\nℹ️  Supported domains: {', '.join(supported_domains)}")
         
+        # Adaptive limiter state, so pacing can be tuned from real runs
+        limiter_state = self.rate_limiter.snapshot()
+        if limiter_state:
+            print("\n🐢 RATE LIMITER:")
+            for domain, state in limiter_state.items():
+                print(f"   • {domain}: 1 req / {state['interval_sec']}s "
+                      f"({state['successes']} ok, {state['failures']} failed"
+                      f"{', last: ' + state['last_failure'] if state['last_failure'] else ''})")
+        
         print(f"{'='*60}")
 
 
+def _position(index: int, total: Optional[int]) -> str:
+    """'3/250' for known-length batches, '3' for streamed ones."""
+    return f"{index + 1}/{total}" if total is not None else str(index + 1)
+
+
 # CLI interface
 def main():
     """
@@ -168,8 +441,11 @@ def main():
     With custom maximum images per product:
         python scraping_orchestrator.py -i urls.txt --max-images 15
     
+    Concurrent mode (4 URLs at once, at most 1 per domain):
+        python scraping_orchestrator.py -i urls.txt --workers 4 --per-domain 1
+    
     Full example with all options:
-        python scraping_orchestrator.py -i "C:/urls.txt" -o "D:/Output" -d 7 --max-images 25
+        python scraping_orchestrator.py -i "C:/urls.txt" -o "D:/Output" -d 7 --max-images 25 --workers 4
     
     SUPPORTED DOMAINS:
         - Amazon: amazon.com, amazon.ca, amazon.co.uk
@@ -184,7 +460,8 @@ def main():
     NOTES:
         - Unsupported URLs will be listed at the end of scraping
         - Each product gets its own folder with images and data
-        - Default delay is 5 seconds between requests (be respectful!)
+        - Default delay is 5 seconds between requests to the same domain (be respectful!)
+        - With --workers > 1, different domains are scraped in parallel
         - Default output: "G:/My Drive/selling/not posted/"
     """
     import argparse
@@ -217,7 +494,7 @@ SUPPORTED SITES:
         "--delay", "-d", 
         type=int, 
         default=5, 
-        help="Delay between requests in seconds (default: 5, min recommended: 2)"
+        help="Nominal delay between requests to the same domain in seconds; adapts to errors (default: 5, min recommended: 2)"
     )
     parser.add_argument(
         "--max-images", 
@@ -225,22 +502,107 @@ SUPPORTED SITES:
         default=20, 
         help="Maximum images to download per product (default: 20)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of URLs to scrape concurrently (default: 1 = sequential)"
+    )
+    parser.add_argument(
+        "--per-domain",
+        type=int,
+        default=1,
+        help="Maximum concurrent scrapes against a single domain (default: 1)"
+    )
+    parser.add_argument(
+        "--journal",
+        help="Checkpoint journal path (default: <input>.journal.ndjson, per shard when --shard is set)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip URLs the journal marks done and retry failed / interrupted ones"
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Attempts per URL before --resume stops retrying it (default: 3)"
+    )
+    parser.add_argument(
+        "--shard",
+        help="Only scrape shard K of N, e.g. 2/4 (split one URL file across machines)"
+    )
+    parser.add_argument(
+        "--sink",
+        action="append",
+        default=[],
+        help="Where each result goes as soon as it completes: ndjson:<path>, stdout or supabase (repeatable)"
+    )
+    parser.add_argument(
+        "--processes",
+        help="Scrape in worker processes, each owning its Chrome driver: a number or 'auto' "
+             "(min of cores and memory / SCRAPER_WORKER_MEMORY_MB). Implies --workers of the same size"
+    )
     
     args = parser.parse_args()
     
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    try:
+        sinks = [parse_sink(spec) for spec in args.sink]
+    except ValueError as e:
+        parser.error(str(e))
+    # Progress prints go to stderr while stdout carries NDJSON records
+    reserve_stdout(sinks)
+    
     # Create config
     config = ScraperConfig(
         output_path=args.output or "G:\\My Drive\\selling\\not posted\\",
-        max_images=args.max_images
+        max_images=args.max_images,
+        llm_priority=PRIORITY_BATCH  # Interactive API scrapes go first on a shared Ollama
     )
     
+    # Every URL is journaled, so an interrupted run can be continued with --resume
+    journal = ScrapeJournal(args.journal or default_journal_path(args.input, shard))
+    
+    # Worker processes: one scrape per process, plus as many again waiting on the (parent-side) LLM
+    process_pool = None
+    workers = args.workers
+    if args.processes:
+        try:
+            processes = resolve_worker_count(args.processes)
+        except ValueError:
+            parser.error(f"Invalid --processes '{args.processes}', expected a number or 'auto'")
+        if processes > 0:
+            process_pool = ScraperProcessPool(processes)
+            workers = max(workers, 2 * processes)
+    
     # Create orchestrator and run
-    orchestrator = ScrapingOrchestrator(config)
-    results = orchestrator.scrape_from_file(args.input, args.delay)
+    orchestrator = ScrapingOrchestrator(config, journal=journal, process_pool=process_pool)
+    try:
+        # Streamed: the URL file is read lazily and results go straight to the sinks
+        summary = orchestrator.stream_from_file(args.input, sinks, args.delay, workers, args.per_domain,
+                                                resume=args.resume, max_attempts=args.max_attempts,
+                                                shard=args.shard)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        exit(1)
+    except KeyboardInterrupt:
+        print(f"\n🛑 Interrupted - progress saved to {journal.path}, rerun with --resume to continue")
+        exit(130)
+    finally:
+        journal.close()
+        if process_pool:
+            process_pool.close()
     
     # Exit with appropriate code
-    successful = sum(1 for r in results if r.success)
-    if successful == len(results):
+    if summary.all_succeeded:
         print("🎉 All scraping operations completed successfully!")
         exit(0)
     else:
@@ -0,0 +1,108 @@
+"""
+Batched selector resolution for Selenium scrapers.
+
+Trying selectors one at a time with a WebDriverWait each means a missing
+first selector stalls the scrape for its whole timeout before the next one
+is even tried. SelectorEngine instead evaluates every candidate selector for
+every field inside a single execute_script call, re-polls that one call until
+each field's deadline, and records how long each field took to resolve.
+
+Selector configs use the scrapers' existing format:
+    {"type": "css" | "id" | "class" | "xpath", "value": "..."}
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+# Returns {field: [candidate_index, text]} for the first candidate (per field)
+# whose first match has non-empty text. Candidates are tried in order.
+_RESOLVE_SCRIPT = """
+const fields = arguments[0];
+const found = {};
+const first = (type, value) => {
+    switch (type) {
+        case 'css': return document.querySelector(value);
+        case 'id': return document.getElementById(value);
+        case 'class': return document.getElementsByClassName(value)[0] || null;
+        case 'xpath': return document.evaluate(value, document, null,
+                                               XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return null;
+};
+for (const [name, candidates] of Object.entries(fields)) {
+    for (let i = 0; i < candidates.length; i++) {
+        let el = null;
+        try { el = first(candidates[i][0], candidates[i][1]); } catch (e) { continue; }
+        if (!el) continue;
+        const text = ((el.innerText !== undefined ? el.innerText : el.textContent) || '').trim();
+        if (text) { found[name] = [i, text]; break; }
+    }
+}
+return found;
+"""
+
+
+@dataclass
+class FieldMatch:
+    """Resolution outcome for one field."""
+    text: str = ""
+    selector: Optional[dict] = None
+    elapsed: float = 0.0  # seconds until found (or until the field's deadline passed)
+
+    @property
+    def found(self) -> bool:
+        return bool(self.text)
+
+
+class SelectorEngine:
+    """Resolves many fields' candidate selectors in one browser round-trip per poll."""
+
+    def __init__(self, driver: Any, poll_interval: float = 0.25):
+        self.driver = driver
+        self.poll_interval = poll_interval
+
+    def resolve(self, fields: Dict[str, List[dict]],
+                timeout: Union[float, Dict[str, float]] = 10) -> Dict[str, FieldMatch]:
+        """
+        Return the first non-empty hit per field. `timeout` is either one deadline
+        for every field or a per-field dict (fields missing from it get 10s).
+        """
+        start = time.monotonic()
+        deadlines = {
+            name: start + (timeout.get(name, 10) if isinstance(timeout, dict) else timeout)
+            for name in fields
+        }
+        results: Dict[str, FieldMatch] = {}
+        pending = dict(fields)
+
+        while pending:
+            payload = {name: [[sel["type"], sel["value"]] for sel in selectors]
+                       for name, selectors in pending.items()}
+            try:
+                hits = self.driver.execute_script(_RESOLVE_SCRIPT, payload) or {}
+            except Exception as e:
+                print(f"⚠️ Selector poll failed: {e}")
+                hits = {}
+
+            now = time.monotonic()
+            for name in list(pending):
+                if name in hits:
+                    index, text = hits[name]
+                    results[name] = FieldMatch(text=text, selector=pending[name][int(index)],
+                                               elapsed=now - start)
+                    del pending[name]
+                elif now >= deadlines[name]:
+                    results[name] = FieldMatch(elapsed=now - start)
+                    del pending[name]
+
+            if pending:
+                next_deadline = min(deadlines[name] for name in pending)
+                time.sleep(max(0.0, min(self.poll_interval, next_deadline - time.monotonic())))
+
+        for name, match in results.items():
+            if match.found:
+                print(f"⏱️ {name}: {match.elapsed:.2f}s via {match.selector['type']} '{match.selector['value'][:50]}'")
+            else:
+                print(f"⏱️ {name}: not found after {match.elapsed:.2f}s")
+
+        return results
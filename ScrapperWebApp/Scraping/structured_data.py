@@ -0,0 +1,235 @@
+"""
+Schema.org structured data extraction (JSON-LD first, then microdata).
+
+Most retailers embed an exact Product/Offer description of the page for
+search engines. When it is present it beats every heuristic we have: title,
+price + currency, brand and full-size image URLs come straight from the
+retailer, without selector guessing, whole-page regexes or an LLM call.
+"""
+import html
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from .models import ProductData
+from .page_snapshot import PageSnapshot
+
+CURRENCY_SYMBOLS = {
+    'USD': '$', 'CAD': '$', 'AUD': '$', 'NZD': '$',
+    'EUR': '€', 'GBP': '£',
+}
+
+# Fields copied onto ProductData when the scraper left them empty
+PRODUCT_FIELDS = ['title', 'price', 'description', 'brand', 'color']
+
+
+@dataclass
+class StructuredProduct:
+    """Product facts read from schema.org markup."""
+    title: str = ""
+    price: str = ""
+    currency: str = ""
+    description: str = ""
+    brand: str = ""
+    color: str = ""
+    sku: str = ""
+    images: List[str] = field(default_factory=list)
+    source: str = ""  # "json-ld" or "microdata"
+
+    def is_complete(self) -> bool:
+        """True when title, price and description are all known (nothing left to guess)."""
+        return bool(self.title and self.price and self.description)
+
+    def apply_to(self, product: ProductData) -> List[str]:
+        """Fill the product's empty fields. Returns the names of the fields filled."""
+        filled = []
+        for name in PRODUCT_FIELDS:
+            value = getattr(self, name)
+            if value and not getattr(product, name):
+                setattr(product, name, value)
+                product.sources[name] = self.source
+                filled.append(name)
+        return filled
+
+
+def extract_structured_product(snapshot: PageSnapshot) -> Optional[StructuredProduct]:
+    """Read the page's schema.org Product from JSON-LD, falling back to microdata."""
+    lowered = snapshot.lowered
+
+    if 'application/ld+json' in lowered:
+        for block in snapshot.select_texts('script[type="application/ld+json"]'):
+            data = _load_json(block)
+            if data is None:
+                continue
+            for node in _walk(data):
+                if _is_product(node.get('@type')):
+                    product = _from_node(node, source="json-ld")
+                    if product.title:
+                        return product
+
+    if 'schema.org/product' in lowered:
+        root = snapshot.soup.find(attrs={'itemtype': re.compile(r'schema\.org/Product\b', re.I)})
+        if root is not None:
+            product = _from_node(_microdata_item(root), source="microdata")
+            if product.title:
+                return product
+
+    return None
+
+
+def format_price(amount: Any, currency: str = "") -> str:
+    """Render a schema.org price with its currency symbol ("$129.99", "129.99 JPY")."""
+    if amount is None or amount == "":
+        return ""
+    if isinstance(amount, (int, float)):
+        amount = f"{amount:.2f}"
+    amount = str(amount).strip()
+    if not amount[:1].isdigit():
+        return amount  # already carries a symbol
+    currency = (currency or "").upper()
+    if currency in CURRENCY_SYMBOLS:
+        return f"{CURRENCY_SYMBOLS[currency]}{amount}"
+    return f"{amount} {currency}".strip()
+
+
+# ========== JSON-LD ==========
+
+def _load_json(text: str) -> Any:
+    text = (text or "").strip()
+    # Some CMSs wrap the block in HTML comments / CDATA
+    text = re.sub(r'^\s*(<!--|//\s*<!\[CDATA\[)|(-->|//\s*\]\]>)\s*$', '', text).strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        try:
+            # Raw newlines/tabs inside strings are common and rejected by strict parsing
+            return json.loads(text, strict=False)
+        except ValueError:
+            return None
+
+
+def _walk(data: Any, depth: int = 0) -> Iterator[Dict[str, Any]]:
+    """Every dict in a JSON-LD document (covers lists, @graph and mainEntity nesting)."""
+    if depth > 6:
+        return
+    if isinstance(data, list):
+        for item in data:
+            yield from _walk(item, depth + 1)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from _walk(value, depth + 1)
+
+
+def _is_product(type_value: Any) -> bool:
+    types = type_value if isinstance(type_value, list) else [type_value]
+    return any(isinstance(t, str) and t.split('/')[-1] in ('Product', 'ProductGroup', 'IndividualProduct')
+               for t in types)
+
+
+# ========== MICRODATA ==========
+
+def _microdata_item(scope: Any) -> Dict[str, Any]:
+    """Convert an itemscope element into a JSON-LD-like dict."""
+    item: Dict[str, Any] = {'@type': (scope.get('itemtype') or '').rstrip('/').split('/')[-1]}
+    for elem in scope.find_all(attrs={'itemprop': True}):
+        if _owning_scope(elem) is not scope:
+            continue
+        value = _microdata_item(elem) if elem.has_attr('itemscope') else _microdata_value(elem)
+        for name in elem['itemprop'].split() if isinstance(elem['itemprop'], str) else elem['itemprop']:
+            if name in item:
+                existing = item[name]
+                item[name] = (existing if isinstance(existing, list) else [existing]) + [value]
+            else:
+                item[name] = value
+    return item
+
+
+def _owning_scope(elem: Any) -> Any:
+    parent = elem.parent
+    while parent is not None and not parent.has_attr('itemscope'):
+        parent = parent.parent
+    return parent
+
+
+def _microdata_value(elem: Any) -> str:
+    if elem.has_attr('content'):
+        return elem['content']
+    attr = {'meta': 'content', 'link': 'href', 'a': 'href', 'img': 'src',
+            'source': 'src', 'time': 'datetime', 'data': 'value'}.get(elem.name)
+    if attr and elem.has_attr(attr):
+        return elem[attr]
+    return elem.get_text(" ", strip=True)
+
+
+# ========== NORMALIZATION ==========
+
+def _from_node(node: Dict[str, Any], source: str) -> StructuredProduct:
+    product = StructuredProduct(source=source)
+    product.title = _text(node.get('name'))
+    product.description = _text(node.get('description'))
+    product.brand = _text(_first(node.get('brand')), key='name')
+    product.color = _text(node.get('color'))
+    product.sku = _text(node.get('sku'))
+    product.images = _image_urls(node.get('image'))
+
+    offer = _first_offer(node)
+    if offer:
+        amount = offer.get('price') or offer.get('lowPrice')
+        currency = _text(offer.get('priceCurrency'))
+        spec = _first(offer.get('priceSpecification'))
+        if amount in (None, "") and isinstance(spec, dict):
+            amount = spec.get('price')
+            currency = currency or _text(spec.get('priceCurrency'))
+        product.currency = currency
+        product.price = format_price(_first(amount), currency)
+
+    return product
+
+
+def _first_offer(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    offers = node.get('offers')
+    candidates = list(offers) if isinstance(offers, list) else [offers]
+    # ProductGroup pages put offers on the variants
+    for variant in node.get('hasVariant') or []:
+        if isinstance(variant, dict):
+            variant_offers = variant.get('offers')
+            candidates += variant_offers if isinstance(variant_offers, list) else [variant_offers]
+
+    for offer in candidates:
+        if not isinstance(offer, dict):
+            continue
+        nested = offer.get('offers')  # AggregateOffer listing individual offers
+        if offer.get('price') in (None, "") and offer.get('lowPrice') in (None, "") and nested:
+            offer = _first(nested) if isinstance(_first(nested), dict) else offer
+        if any(offer.get(k) not in (None, "") for k in ('price', 'lowPrice', 'priceSpecification')):
+            return offer
+    return None
+
+
+def _image_urls(value: Any) -> List[str]:
+    urls = []
+    for item in value if isinstance(value, list) else [value]:
+        if isinstance(item, dict):
+            item = item.get('contentUrl') or item.get('url')
+        if isinstance(item, str) and item.strip() and item.strip() not in urls:
+            urls.append(item.strip())
+    return urls
+
+
+def _first(value: Any) -> Any:
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _text(value: Any, key: str = 'name') -> str:
+    """Plain, unescaped string for a schema.org value (dicts resolve through `key`)."""
+    value = _first(value)
+    if isinstance(value, dict):
+        value = value.get(key) or value.get('@value')
+    if value is None or isinstance(value, (dict, list)):
+        return ""
+    text = html.unescape(str(value))
+    text = re.sub(r'<[^>]+>', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
@@ -0,0 +1,68 @@
+"""
+Benchmark the HTML parser backends on saved product pages.
+1. Save a few product pages (browser "Save page as... HTML only", or page_source)
+2. Run: python bench_parsers.py page1.html page2.html [--repeat 5]
+
+Each run parses the page and performs the same queries a scrape does
+(meta tags, CSS selectors, <img> attributes, page text and LLM clean text).
+"""
+import sys
+import os
+import time
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from ScrapperWebApp.Scraping.html_parser import BACKENDS, resolve_backend
+from ScrapperWebApp.Scraping.page_snapshot import PageSnapshot
+
+META_PROPS = ["og:title", "og:description", "og:image", "product:price:amount", "description"]
+SELECTORS = ["h1", 'span[class*="price"]', 'div[class*="description"]', "#productTitle"]
+
+
+def run_workload(html: str, backend: str) -> None:
+    """Parse once and run a scrape's worth of queries."""
+    snapshot = PageSnapshot(html, backend=backend)
+    for prop in META_PROPS:
+        snapshot.meta_content(prop)
+    for selector in SELECTORS:
+        snapshot.select_one_text(selector)
+    snapshot.img_attributes()
+    snapshot.text
+    snapshot.clean_text
+
+
+def bench(html: str, backend: str, repeat: int) -> float:
+    """Best-of-`repeat` wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_workload(html, backend)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+parser = argparse.ArgumentParser(description="Compare HTML parser backends on saved pages")
+parser.add_argument("files", nargs="+", help="Saved HTML files")
+parser.add_argument("--repeat", type=int, default=5, help="Runs per backend (best time is reported)")
+args = parser.parse_args()
+
+# Only benchmark backends that are actually installed (resolve_backend falls back otherwise)
+backends = [b for b in BACKENDS if resolve_backend(b) == b]
+print(f"Backends: {', '.join(backends)}\n")
+
+totals = {b: 0.0 for b in backends}
+for path in args.files:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        html = f.read()
+    print(f"=== {os.path.basename(path)} ({len(html) / 1024:.0f} KB) ===")
+    for backend in backends:
+        ms = bench(html, backend, args.repeat)
+        totals[backend] += ms
+        print(f"  {backend:<12} {ms:8.1f} ms")
+    print()
+
+baseline = totals.get("html.parser")
+print("=== TOTAL ===")
+for backend in backends:
+    speedup = f"  ({baseline / totals[backend]:.1f}x vs html.parser)" if baseline else ""
+    print(f"  {backend:<12} {totals[backend]:8.1f} ms{speedup}")
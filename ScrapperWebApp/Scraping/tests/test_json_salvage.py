@@ -0,0 +1,74 @@
+"""
+Offline checks for the tolerant LLM reply parser (no browser, no Ollama).
+
+    python -m pytest Scraping/tests/test_json_salvage.py
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from ScrapperWebApp.Scraping.json_salvage import salvage_json_object
+from ScrapperWebApp.Scraping.llm_enrichment import parse_llm_json
+
+
+def test_well_formed_object_is_complete():
+    salvaged = salvage_json_object('{"title": "Rug", "price": "$129.99"}')
+    assert salvaged.complete
+    assert salvaged.data == {"title": "Rug", "price": "$129.99"}
+
+
+def test_fences_and_chatter_are_skipped():
+    salvaged = salvage_json_object('Here you go:\n```json\n{"title": "Rug"}\n```\nHope this helps!')
+    assert salvaged.complete
+    assert salvaged.data == {"title": "Rug"}
+
+
+def test_cut_inside_string_drops_the_member():
+    salvaged = salvage_json_object('{"title": "Rug", "price": "$12')
+    assert not salvaged.complete
+    assert salvaged.data == {"title": "Rug"}
+
+
+def test_cut_inside_number_drops_the_member():
+    for reply in ('{"title":"A","price":129', '{"title":"A","price":12', '{"title":"A","price":129.'):
+        salvaged = salvage_json_object(reply)
+        assert salvaged.data == {"title": "A"}, reply
+
+
+def test_cut_inside_literal_drops_the_member():
+    salvaged = salvage_json_object('{"title": "A", "in_stock": tru')
+    assert salvaged.data == {"title": "A"}
+
+
+def test_last_member_kept_when_its_value_ended():
+    for reply, last in (('{"title": "A", "price": "$129.99"', {"price": "$129.99"}),
+                        ('{"title": "A", "in_stock": true', {"in_stock": True}),
+                        ('{"title": "A", "tags": ["rug", "wool"]', {"tags": ["rug", "wool"]})):
+        salvaged = salvage_json_object(reply)
+        assert not salvaged.complete
+        assert salvaged.data == {"title": "A", **last}, reply
+
+
+def test_dangling_key_and_trailing_comma_are_dropped():
+    assert salvage_json_object('{"title": "A", "price"').data == {"title": "A"}
+    assert salvage_json_object('{"title": "A", "price": ').data == {"title": "A"}
+    assert salvage_json_object('{"title": "A",').data == {"title": "A"}
+
+
+def test_only_member_cut_short_is_not_recoverable():
+    assert salvage_json_object('{"price": 129') is None
+    assert salvage_json_object('no json here') is None
+
+
+def test_parse_llm_json_keeps_requested_fields_as_strings():
+    reply = parse_llm_json('{"title": "Rug", "tags": ["rug", "wool"], "price": 129, "extra": "x"}',
+                           ["title", "tags", "price"])
+    assert reply.complete
+    assert reply.data == {"title": "Rug", "tags": "rug, wool", "price": "129"}
+
+
+def test_parse_llm_json_reports_repair():
+    reply = parse_llm_json('{"title": "Rug", "price": 129', ["title", "price"])
+    assert not reply.complete
+    assert reply.data == {"title": "Rug"}
+    assert parse_llm_json('{"price": 12', ["price"]) is None
@@ -1,13 +1,25 @@
 """
-Quick script to see the raw ollama response from extract_product_data_LLM.
-1. Put your URL in the URL variable below
-2. Run: python test_llm_response.py
+Quick script to see the raw ollama response from extract_product_data_LLM,
+and check that it parses.
+
+Interactive:
+    python test_llm_response.py                          # the URL below, via Chrome
+    python test_llm_response.py https://...              # any URL
+
+Automated (no browser, saved pages; needs a running Ollama):
+    python test_llm_response.py --html page.html --require title,price
+
+Exit codes: 0 parsed with every required field, 1 required field empty,
+2 reply could not be parsed, 3 reply had to be repaired (with --strict).
 """
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
 from ScrapperWebApp.Scraping.base_scraper import BaseScraper
+from ScrapperWebApp.Scraping.llm_enrichment import parse_llm_json
+from ScrapperWebApp.Scraping.models import SOURCED_FIELDS
 
 # ---- PUT YOUR URL HERE ----
 URL = "https://safavieh.com/rugs/marrakech/mrk749n"
@@ -20,13 +32,24 @@ class _Scraper(BaseScraper):
     def is_supported_url(self, url): pass
 
 
-scraper = _Scraper(url=URL)
+parser = argparse.ArgumentParser(description="Run the LLM extractor on one page and check its reply")
+parser.add_argument("url", nargs="?", default=URL, help="Product URL (loaded in Chrome unless --html is given)")
+parser.add_argument("--html", help="Saved page HTML to use instead of launching Chrome")
+parser.add_argument("--require", default="", help="Comma-separated fields that must come back non-empty")
+parser.add_argument("--strict", action="store_true", help="Fail when the reply needed JSON repair")
+args = parser.parse_args()
+
+scraper = _Scraper(url=args.url)
 
-print(f"Launching browser for: {URL}")
-scraper.driver = scraper._create_driver()
-scraper.driver.get(URL)
-html = scraper.driver.page_source
-scraper.driver.quit()
+if args.html:
+    with open(args.html, "r", encoding="utf-8") as f:
+        html = f.read()
+else:
+    print(f"Launching browser for: {args.url}")
+    scraper.driver = scraper._create_driver()
+    scraper.driver.get(args.url)
+    html = scraper.driver.page_source
+    scraper.driver.quit()
 print(f"Got {len(html)} characters of HTML\n")
 
 response = scraper.extract_product_data_LLM(html)
@@ -36,3 +59,22 @@ print(response)
 print()
 print("=== MESSAGE CONTENT ===")
 print(response['message']['content'])
+print()
+
+reply = parse_llm_json(response['message']['content'], list(SOURCED_FIELDS))
+if reply is None:
+    print("❌ Reply could not be parsed")
+    sys.exit(2)
+
+print("=== PARSED FIELDS ===")
+for name in SOURCED_FIELDS:
+    print(f"{name}: {reply.data.get(name, '')[:100]}")
+
+missing = [name for name in args.require.split(",") if name and not reply.data.get(name)]
+if missing:
+    print(f"❌ Required fields empty: {missing}")
+    sys.exit(1)
+if args.strict and not reply.complete:
+    print("❌ Reply needed JSON repair")
+    sys.exit(3)
+print("✅ Reply parsed" + ("" if reply.complete else " (repaired)"))
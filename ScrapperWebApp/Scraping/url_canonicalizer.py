@@ -0,0 +1,129 @@
+"""
+Per-retailer URL canonicalization for duplicate detection.
+
+The same product reaches us under many URLs: Wayfair adds piid / auctionId /
+trackingId / adTypeId, Amazon adds ref=, tag= and a slug in front of /dp/, and
+links shared from ads carry utm_* and click ids. Deduplicating on the raw
+string re-scraped the same product over and over.
+
+canonicalize_url() strips tracking parameters, lower-cases the host, drops
+"www." and the fragment, and - for retailers we know - pulls out the product
+key the site itself uses (Amazon ASIN, Wayfair SKU). The canonical key is what
+products are deduplicated on (products.canonical_key).
+
+Keys:
+    amazon.ca:B0CX23V2ZK            Amazon ASIN (per storefront - prices differ)
+    wayfair.ca:C000432609           Wayfair SKU (variants selected by piid collapse)
+    example.com/shop/item?id=42     anything else: host + path + sorted query
+
+USAGE:
+    canonical = canonicalize_url(url)
+    canonical.url   # cleaned URL to store / scrape
+    canonical.key   # dedup key
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .scraper_registry import host_suffixes, url_hostname
+
+# Query parameters that never change which product a URL points at. Retailer
+# rules rebuild the URL from the product id, so their own ad / session params
+# (Wayfair piid, auctionId...; Amazon pd_rd_*, qid...) never reach this list.
+TRACKING_PARAMS = {
+    "gclid", "gclsrc", "dclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "yclid", "twclid", "ttclid", "_ga", "_gl", "ref", "ref_", "referrer",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+_ASIN_RE = re.compile(r'/(?:dp|gp/product|gp/aw/d|exec/obidos/asin|product)/([A-Z0-9]{10})(?:[/?]|$)', re.I)
+_WAYFAIR_SKU_RE = re.compile(r'-([a-z]{1,4}\d{4,})\.html$', re.I)
+
+
+@dataclass(frozen=True)
+class CanonicalUrl:
+    """Cleaned URL plus the key products are deduplicated on."""
+    url: str
+    key: str
+    retailer: Optional[str] = None   # "amazon", "wayfair" or None for generic
+    product_id: Optional[str] = None  # ASIN / SKU when one was found
+
+
+# ========== RETAILER RULES ==========
+
+def _amazon(host: str, path: str) -> Optional[CanonicalUrl]:
+    match = _ASIN_RE.search(path)
+    if not match:
+        return None
+    asin = match.group(1).upper()
+    return CanonicalUrl(url=f"https://www.{host}/dp/{asin}", key=f"{host}:{asin}",
+                        retailer="amazon", product_id=asin)
+
+
+def _wayfair(host: str, path: str) -> Optional[CanonicalUrl]:
+    match = _WAYFAIR_SKU_RE.search(path)
+    if not match:
+        return None
+    sku = match.group(1).upper()
+    return CanonicalUrl(url=f"https://www.{host}{path.lower()}", key=f"{host}:{sku}",
+                        retailer="wayfair", product_id=sku)
+
+
+# Registrable domain -> rule. Rules return None when the URL isn't a product page.
+RETAILER_RULES: Dict[str, Callable[[str, str], Optional[CanonicalUrl]]] = {
+    "amazon.com": _amazon,
+    "amazon.ca": _amazon,
+    "amazon.co.uk": _amazon,
+    "wayfair.com": _wayfair,
+    "wayfair.ca": _wayfair,
+    "wayfair.co.uk": _wayfair,
+}
+
+
+# ========== CANONICALIZATION ==========
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def strip_tracking_params(query: str) -> List[Tuple[str, str]]:
+    """Parse a query string, dropping tracking parameters; the rest is sorted."""
+    pairs = parse_qsl(query, keep_blank_values=True)
+    return sorted((name, value) for name, value in pairs if not is_tracking_param(name))
+
+
+@lru_cache(maxsize=4096)
+def canonicalize_url(url: str) -> CanonicalUrl:
+    """Canonical URL and dedup key for a product URL."""
+    url = url.strip()
+    host = url_hostname(url)
+    if host.startswith("www."):
+        host = host[4:]
+
+    parts = urlsplit(url if "//" in url else "//" + url)
+    path = re.sub(r'/{2,}', '/', parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = strip_tracking_params(parts.query)
+
+    for suffix in host_suffixes(host) if host else []:
+        rule = RETAILER_RULES.get(suffix)
+        if rule is not None:
+            canonical = rule(suffix, path)
+            if canonical is not None:
+                return canonical
+            break
+
+    query_string = urlencode(query)
+    scheme = (parts.scheme or "https").lower()
+    clean_url = urlunsplit((scheme, host, path, query_string, ""))
+    key = f"{host}{path}" + (f"?{query_string}" if query_string else "")
+    return CanonicalUrl(url=clean_url, key=key)
+
+
+def canonical_key(url: str) -> str:
+    """Shortcut for canonicalize_url(url).key."""
+    return canonicalize_url(url).key
@@ -6,20 +6,25 @@ import time
 import random
 
 from typing import Optional, List
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 
 from .base_scraper import BaseScraper, ScrapingResult
 from .models import ProductData
+from .scraper_registry import register_scraper, host_matches
+from .page_snapshot import PageSnapshot
 
 
+@register_scraper
 class WayfairScraper(BaseScraper):
     """Wayfair-specific scraper implementation."""
     
     SUPPORTED_DOMAINS = ['wayfair.com', 'wayfair.ca']
     
+    # Readiness wait cap (replaces ~15-20s of stacked fixed sleeps)
+    WAIT_BUDGET = 15.0
+    
+    # Tracking/detection signals blocked on top of the load profile
+    BLOCKED_URL_PATTERNS = ['*://*analytics*', '*://*tracking*', '*://*detect*bot*']
+    
     # Selector configurations
     TITLE_SELECTORS = [
         {"type": "css", "value": "._6o3atz174.hapmhk7.hapmhkf.hapmhkl"},
@@ -51,18 +56,22 @@ class WayfairScraper(BaseScraper):
     
     def is_supported_url(self, url: str) -> bool:
         """Check if URL is from a supported Wayfair domain."""
-        return any(domain in url.lower() for domain in self.SUPPORTED_DOMAINS)
+        return host_matches(url, self.SUPPORTED_DOMAINS)
     
-    def _get_meta_property(self, soup: BeautifulSoup, prop: str) -> Optional[str]:
+    def _get_meta_property(self, snapshot: PageSnapshot, prop: str) -> Optional[str]:
         """Extract content from meta property tag."""
-        tag = soup.find("meta", {"property": prop})
-        return tag["content"] if tag else None
+        return snapshot.meta_content(prop)
     
     def scrape(self):
         """Override scrape method with aggressive anti-detection for Wayfair."""
         try:
+            # Meta tags are usually in the static HTML - skip Chrome if they are
+            fast_result = self._try_http_fast_path()
+            if fast_result:
+                return fast_result
+            
             # Create driver with anti-detection
-            self.driver = self._create_driver()
+            self._open_driver()
             
             # Apply AGGRESSIVE stealth BEFORE navigation
             print("🛡️ Applying pre-navigation stealth techniques...")
@@ -70,42 +79,31 @@ class WayfairScraper(BaseScraper):
             
             # NOW navigate
             print(f"🌐 Navigating to {self.url}...")
-            self.driver.get(self.url)
+            self._navigate(self.url)
             print(f"✅ Successfully loaded: {self.url}")
             
             # Immediately grab initial HTML (BEFORE CAPTCHA JavaScript runs)
             print("📄 Grabbing initial page HTML immediately...")
-            initial_html = self.driver.page_source
-            soup = BeautifulSoup(initial_html, "html.parser")
-            print(f"✅ Captured {len(initial_html)} bytes of initial page source")
+            snapshot = self._take_snapshot()
+            print(f"✅ Captured {len(snapshot)} bytes of initial page source")
             
             # Try to extract product data from INITIAL HTML (before CAPTCHA takes over)
             print("📊 Attempting quick extraction from initial HTML...")
-            product = self._extract_from_initial_html(soup)
+            product = self._extract_from_initial_html(snapshot)
 
             if product and product.title:
                 print(f"✅ Successfully extracted from initial HTML: {product.title}")
-                product = self._fill_missing_with_llm(product, initial_html)
+                pending_llm = self._request_llm_fill(product, snapshot)
 
-                # Get images and save
+                # Get images while the LLM runs, then save stage by stage
                 self.images = self.extract_images()
-                product_path = self._create_product_directory(product)
-                self._save_product_info(product, product_path)
-                downloaded_files = self._download_images(product_path)
-                
-                print(f"✅ Successfully scraped product: {product.title}")
-                print(f"✅ Downloaded {len(downloaded_files)} images")
-                
-                return ScrapingResult(
-                    success=True,
-                    product=product,
-                    images=downloaded_files
-                )
+                return self._complete_scrape(product, pending_llm)
             else:
                 print("⚠️ Could not extract from initial HTML, trying with full extraction...")
             
-            # If initial extraction failed, check for CAPTCHA
+            # If initial extraction failed, check for CAPTCHA on the DOM as it is now
             print("🔍 Checking for bot detection...")
+            self._invalidate_snapshot()
             if self._check_for_captcha():
                 error_msg = f"CAPTCHA/Bot detection encountered for {self.url}. Trying aggressive bypass..."
                 print(f"⚠️ {error_msg}")
@@ -114,40 +112,30 @@ class WayfairScraper(BaseScraper):
                 print("🔥 Applying AGGRESSIVE bypass techniques...")
                 self._apply_aggressive_wayfair_bypass()
                 
-                # Re-check after bypass
-                time.sleep(3)
+                # Re-check once the page has settled after the bypass
+                self._wait_for_page(budget=5)
+                self._invalidate_snapshot()
                 if self._check_for_captcha():
                     print("❌ Bypass failed, giving up on this URL")
                     return ScrapingResult(
                         success=False,
-                        error="CAPTCHA detection could not be bypassed for " + self.url
+                        error="CAPTCHA detection could not be bypassed for " + self.url,
+                        blocked=True
                     )
             
             print("✅ No bot detection (or bypassed), proceeding with full extraction...")
             
             # Extract product data with full methods
             product = self.extract_product_data()
-            if product:
-                product = self._fill_missing_with_llm(product, self.driver.page_source)
             if not product:
                 return ScrapingResult(success=False, error="Failed to extract product data")
+            pending_llm = self._request_llm_fill(product)
             
-            # Get images
+            # Get images while the LLM runs
             self.images = self.extract_images()
             
-            # Save data
-            product_path = self._create_product_directory(product)
-            self._save_product_info(product, product_path)
-            downloaded_files = self._download_images(product_path)
-            
-            print(f"✅ Successfully scraped product: {product.title}")
-            print(f"✅ Downloaded {len(downloaded_files)} images")
-            
-            return ScrapingResult(
-                success=True,
-                product=product,
-                images=downloaded_files
-            )
+            # Save data (releases the browser before waiting on the LLM)
+            return self._complete_scrape(product, pending_llm)
             
         except Exception as e:
             error_msg = f"Scraping failed for {self.url}: {str(e)}"
@@ -155,23 +143,24 @@ class WayfairScraper(BaseScraper):
             return ScrapingResult(success=False, error=error_msg)
             
         finally:
-            if self.driver:
-                self.driver.quit()
+            self._close_driver()
+    
+    def extract_from_html(self, snapshot: PageSnapshot) -> Optional[ProductData]:
+        """Fast-path extraction reuses the initial-HTML meta tag strategy."""
+        return self._extract_from_initial_html(snapshot)
     
-    def _extract_from_initial_html(self, soup: BeautifulSoup) -> Optional[ProductData]:
+    def _extract_from_initial_html(self, snapshot: PageSnapshot) -> Optional[ProductData]:
         """Quick extraction from initial HTML using meta tags and basic selectors."""
         print("  🏃 Using fast meta tag extraction...")
         product = ProductData()
         
         # Try meta tags first (fastest)
-        title = self._get_meta_property(soup, "og:title")
+        title = self._get_meta_property(snapshot, "og:title")
         if not title:
-            title = self._get_meta_property(soup, "product:title")
+            title = self._get_meta_property(snapshot, "product:title")
         if not title:
             # Try basic H1
-            h1 = soup.find("h1")
-            if h1:
-                title = h1.get_text(strip=True)
+            title = snapshot.select_one_text("h1", separator="")
         
         if not title:
             print("  ❌ No title found in initial HTML")
@@ -181,15 +170,15 @@ class WayfairScraper(BaseScraper):
         print(f"  ✅ Title: {product.title[:60]}...")
         
         # Get price from meta
-        price = self._get_meta_property(soup, "product:price:amount")
+        price = self._get_meta_property(snapshot, "product:price:amount")
         if not price:
-            price = self._get_meta_property(soup, "og:price")
+            price = self._get_meta_property(snapshot, "og:price")
         if price:
             product.price = price
             print(f"  ✅ Price: {product.price}")
         
         # Get description from meta
-        description = self._get_meta_property(soup, "og:description")
+        description = self._get_meta_property(snapshot, "og:description")
         if description:
             product.description = description
             print(f"  ✅ Description: {description[:50]}...")
@@ -212,13 +201,7 @@ class WayfairScraper(BaseScraper):
         except:
             pass
         
-        # Block tracking/detection signals
-        try:
-            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {
-                'urls': ['*://*analytics*', '*://*tracking*', '*://*detect*bot*']
-            })
-        except:
-            pass
+        # Tracking/detection signals are blocked by the load profile (BLOCKED_URL_PATTERNS)
         
         stealth_scripts = [
             # Override navigator.webdriver
@@ -253,13 +236,12 @@ class WayfairScraper(BaseScraper):
         try:
             # Add more human-like behavior
             print("  🤖 Simulating human behavior...")
-            import random
             
-            # Random scrolling
+            # Random scrolling, each step waiting for the lazy content it triggers
             for _ in range(3):
                 scroll_height = random.randint(100, 500)
                 self.driver.execute_script(f"window.scrollBy(0, {scroll_height})")
-                time.sleep(random.uniform(1, 3))
+                self._wait_for_page(budget=3)
             
             # Random mouse movements via JavaScript
             self.driver.execute_script("""
@@ -273,8 +255,8 @@ class WayfairScraper(BaseScraper):
                 document.dispatchEvent(event);
             """)
             
-            # Wait with random delay
-            time.sleep(random.uniform(2, 4))
+            # Let any challenge script react to the movement
+            self._wait_for_page(budget=4)
             
             # Attempt to focus on page elements
             try:
@@ -282,13 +264,17 @@ class WayfairScraper(BaseScraper):
             except:
                 pass
                 
-            time.sleep(random.uniform(1, 2))
+            self._wait_for_page(budget=2, network_idle=False)
             
         except Exception as e:
             print(f"  ⚠️ Bypass technique failed: {e}")
 
     def _expand_panels(self) -> None:
         """Expand all collapsible panels on the page."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         print("🔧 Expanding panels...")
         
         for selector_config in self.EXPANDABLE_SELECTORS:
@@ -310,31 +296,6 @@ class WayfairScraper(BaseScraper):
                 # It's normal for some panels to not exist
                 continue
     
-    def _find_element_by_selectors(self, selectors: List[dict], timeout: int = 5) -> Optional[str]:
-        """Try multiple selectors to find an element."""
-        for selector_config in selectors:
-            try:
-                if selector_config["type"] == "css":
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector_config["value"]))
-                    )
-                elif selector_config["type"] == "class":
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, selector_config["value"]))
-                    )
-                elif selector_config["type"] == "id":
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.ID, selector_config["value"]))
-                    )
-                
-                if element and element.text.strip():
-                    return element.text.strip()
-                    
-            except Exception:
-                continue
-                
-        return None
-    
     def extract_product_data(self) -> Optional[ProductData]:
         """Extract product data from Wayfair product page."""
         try:
@@ -346,39 +307,43 @@ class WayfairScraper(BaseScraper):
                 print("🤖 Simulating human browsing behavior...")
                 # Random scroll to simulate reading
                 self.driver.execute_script("window.scrollTo(0, Math.floor(Math.random() * 500));")
-                self._progress_sleep(random.uniform(1, 3), "Reading page content")
                 
                 # Scroll to middle of page
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                self._progress_sleep(random.uniform(1, 2), "Scrolling through page")
                 
                 # Scroll back up a bit
                 self.driver.execute_script("window.scrollTo(0, Math.floor(Math.random() * 300));")
-                self._progress_sleep(random.uniform(1, 2), "Final page positioning")
             except:
                 pass
             
-            # Extended wait for Wayfair page to fully load
-            wait_time = random.uniform(5, 8)
-            self._progress_sleep(wait_time, "Waiting for Wayfair page to fully load")
+            # Wait for the title, network idle and a settled DOM (lazy content the scrolls triggered)
+            self._wait_for_page(self.TITLE_SELECTORS)
             
             # Expand all panels for better data extraction
             self._expand_panels()
             
-            # Additional wait after expanding panels
-            self._progress_sleep(random.uniform(2, 4), "Processing expanded panels")
+            # Let the expanded panels finish rendering
+            self._wait_for_page(budget=4, network_idle=False)
             
-            # Get page source for fallback meta tag extraction
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
+            # Capture the expanded page once - meta fallbacks, images and LLM share it
+            self._invalidate_snapshot()
+            snapshot = self._current_snapshot()
             
             product = ProductData()
             
-            # Extract title with longer timeout
+            # Resolve every field's selectors together; title gets the longest deadline
+            found = self._resolve_selectors({
+                "title": self.TITLE_SELECTORS,
+                "price": self.PRICE_SELECTORS,
+                "description": self.DESCRIPTION_SELECTORS,
+            }, timeout={"title": 15, "price": 5, "description": 5})
+            
+            # Extract title
             print("ℹ️ Extracting title...")
-            title = self._find_element_by_selectors(self.TITLE_SELECTORS, timeout=15)
+            title = found["title"]
             if not title:
                 # Fallback to meta tags
-                title = self._get_meta_property(soup, "og:title")
+                title = self._get_meta_property(snapshot, "og:title")
             
             if title:
                 product.title = self._sanitize_filename(title)
@@ -387,21 +352,21 @@ class WayfairScraper(BaseScraper):
                 print("❌ Failed to find product title")
                 return None
             
-            # Extract price with shorter timeout to avoid hanging
+            # Extract price
             print("ℹ️ Extracting price...")
-            price = self._find_element_by_selectors(self.PRICE_SELECTORS, timeout=5)
+            price = found["price"]
             if price:
                 product.price = price
                 print(f"✅ Found price: {product.price}")
             else:
                 print("⚠️ Price not found")
             
-            # Extract description with shorter timeout  
+            # Extract description
             print("ℹ️ Extracting description...")
-            description = self._find_element_by_selectors(self.DESCRIPTION_SELECTORS, timeout=5)
+            description = found["description"]
             if not description:
                 # Fallback to meta tags
-                description = self._get_meta_property(soup, "og:description")
+                description = self._get_meta_property(snapshot, "og:description")
             
             if description:
                 product.description = description
@@ -439,8 +404,7 @@ class WayfairScraper(BaseScraper):
         print("🌐 [START] extract_images")
 
         try:
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            images = soup.find_all("img")
+            images = self._current_snapshot().img_attributes()
             image_urls = []
             seen = set()
 
@@ -466,6 +430,7 @@ class WayfairScraper(BaseScraper):
                     print(f"🛑 Reached max_images limit: {self.config.max_images}")
                     break
 
+            image_urls = self._with_structured_images(image_urls)
             print(f"✅ Found {len(image_urls)} product images")
             print("🌐 [END] extract_images")
             return image_urls
@@ -2,17 +2,24 @@
 Database connection and operations for Supabase.
 """
 import os
-from typing import Optional, Dict, Any, List
-from supabase import create_client, Client
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 load_dotenv()
 
 class Database:
     """Database service for Supabase operations."""
     
     def __init__(self):
-        """Initialize Supabase client."""
+        """
+        Initialize Supabase client. No query is made here - call _test_connection()
+        explicitly when a live check is wanted, so startup stays fast.
+        """
+        from supabase import create_client
+        
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_ANON_KEY")
         
@@ -22,8 +29,7 @@ class Database:
                 "Please set SUPABASE_URL and SUPABASE_ANON_KEY in your .env file"
             )
         
-        self.client: Client = create_client(supabase_url, supabase_key)
-        self._test_connection()
+        self.client: "Client" = create_client(supabase_url, supabase_key)
     
     def _test_connection(self):
         """Test the database connection."""
@@ -41,9 +47,11 @@ class Database:
     # ========== PRODUCT OPERATIONS ==========
     
     def create_product(self, url: str, **kwargs) -> Dict[str, Any]:
-        """Create a new product."""
+        """Create a new product (canonical_key is derived from the URL unless given)."""
+        from Scraping.url_canonicalizer import canonical_key
         data = {
             "url": url,
+            "canonical_key": canonical_key(url),
             **kwargs
         }
         result = self.client.table("products").insert(data).execute()
@@ -58,6 +66,30 @@ class Database:
         """Get a product by URL."""
         result = self.client.table("products").select("*").eq("url", url).execute()
         return result.data[0] if result.data else None
+
+    def get_product_by_canonical_key(self, canonical_key: str) -> Optional[Dict[str, Any]]:
+        """Get a product by its canonical URL key (see Scraping/url_canonicalizer.py)."""
+        result = self.client.table("products").select("*").eq("canonical_key", canonical_key).limit(1).execute()
+        return result.data[0] if result.data else None
+
+    def find_duplicate_product(self, url: str) -> Optional[Dict[str, Any]]:
+        """Existing product for the same item: canonical key first, then the exact URL (pre-key rows)."""
+        from Scraping.url_canonicalizer import canonical_key
+        return self.get_product_by_canonical_key(canonical_key(url)) or self.get_product_by_url(url)
+
+    def backfill_canonical_keys(self) -> int:
+        """Set canonical_key on rows created before the column existed. Returns rows updated."""
+        from Scraping.url_canonicalizer import canonical_key
+        result = self.client.table("products").select("id, url").is_("canonical_key", "null").execute()
+        updated = 0
+        for row in result.data or []:
+            key = canonical_key(row["url"])
+            if self.get_product_by_canonical_key(key):
+                print(f"⚠️ Duplicate of an existing product, leaving key empty: {row['url']}")
+                continue
+            self.update_product(row["id"], canonical_key=key)
+            updated += 1
+        return updated
     
     def list_products(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """List all products, optionally filtered by status."""
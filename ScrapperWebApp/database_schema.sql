@@ -29,11 +29,13 @@ CREATE TYPE job_status AS ENUM (
 CREATE TABLE products (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     url TEXT NOT NULL UNIQUE,
+    canonical_key TEXT,  -- dedup key from Scraping/url_canonicalizer.py (e.g. 'amazon.ca:B0CX23V2ZK')
     title TEXT,
     price TEXT,
     description TEXT,
     status product_status NOT NULL DEFAULT 'pending',
     missing_fields TEXT[] DEFAULT ARRAY[]::TEXT[],
+    field_sources JSONB DEFAULT '{}'::JSONB,  -- field -> 'scraper' / 'json-ld' / 'microdata' / 'llm'
     folder_path TEXT,
     scraped_at TIMESTAMP WITH TIME ZONE,
     posted_at TIMESTAMP WITH TIME ZONE,
@@ -76,6 +78,7 @@ CREATE TABLE posting_history (
 -- Create indexes for better query performance
 CREATE INDEX idx_products_status ON products(status);
 CREATE INDEX idx_products_url ON products(url);
+CREATE UNIQUE INDEX idx_products_canonical_key ON products(canonical_key);
 CREATE INDEX idx_products_created_at ON products(created_at);
 CREATE INDEX idx_jobs_product_id ON jobs(product_id);
 CREATE INDEX idx_jobs_status ON jobs(status);
@@ -95,6 +98,14 @@ $$ language 'plpgsql';
 CREATE TRIGGER update_products_updated_at BEFORE UPDATE ON products
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Migration for existing databases (canonical URL dedup):
+--   ALTER TABLE products ADD COLUMN IF NOT EXISTS canonical_key TEXT;
+--   CREATE UNIQUE INDEX IF NOT EXISTS idx_products_canonical_key ON products(canonical_key);
+-- Older rows keep canonical_key NULL until backfilled (Database.backfill_canonical_keys()).
+
+-- Migration for existing databases (per-field sources for progressive scrape results):
+--   ALTER TABLE products ADD COLUMN IF NOT EXISTS field_sources JSONB DEFAULT '{}'::JSONB;
+
 -- Add some helpful comments
 COMMENT ON TABLE products IS 'Main product data with status tracking';
 COMMENT ON TABLE jobs IS 'Scraping and posting job history';
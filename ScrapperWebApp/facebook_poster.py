@@ -5,10 +5,8 @@ Posts products to Facebook Marketplace using Selenium and PyAutoGUI.
 """
 
 import os
-import re
 import shutil
 import requests
-import subprocess
 from time import sleep
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -93,18 +91,15 @@ def cleanup_temp_images(product_id: str) -> bool:
 
 
 def get_chrome_version() -> int | None:
-    try:
-        result = subprocess.run(
-            ['reg', 'query', r'HKCU\Software\Google\Chrome\BLBeacon', '/v', 'version'],
-            capture_output=True, text=True
-        )
-        match = re.search(r'(\d+)\.', result.stdout)
-        version = int(match.group(1)) if match else None
+    """Installed Chrome major version (detected once per process, shared with the scrapers)."""
+    from Scraping.browser_discovery import chrome_major_version
+
+    version = chrome_major_version()
+    if version:
         print(f"[Facebook] Detected Chrome version: {version}")
-        return version
-    except Exception as e:
-        print(f"[Facebook] Could not detect Chrome version: {e} — letting uc pick automatically")
-        return None
+    else:
+        print("[Facebook] Could not detect Chrome version — letting uc pick automatically")
+    return version
 
 
 def setup_browser() -> webdriver.Chrome:
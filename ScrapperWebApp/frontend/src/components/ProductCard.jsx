@@ -4,7 +4,10 @@ function ProductCard({ product, onUpdate, onDelete }) {
   const [selectedImage, setSelectedImage] = useState(0)
   const [isEditing, setIsEditing] = useState(false)
   const [editedProduct, setEditedProduct] = useState(product)
-  const [images, setImages] = useState(product.images || [])
+  // null until images are deleted/uploaded here, so a card shown mid-scrape
+  // keeps following product.images as they land
+  const [localImages, setImages] = useState(null)
+  const images = localImages ?? product.images ?? []
   const [isManagingImages, setIsManagingImages] = useState(false)
   const [isPosting, setIsPosting] = useState(false)
   const [postingStatus, setPostingStatus] = useState('')
@@ -162,6 +165,7 @@ function ProductCard({ product, onUpdate, onDelete }) {
 
   const statusColors = {
     pending: 'bg-yellow-100 text-yellow-800',
+    scraping: 'bg-yellow-100 text-yellow-800',
     collected: 'bg-blue-100 text-blue-800',
     ready_to_post: 'bg-green-100 text-green-800',
     posted: 'bg-purple-100 text-purple-800',
@@ -420,7 +424,11 @@ function ProductCard({ product, onUpdate, onDelete }) {
             ) : (
               <>
                 <button
-                  onClick={() => setIsEditing(true)}
+                  onClick={() => {
+                    // Start from the latest props - a mid-scrape card may have changed since mount
+                    setEditedProduct(product)
+                    setIsEditing(true)
+                  }}
                   className="px-4 py-2 bg-gray-200 text-gray-700 rounded-lg hover:bg-gray-300 cursor-pointer"
                 >
                   Edit
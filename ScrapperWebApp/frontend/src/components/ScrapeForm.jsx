@@ -55,6 +55,23 @@ function ScrapeForm({ onScrapeComplete, isLoading, setIsLoading, setError }) {
 
     const { job_id, product_id } = await response.json()
 
+    // The product row fills in stages (fields, then images, then the LLM answer)
+    let shown = null
+    const showProduct = async (partial) => {
+      const productResponse = await fetch(`/api/products/${product_id}`)
+      if (!productResponse.ok) return
+      const product = await productResponse.json()
+      if (partial && !product.title) return
+
+      const imagesResponse = await fetch(`/api/products/${product_id}/images`)
+      const images = imagesResponse.ok ? await imagesResponse.json() : []
+
+      const snapshot = JSON.stringify([product, images])
+      if (snapshot === shown) return
+      shown = snapshot
+      onScrapeComplete({ ...product, images }, { partial })
+    }
+
     let completed = false
     let attempts = 0
     const maxAttempts = 120
@@ -70,18 +87,14 @@ function ScrapeForm({ onScrapeComplete, isLoading, setIsLoading, setError }) {
         completed = true
       } else if (jobStatus === 'failed') {
         throw new Error('Scraping failed')
+      } else {
+        await showProduct(true)
       }
     }
 
     if (!completed) throw new Error('Timed out')
 
-    const productResponse = await fetch(`/api/products/${product_id}`)
-    const product = await productResponse.json()
-
-    const imagesResponse = await fetch(`/api/products/${product_id}/images`)
-    const images = imagesResponse.ok ? await imagesResponse.json() : []
-
-    onScrapeComplete({ ...product, images })
+    await showProduct(false)
     setStatus(index, 'done')
   }
 
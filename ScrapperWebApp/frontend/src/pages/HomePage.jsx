@@ -9,8 +9,9 @@ function HomePage() {
   const [error, setError] = useState(null)
   const navigate = useNavigate()
 
-  const handleScrapeComplete = (product) => {
-    setCurrentProduct(product)
+  const handleScrapeComplete = (product, { partial = false } = {}) => {
+    // Mid-scrape updates only refresh the card they belong to; a finished scrape always shows
+    setCurrentProduct(prev => (!partial || !prev || prev.id === product.id ? product : prev))
   }
 
   const handleDeleteProduct = async (productId) => {
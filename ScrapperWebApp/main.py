@@ -3,12 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from jobs import create_job, get_progress, get_results_job_id, get_results
 from models import CreateProductRequest, UpdateProductRequest
-from scrapper_service import scrape_url
+from Scraping.rate_limiter import get_rate_limiter
+from Scraping.scrape_cache import get_scrape_cache
 from database import get_db
-from facebook_poster import post_to_facebook
-from kijiji_poster import post_to_kijiji
 from typing import List
 
+# The scraper and poster modules pull in Selenium/Chrome tooling, so they are
+# imported inside the handlers that use them - API-only processes never load them.
+
 app = FastAPI()
 
 # CORS for frontend
@@ -21,16 +23,20 @@ app.add_middleware(
 )
 
 
-def scrape_and_update(job_id: str, product_id: str, url: str):
+def scrape_and_update(job_id: str, product_id: str, url: str, force_refresh: bool = False):
     """Background task to scrape URL and update job/product."""
+    from scrapper_service import scrape_url
+    from Scraping.scrape_progress import SupabaseProgress
+
     db = get_db()
 
     try:
         # Update job status to "running"
         db.update_job_status(job_id, "running")
 
-        # Scrape the URL
-        scraped_data = scrape_url(url)
+        # Scrape the URL - fields, then each image, then the LLM answer are saved as they land
+        progress = SupabaseProgress(product_id, db)
+        scraped_data = scrape_url(url, force_refresh=force_refresh, progress=progress)
 
         # Check for missing fields
         missing_fields = []
@@ -50,15 +56,18 @@ def scrape_and_update(job_id: str, product_id: str, url: str):
             price=scraped_data.price,
             description=scraped_data.description,
             status="ready_to_post" if not missing_fields else "collected",
-            missing_fields=missing_fields
+            missing_fields=missing_fields,
+            field_sources=scraped_data.sources
         )
 
-        # Upload images to Supabase Storage
-        image_urls = []
-        if scraped_data.images:
-            print(f"Uploading {len(scraped_data.images)} images to Supabase...")
-            image_urls = db.upload_product_images(product_id, scraped_data.images)
-            print(f"Uploaded {len(image_urls)} images successfully")
+        # Upload images the scrape didn't stream (cache hits, failed uploads)
+        pending_images = progress.pending_images(scraped_data.images)
+        if pending_images:
+            print(f"Uploading {len(pending_images)} images to Supabase...")
+            for path in pending_images:
+                progress.on_image(scraped_data.images.index(path), path)
+        image_urls = progress.image_urls(scraped_data.images)
+        print(f"{len(image_urls)} images in Supabase Storage")
 
         # Update job with results
         db.update_job(
@@ -82,10 +91,11 @@ def scrape_and_update(job_id: str, product_id: str, url: str):
 
 
 @app.post("/api/scrape")
-async def root(url: str, background_tasks: BackgroundTasks):
+async def root(url: str, background_tasks: BackgroundTasks, force_refresh: bool = False):
     db = get_db()
 
-    existing = db.get_product_by_url(url)
+    # Dedup on the canonical key so tracking params / URL variants don't re-scrape
+    existing = db.find_duplicate_product(url)
     if existing:
         return JSONResponse(
             content={"duplicate": True, "existing_product_id": existing["id"]},
@@ -93,13 +103,24 @@ async def root(url: str, background_tasks: BackgroundTasks):
         )
 
     # 1. Create product first
-    product = db.create_product(url=url, status="pending")
+    try:
+        product = db.create_product(url=url, status="pending")
+    except Exception:
+        # Lost a race with a concurrent request for the same product (unique canonical_key)
+        existing = db.find_duplicate_product(url)
+        if not existing:
+            raise
+        return JSONResponse(
+            content={"duplicate": True, "existing_product_id": existing["id"]},
+            status_code=409
+        )
 
     # 2. Create job linked to product
     job_id = create_job(product_id=product["id"], job_type="scrape")
 
     # 3. Queue scraping in background (non-blocking)
-    background_tasks.add_task(scrape_and_update, job_id, product["id"], url)
+    # (served from the scrape cache when this product was scraped recently, unless force_refresh)
+    background_tasks.add_task(scrape_and_update, job_id, product["id"], url, force_refresh)
 
     # 4. Return immediately
     return {
@@ -109,6 +130,43 @@ async def root(url: str, background_tasks: BackgroundTasks):
         "message": "Scraping started in background"
     }
 
+@app.get("/api/rate-limits")
+async def rate_limits():
+    """Per-domain adaptive rate limiter state (for tuning scrape pacing)."""
+    return get_rate_limiter().snapshot()
+
+@app.get("/api/scrape-workers")
+async def scrape_workers():
+    """Scraper process pool state (SCRAPER_PROCESSES); null when scraping in-process."""
+    from Scraping.process_pool import get_scraper_process_pool
+    pool = get_scraper_process_pool()
+    return pool.stats() if pool else None
+
+@app.get("/api/driver-pool")
+async def driver_pool_stats():
+    """Warm Chrome pool usage and per-driver memory; null until the first scrape starts it."""
+    from Scraping.driver_pool import peek_driver_pool
+    pool = peek_driver_pool()
+    return pool.stats() if pool else None
+
+@app.get("/api/scrape-cache")
+async def scrape_cache_stats():
+    """Scrape result cache hit / miss counters."""
+    return get_scrape_cache().stats()
+
+@app.get("/api/llm-cache")
+async def llm_cache_stats():
+    """LLM fallback cache hit rate and inference seconds saved."""
+    from Scraping.llm_cache import get_llm_cache
+    return get_llm_cache().stats()
+
+@app.get("/api/llm-queue")
+async def llm_queue_stats():
+    """LLM enrichment queue depth, running jobs, expired deadlines and input tokens saved."""
+    from Scraping.llm_enrichment import get_llm_queue
+    from Scraping.content_reducer import reduction_stats
+    return {**get_llm_queue().stats(), "input_reduction": reduction_stats()}
+
 @app.get("/api/progress/{job_id}")
 async def check_progress(job_id: str):
     job_progress = get_progress(job_id)
@@ -274,6 +332,7 @@ async def post_product_to_facebook(product_id: str):
         raise HTTPException(status_code=400, detail="Product has no images")
 
     # Post to Facebook (this will open browser and run automation)
+    from facebook_poster import post_to_facebook
     result = post_to_facebook(product_id)
 
     if result.get('success'):
@@ -297,6 +356,7 @@ async def post_product_to_kijiji(product_id: str):
     if not images:
         raise HTTPException(status_code=400, detail="Product has no images")
 
+    from kijiji_poster import post_to_kijiji
     result = post_to_kijiji(product_id)
 
     if result.get('success'):
@@ -308,7 +368,7 @@ async def post_product_to_kijiji(product_id: str):
 @app.post("/api/products")
 async def create_product(request: CreateProductRequest):
     db = get_db()
-    existing_product = db.get_product_by_url(request.url)
+    existing_product = db.find_duplicate_product(request.url)
     if existing_product:
         # Return existing product with 200 OK
         return JSONResponse(content=existing_product, status_code=status.HTTP_200_OK)
@@ -318,4 +378,8 @@ async def create_product(request: CreateProductRequest):
         product_data = db.create_product(request.url)
         return JSONResponse(content=product_data, status_code=status.HTTP_201_CREATED)
     except Exception as e:
+        # Lost a race with a concurrent request for the same product (unique canonical_key)
+        existing_product = db.find_duplicate_product(request.url)
+        if existing_product:
+            return JSONResponse(content=existing_product, status_code=status.HTTP_200_OK)
         raise HTTPException(status_code=500, detail=f"Failed to create product: {str(e)}")
\ No newline at end of file
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -12,6 +12,7 @@ class ScrappedData(BaseModel):
     description: Optional[str]
     images: List[str]
     link: str
+    sources: Dict[str, str] = {}  # field -> "scraper" / "json-ld" / "microdata" / "llm"
 
 # User input - when scrapper fails
 class UserInput(BaseModel):
@@ -1,41 +1,82 @@
+import os
+import re
+from typing import Optional
 from Scraping.base_scraper import ScraperConfig
 from Scraping.scraper_factory import ScraperFactory
+from Scraping.driver_pool import get_driver_pool
+from Scraping.rate_limiter import get_rate_limiter
+from Scraping.scrape_cache import get_scrape_cache
+from Scraping.process_pool import get_scraper_process_pool
+from Scraping.scrape_progress import ScrapeProgress
 from models import ScrappedData
 from config import TEMP_FOLDER, MAX_IMAGES
 
 
-def scrape_url(url: str) -> ScrappedData:
-    """Scrape a url and return scrapped data (models.py)"""
+def scrape_url(url: str, force_refresh: bool = False, progress: Optional[ScrapeProgress] = None) -> ScrappedData:
+    """
+    Scrape a url and return scrapped data (models.py). Served from the scrape cache unless force_refresh.
+    `progress` gets fields, images and the LLM answer as each lands.
+    """
 
     try:
+        cache = get_scrape_cache()
+        cached = None if force_refresh else cache.get(url)
+        if cached:
+            print(f"💾 Scrape cache hit for {cached.key} ({cached.age:.0f}s old), skipping browser")
+            return ScrappedData(
+                title=cached.product.title,
+                price=cached.product.price,
+                description=cached.product.description,
+                images=cache.ensure_images(cached, _cache_image_dir(cached.key)),
+                link=url,
+                sources=cached.product.sources
+            )
+
         config = ScraperConfig(
             output_path=TEMP_FOLDER,
             max_images=MAX_IMAGES
         )
 
 
-        #Create a scraper
-        scraper = ScraperFactory.create_scraper(url, config)
-
-        if not scraper:
+        if not ScraperFactory.is_supported_url(url):
             raise Exception(f"No Scrapper Available for URL: {url}")
-        
-        #Scrape
-        result = scraper.scrape()
+
+        #Scrape (paced per domain by the shared adaptive limiter)
+        limiter = get_rate_limiter()
+        limiter.acquire(url)
+
+        process_pool = get_scraper_process_pool()
+        if process_pool:
+            #Worker process with its own driver - parsing never competes with the API process
+            result = process_pool.scrape(url, config, progress=progress)
+        else:
+            #Create a scraper (drivers are leased from the shared warm pool)
+            scraper = ScraperFactory.create_scraper(url, config, driver_pool=get_driver_pool(), progress=progress)
+            result = scraper.scrape()
 
         if not result.success:
+            limiter.record_failure(url, "captcha" if result.blocked else "error")
             raise Exception(f"Scrapping failed: {result.error}")
 
+        limiter.record_success(url)
+        cache.put(url, result)
+
         #Create ScrappedData object
         scrapped = ScrappedData(
             title=result.product.title if result.product else None,
             price=result.product.price if result.product else None,
             description=result.product.description if result.product else None,
             images=result.images or [],
-            link=url
+            link=url,
+            sources=result.product.sources if result.product else {}
         )
 
         return scrapped
     
     except Exception as e:
-        raise Exception(f"Scrapping error: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Scrapping error: {str(e)}")
+
+
+def _cache_image_dir(key: str) -> str:
+    """Where a cache hit re-downloads images whose local files were cleaned up."""
+    return os.path.join(TEMP_FOLDER, "cache", re.sub(r'[^A-Za-z0-9._-]', '_', key))
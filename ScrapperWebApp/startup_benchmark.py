@@ -0,0 +1,122 @@
+"""
+Startup benchmark for the API process.
+
+Measures how long a cold `import main` takes (fresh interpreter each run) and
+reports which heavy dependencies were loaded. API-only processes should not
+load any browser tooling, ollama or supabase at import time.
+
+Usage:
+    python startup_benchmark.py                       # 5 cold imports of main
+    python startup_benchmark.py --runs 10 --module Scraping.scraper_factory
+    python startup_benchmark.py --import-profile      # -X importtime breakdown
+    python startup_benchmark.py --import-profile --top 40
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must only load once a scrape / post actually runs
+HEAVY_MODULES = [
+    "selenium", "undetected_chromedriver", "webdriver_manager", "fake_useragent",
+    "PIL", "ollama", "supabase", "pyautogui",
+]
+
+_MEASURE_SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy, "modules": len(sys.modules)}}))
+"""
+
+
+def _run(args):
+    return subprocess.run([sys.executable] + args, cwd=HERE, capture_output=True, text=True)
+
+
+def measure(module: str, runs: int) -> None:
+    """Cold-import `module` `runs` times and print timing + heavy modules loaded."""
+    snippet = _MEASURE_SNIPPET.format(module=module, heavy=HEAVY_MODULES)
+    timings = []
+    report = None
+    for i in range(runs):
+        result = _run(["-c", snippet])
+        if result.returncode != 0:
+            print(f"❌ import {module} failed:\n{result.stderr.strip()}")
+            sys.exit(1)
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(report["seconds"])
+        print(f"  run {i + 1}: {report['seconds'] * 1000:.0f} ms")
+
+    print()
+    print(f"=== import {module} ({runs} cold runs) ===")
+    print(f"  min    {min(timings) * 1000:.0f} ms")
+    print(f"  median {statistics.median(timings) * 1000:.0f} ms")
+    print(f"  max    {max(timings) * 1000:.0f} ms")
+    print(f"  modules loaded: {report['modules']}")
+    if report["heavy"]:
+        print(f"⚠️ Heavy modules loaded at import: {', '.join(report['heavy'])}")
+    else:
+        print("✅ No heavy modules loaded at import")
+
+
+def import_profile(module: str, top: int) -> None:
+    """Print the -X importtime breakdown: slowest imports and time per top-level package."""
+    result = _run(["-X", "importtime", "-c", f"import {module}"])
+    if result.returncode != 0 and "Traceback" in result.stderr:
+        print(f"❌ import {module} failed:\n{result.stderr.strip()}")
+        sys.exit(1)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+        except ValueError:
+            continue
+
+    if not entries:
+        print("No importtime data captured")
+        return
+
+    print(f"=== Slowest imports by cumulative time (import {module}) ===")
+    for self_us, cumulative_us, name in sorted(entries, key=lambda e: e[1], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms) {name}")
+
+    per_package = defaultdict(int)
+    for self_us, _, name in entries:
+        per_package[name.strip().split(".")[0]] += self_us
+
+    print()
+    print("=== Self time per top-level package ===")
+    for package, self_us in sorted(per_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        marker = "  ⚠️ heavy" if package in HEAVY_MODULES else ""
+        print(f"  {self_us / 1000:8.1f} ms  {package}{marker}")
+
+    total = sum(self_us for self_us, _, _ in entries)
+    print()
+    print(f"Total import time: {total / 1000:.0f} ms across {len(entries)} modules")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API cold-start import time")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=5, help="Cold import runs (default: 5)")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="Show the python -X importtime breakdown instead of timing runs")
+    parser.add_argument("--top", type=int, default=25, help="Rows to show in the import profile")
+    args = parser.parse_args()
+
+    if args.import_profile:
+        import_profile(args.module, args.top)
+    else:
+        measure(args.module, args.runs)
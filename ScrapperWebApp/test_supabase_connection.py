@@ -14,8 +14,9 @@ try:
     print("🔌 Testing Supabase connection...")
     print()
     
-    # Try to connect
+    # Try to connect (get_db() no longer queries on construction)
     db = get_db()
+    db._test_connection()
     print("✅ Successfully connected to Supabase!")
     print()
     